@@ -23,6 +23,25 @@ const long BATTERY_INTERVAL = 5000;
 String filename = "gps_temp.csv";
 bool renamed = false;
 
+// Console lines are built whole and only written when the USB buffer has
+// room for them; otherwise they are skipped and counted, so a slow or closed
+// serial monitor never holds up GPS.read()
+uint32_t consoleDropped = 0;
+void consoleLine(const char *line) {
+  size_t len = strlen(line) + 2;  // println adds \r\n
+  if (consoleDropped && Serial.availableForWrite() >= (int)(len + 40)) {
+    char note[40];
+    snprintf(note, sizeof(note), "(%lu console lines skipped)", (unsigned long)consoleDropped);
+    Serial.println(note);
+    consoleDropped = 0;
+  }
+  if (Serial.availableForWrite() >= (int)len) {
+    Serial.println(line);
+  } else {
+    consoleDropped++;
+  }
+}
+
 // Battery % 
 int batteryPercent(float v) {
   if (v >= 4.15) return 100;
@@ -57,9 +76,9 @@ void showBatteryStatus(int percent) {
     noInterrupts(); pixel.show(); interrupts();
   }
 
-  Serial.print("Battery Percent: ");
-  Serial.print(percent);
-  Serial.println("%");
+  char line[32];
+  snprintf(line, sizeof(line), "Battery Percent: %d%%", percent);
+  consoleLine(line);
 }
 
 // Read battery voltage from A3 
@@ -134,12 +153,13 @@ void loop() {
         GPS.month, GPS.day, GPS.year, estHour, GPS.minute);
 
       if (!SD.exists(newName)) {
-        Serial.print("Renaming gps_temp.csv to ");
-        Serial.println(newName);
+        char line[64];
+        snprintf(line, sizeof(line), "Renaming gps_temp.csv to %s", newName);
+        consoleLine(line);
         SD.rename("gps_temp.csv", newName);
         filename = String(newName);
       } else {
-        Serial.println("Filename already exists. Keeping gps_temp.csv.");
+        consoleLine("Filename already exists. Keeping gps_temp.csv.");
       }
       renamed = true;
     }
@@ -151,33 +171,20 @@ void loop() {
     if (GPS.fix) {
       int estHour = convertToEST(GPS.hour);
 
-      Serial.print("\nTime (EST): ");
-      if (estHour < 10) Serial.print('0');
-      Serial.print(estHour); Serial.print(':');
-      if (GPS.minute < 10) Serial.print('0');
-      Serial.print(GPS.minute); Serial.print(':');
-      if (GPS.seconds < 10) Serial.print('0');
-      Serial.print(GPS.seconds); Serial.print('.');
-      Serial.println(GPS.milliseconds);
-
-      Serial.print("Date: ");
-      Serial.print(GPS.day); Serial.print('/');
-      Serial.print(GPS.month); Serial.print("/20");
-      Serial.println(GPS.year);
-
-      Serial.print("Fix: "); Serial.print((int)GPS.fix);
-      Serial.print(" quality: "); Serial.println((int)GPS.fixquality);
-
-      Serial.print("Location: ");
-      Serial.print(GPS.latitude, 4); Serial.print(GPS.lat);
-      Serial.print(", ");
-      Serial.print(GPS.longitude, 4); Serial.println(GPS.lon);
-
-      Serial.print("Speed (knots): "); Serial.println(GPS.speed);
-      Serial.print("Angle: "); Serial.println(GPS.angle);
-      Serial.print("Altitude: "); Serial.println(GPS.altitude);
-      Serial.print("Satellites: "); Serial.println((int)GPS.satellites);
-      Serial.print("Antenna status: "); Serial.println((int)GPS.antenna);
+      // Three whole lines instead of dozens of field-by-field prints
+      char line[128];
+      snprintf(line, sizeof(line), "\nTime (EST): %02d:%02d:%02d.%d  Date: %d/%d/20%02d",
+               estHour, GPS.minute, GPS.seconds, GPS.milliseconds,
+               GPS.day, GPS.month, GPS.year);
+      consoleLine(line);
+      snprintf(line, sizeof(line), "Fix: %d quality: %d  Location: %.4f%c, %.4f%c",
+               (int)GPS.fix, (int)GPS.fixquality,
+               GPS.latitude, GPS.lat, GPS.longitude, GPS.lon);
+      consoleLine(line);
+      snprintf(line, sizeof(line),
+               "Speed (knots): %.2f  Angle: %.2f  Altitude: %.2f  Satellites: %d  Antenna status: %d",
+               GPS.speed, GPS.angle, GPS.altitude, (int)GPS.satellites, (int)GPS.antenna);
+      consoleLine(line);
 
       logFile = SD.open(filename.c_str(), FILE_WRITE);
       if (logFile) {
@@ -202,10 +209,10 @@ void loop() {
         logFile.println((int)GPS.satellites);
         logFile.close();
       } else {
-        Serial.println("Error writing to log file!");
+        consoleLine("Error writing to log file!");
       }
     } else {
-      Serial.println("Waiting for GPS fix...");
+      consoleLine("Waiting for GPS fix...");
     }
   }
 
@@ -215,9 +222,9 @@ void loop() {
     float voltage = readBatteryVoltage();
     int percent = batteryPercent(voltage);
 
-    Serial.print("Battery Voltage: ");
-    Serial.print(voltage, 2);
-    Serial.println(" V");
+    char line[32];
+    snprintf(line, sizeof(line), "Battery Voltage: %.2f V", voltage);
+    consoleLine(line);
 
     showBatteryStatus(percent);
   }
@@ -1,19 +1,47 @@
+import startup
+# Created first so every step below is timed; the steps go to the log, not print()
+boot = startup.StartupTimer(verbose=False)
+
 # === Required Libraries ===
-import time
-import digitalio
-import board
-import usb_hid
-import neopixel
-from adafruit_hid.consumer_control import ConsumerControl
-from adafruit_hid.consumer_control_code import ConsumerControlCode
+with boot.step("imports"):
+    import time
+    import board
+    import keypad
+    import usb_hid
+    import neopixel
+    from adafruit_hid.consumer_control_code import ConsumerControlCode
+    from hid_state import HIDState
+    from pixel_frame import PixelFrame
+    from buttons import ButtonEvents, PRESS, SHORT_PRESS, LONG_PRESS, HOLD
+    import ringlog
+
+# === Logging ===
+# Records go into a RAM ring and out over USB only as fast as the host reads
+# them, so a slow serial monitor never holds up the buttons. Binary on
+# usb_cdc.data when LemonMediaButtons_boot.py enabled it (read it with
+# python -m sim.logdecode), else text on the console.
+with boot.step("log"):
+    log = ringlog.usb_log(size=1024, rate=20)
+LOG_READY = log.define("Ready! Hold Volume+ and Volume– for 5s to enter brightness mode.")
+LOG_SENT = log.define("[Button {}] Short press → Sent {}")
+LOG_LED = log.define("[Button {}] Long press → LED {}")
+LOG_PLACEHOLDER = log.define("[Button {}] Long press → (placeholder for future feature)")
+LOG_MODE = log.define("{} brightness mode")
+LOG_BRIGHTNESS = log.define("Brightness {}: {:.2f}")
+LOG_COLOR = log.define("Color {}: ({}, {}, {}, {})")
+LOG_STARTUP = log.define("startup: {} {:.1f} ms")
+LOG_MAIN_LOOP = log.define("startup: main loop at {:.1f} ms")
+LOG_FIRST = log.define("startup: {} at {:.1f} ms")
 
 # === NeoPixel Setup ===
 pixel_pin = board.A0
 num_pixels = 7
-pixels = neopixel.NeoPixel(
-    pixel_pin, num_pixels, brightness=0.3,
-    auto_write=False, pixel_order=neopixel.GRBW
-)
+with boot.step("NeoPixels"):
+    pixels = neopixel.NeoPixel(
+        pixel_pin, num_pixels, brightness=0.3,
+        auto_write=False, pixel_order=neopixel.GRBW
+    )
+    frame = PixelFrame(pixels)  # Only writes the strip when the colours change
 
 # Define colors for feedback
 RED    = (255, 0, 0, 0)
@@ -22,6 +50,7 @@ YELLOW = (255, 255, 0, 0)
 GREEN  = (0, 255, 0, 0)
 CYAN   = (0, 255, 255, 0)
 BLUE   = (0, 0, 255, 0)
+WHITE  = (255, 255, 255, 0)
 BLACK  = (0, 0, 0, 0)
 
 COLOR_MAP = [RED, ORANGE, YELLOW, GREEN, CYAN, BLUE]  # Per button color
@@ -47,17 +76,23 @@ buttonkeys = [
     ConsumerControlCode.VOLUME_INCREMENT, # MISO
     ConsumerControlCode.PLAY_PAUSE       # MOSI
 ]
-
-# Initialize buttons as input with pull-ups
-buttons = []
-for pin in button_pins:
-    button = digitalio.DigitalInOut(pin)
-    button.direction = digitalio.Direction.INPUT
-    button.pull = digitalio.Pull.UP
-    buttons.append(button)
+REW, MUTE, VOL_DOWN, FFW, VOL_UP, PLAY = range(6)
+
+# Pins are scanned in the background (pull-ups, pressed = low) and every
+# change is queued, so no press is missed while the loop is busy
+SCAN_INTERVAL = 0.005
+LOOP_INTERVAL = 0.01
+with boot.step("keypad"):
+    keys = keypad.Keys(button_pins, value_when_pressed=False, pull=True, interval=SCAN_INTERVAL)
+    buttons = ButtonEvents(keys, long_press=1.0)
+BRIGHTNESS_CHORD = buttons.add_hold((VOL_DOWN, VOL_UP), 5.0)  # Enter brightness mode
+EXIT_HOLDS = (buttons.add_hold((VOL_DOWN,), 2.0), buttons.add_hold((VOL_UP,), 2.0))
 
 # === HID Control Setup ===
-cc = ConsumerControl(usb_hid.devices)
+# Media keys are queued and sent one report per tick by idle()
+with boot.step("HID devices"):
+    hid = HIDState(usb_hid.devices)
+    cc = hid.consumer
 
 # === LED and Brightness State ===
 led_enabled = True
@@ -66,130 +101,130 @@ brightness = 0.3
 in_brightness_mode = False
 brightness_mode_color_index = 0
 
-# Track timing for long/short presses
-press_start_times = [None] * len(buttons)
-long_press_flags = [False] * len(buttons)
+# Mode-change flash: a timed animation driven from the main loop
+FLASH_TIMES = 10
+FLASH_SPEED = 0.1
+flash_step = None  # None when not flashing
+flash_next = 0.0
 
 # === LED Behavior Functions ===
 def apply_led_state():
     """Update NeoPixel display based on LED state."""
+    if flash_step is not None:
+        return  # The flash restores the LED state when it ends
     if led_enabled:
-        pixels.brightness = brightness
-        pixels.fill(last_color)
+        frame.brightness = brightness
+        frame.fill(last_color)
     else:
-        pixels.fill(BLACK)
-    pixels.show()
-
-def flash_leds(times=10, speed=0.1):
-    """Flash LEDs to indicate mode change."""
-    for _ in range(times):
-        pixels.fill((255, 255, 255, 0))  # Flash white
-        pixels.show()
-        time.sleep(speed)
-        pixels.fill(BLACK)
-        pixels.show()
-        time.sleep(speed)
+        frame.fill(BLACK)
+    frame.show()
+
+def idle(seconds):
+    """Send any pending HID reports and what the host will take of the log, then sleep."""
+    if hid.send() and boot.first("first HID report"):
+        log.info(LOG_FIRST, "first HID report", boot.marks[-1][1])
+    log.drain()
+    time.sleep(seconds)
+
+def flash_leds(now):
+    """Start flashing the LEDs to indicate a mode change."""
+    global flash_step, flash_next
+    flash_step = 0
+    flash_next = now
+
+def update_flash(now):
+    """Advance the flash by one white/off step when it is due."""
+    global flash_step, flash_next
+    if flash_step is None or now < flash_next:
+        return
+    if flash_step == FLASH_TIMES * 2:
+        flash_step = None
+        apply_led_state()
+        return
+    frame.fill(BLACK if flash_step % 2 else WHITE)
+    frame.show()
+    flash_step += 1
+    flash_next += FLASH_SPEED
+
+def send_media(i):
+    global last_color
+    cc.send(buttonkeys[i])
+    log.info(LOG_SENT, i, buttonkeys[i])
+    last_color = COLOR_MAP[i % len(COLOR_MAP)]
+    apply_led_state()
+
+def handle_normal(kind, i, now):
+    global led_enabled, in_brightness_mode
+    if kind == SHORT_PRESS:
+        send_media(i)
+
+    elif kind == LONG_PRESS:
+        # Long press actions: toggle LED on select buttons
+        if i in (REW, FFW):  # A1 and SCK
+            led_enabled = not led_enabled
+            log.info(LOG_LED, i, "ON" if led_enabled else "OFF")
+            apply_led_state()
 
-# === Main Program Loop ===
-print("Ready! Hold Volume+ and Volume– for 5s to enter brightness mode.")
+        elif i in (MUTE, PLAY):
+            log.info(LOG_PLACEHOLDER, i)
 
-while True:
-    now = time.monotonic()
+    elif kind == HOLD and i == BRIGHTNESS_CHORD:
+        in_brightness_mode = True
+        log.info(LOG_MODE, "Entered")
+        flash_leds(now)
 
-    # --- Brightness Mode Activation ---
-    if not buttons[2].value and not buttons[4].value and not in_brightness_mode:
-        press_start = now
-        while not buttons[2].value and not buttons[4].value:
-            if time.monotonic() - press_start > 5.0:
-                in_brightness_mode = True
-                print("Entered brightness mode")
-                flash_leds()
-                break
-            time.sleep(0.01)
-
-    # --- Brightness Mode Loop ---
-    while in_brightness_mode:
-        vol_up = not buttons[4].value  # MISO
-        vol_down = not buttons[2].value  # A3
-        ffw = not buttons[3].value  # SCK
-        rew = not buttons[0].value  # A1
-
-        if vol_up:
+def handle_brightness(kind, i, now):
+    global brightness, last_color, brightness_mode_color_index, in_brightness_mode
+    if kind == PRESS:
+        if i == VOL_UP:
             brightness = min(1.0, brightness + 0.25)
-            print(f"Brightness increased: {brightness:.2f}")
+            log.info(LOG_BRIGHTNESS, "increased", brightness)
             apply_led_state()
-            time.sleep(0.3)
 
-        elif vol_down:
+        elif i == VOL_DOWN:
             brightness = max(0.01, brightness - 0.25)
-            print(f"Brightness decreased: {brightness:.2f}")
+            log.info(LOG_BRIGHTNESS, "decreased", brightness)
             apply_led_state()
-            time.sleep(0.3)
 
-        if ffw:
+        elif i == FFW:
             # Next color
             brightness_mode_color_index = (brightness_mode_color_index + 1) % len(BRIGHTNESS_MODE_COLORS)
             last_color = BRIGHTNESS_MODE_COLORS[brightness_mode_color_index]
-            print(f"Color forward: {last_color}")
+            log.info(LOG_COLOR, "forward", *last_color)
             apply_led_state()
-            while not buttons[3].value:
-                time.sleep(0.01)
 
-        if rew:
+        elif i == REW:
             # Previous color
             brightness_mode_color_index = (brightness_mode_color_index - 1) % len(BRIGHTNESS_MODE_COLORS)
             last_color = BRIGHTNESS_MODE_COLORS[brightness_mode_color_index]
-            print(f"Color backward: {last_color}")
+            log.info(LOG_COLOR, "backward", *last_color)
             apply_led_state()
-            while not buttons[0].value:
-                time.sleep(0.01)
-
-        # Exit brightness mode
-        if vol_up or vol_down:
-            hold_start = time.monotonic()
-            while not buttons[2].value or not buttons[4].value:
-                if time.monotonic() - hold_start > 2.0:
-                    in_brightness_mode = False
-                    print("Exited brightness mode")
-                    flash_leds()
-                    break
-                time.sleep(0.01)
-
-        time.sleep(0.01)
-
-    # --- Main Button Handling ---
-    for i, button in enumerate(buttons):
-        pressed = not button.value
-
-        if pressed:
-            if press_start_times[i] is None:
-                press_start_times[i] = now
-
-            # Check for long press
-            press_duration = now - press_start_times[i]
-            if press_duration > 1.0 and not long_press_flags[i]:
-                long_press_flags[i] = True
-
-                # Long press actions: toggle LED on select buttons
-                if i in (0, 3):  # A1 and SCK
-                    led_enabled = not led_enabled
-                    print(f"[Button {i}] Long press → LED {'ON' if led_enabled else 'OFF'}")
-                    apply_led_state()
-
-                elif i in (1, 5):
-                    print(f"[Button {i}] Long press → (placeholder for future feature)")
 
+    # Mute and Play/Pause keep working in brightness mode
+    elif kind == SHORT_PRESS and i in (MUTE, PLAY):
+        send_media(i)
+
+    # Exit brightness mode: hold either volume button for 2 s
+    elif kind == HOLD and i in EXIT_HOLDS:
+        in_brightness_mode = False
+        log.info(LOG_MODE, "Exited")
+        flash_leds(now)
+
+# === Main Program Loop ===
+main_loop_at = boot.done()
+for name, cost in boot.steps:
+    log.info(LOG_STARTUP, name, cost)
+log.info(LOG_MAIN_LOOP, main_loop_at)
+log.info(LOG_READY)
+
+while True:
+    now = time.monotonic()
+
+    for kind, i in buttons.update():
+        if in_brightness_mode:
+            handle_brightness(kind, i, now)
         else:
-            # On release, handle short press if no long press occurred
-            if press_start_times[i] is not None:
-                if not long_press_flags[i]:
-                    cc.send(buttonkeys[i])
-                    print(f"[Button {i}] Short press → Sent {buttonkeys[i]}")
-                    last_color = COLOR_MAP[i % len(COLOR_MAP)]
-                    apply_led_state()
-
-                # Reset state
-                press_start_times[i] = None
-                long_press_flags[i] = False
-
-    time.sleep(0.01)
+            handle_normal(kind, i, now)
+
+    update_flash(now)
+    idle(LOOP_INTERVAL)
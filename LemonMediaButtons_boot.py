@@ -0,0 +1,8 @@
+# boot.py for LemonMediaButtons.py: copy to CIRCUITPY as boot.py to add the
+# usb_cdc data port next to the console. The script then logs compact binary
+# records there instead of text on the console; read them on the computer with
+#     python -m sim.logdecode /dev/ttyACM1      (the second serial port)
+# Takes effect after a hard reset.
+import usb_cdc
+
+usb_cdc.enable(console=True, data=True)
@@ -1,28 +1,37 @@
-import time
-import board
-import touchio
-import neopixel
-from rainbowio import colorwheel
-import usb_hid # Required for HID devices
-from adafruit_hid.mouse import Mouse 
+import startup
+boot = startup.StartupTimer()  # Created first so every step below is timed
+
+with boot.step("imports"):
+    import time
+    import board
+    import touchio
+    import neopixel
+    import usb_hid # Required for HID devices
+    from adafruit_hid.mouse import Mouse 
+    from pixel_frame import PixelFrame
+    from animation import Animator, Rainbow, Breathe, Chase
+    from click_scheduler import ClickScheduler
+    from touch_input import TouchPad, RELEASE, LONG_PRESS
 
 # --- Mouse Setup ---
-mouse = Mouse(usb_hid.devices)
+with boot.step("mouse"):
+    mouse = Mouse(usb_hid.devices)
 
 # --- Existing CircuitPython Code ---
-touch1 = touchio.TouchIn(board.TOUCH1)  # Touch 1 for brightness control
-touch2 = touchio.TouchIn(board.TOUCH2)  # Touch 2 for color cycling
+with boot.step("touch pads"):
+    touch1 = touchio.TouchIn(board.TOUCH1)  # Touch 1 for colour cycling and click rate
+    touch2 = touchio.TouchIn(board.TOUCH2)  # Touch 2 for color cycling and slower clicks
+# Both touched together (and held) for brightness
 
-pixels = neopixel.NeoPixel(board.NEOPIXEL, 4, auto_write=False)
+with boot.step("NeoPixels"):
+    pixels = neopixel.NeoPixel(board.NEOPIXEL, 4, auto_write=False)
+    frame = PixelFrame(pixels, max_fps=100)  # Only writes the pixels when the colours change
 
 # Define time thresholds
 SHORT_PRESS_THRESHOLD = 0.15  # Max time for a short press
 LONG_PRESS_THRESHOLD = 1.0    # Time for long press
 TOUCH_DEBOUNCE = 0.3  # Time to wait before detecting another touch
 
-touched = time.monotonic()
-last_touch1 = False
-last_touch2 = False
 color_index = 0  # Start with color index 0
 colors = [
     (255, 0, 0),  # Red
@@ -34,99 +43,101 @@ colors = [
     (255, 255, 255)  # White
 ]
 
-# Initialize with low brightness
-pixels.brightness = 0.1
-pixels.show()
-
-# Global time for rainbow effect
-last_rainbow_update = time.monotonic()
-rainbow_speed = 0.2  # Controls the speed of the rainbow effect
-rainbow_delay = 0.05  # Delay between rainbow updates to prevent overloading
+# Holding both pads steps through these, brightest wrapping round to dimmest
+BRIGHTNESS_LEVELS = (0.02, 0.05, 0.1, 0.2, 0.35, 0.5, 0.75, 1.0)
+brightness_index = 2  # Initialize with low brightness
+frame.brightness = BRIGHTNESS_LEVELS[brightness_index]
+frame.show()
+both_pads = False  # Both pads went down together; their releases then don't change colour
+
+# Animated modes, after the solid colours (tables are built once, at import)
+rainbow_period = 5.0  # Seconds for one trip round the colour wheel
+effects = [
+    Rainbow(period=rainbow_period, spread=64),  # Spread the colors across the pixels
+    Breathe((255, 255, 255), period=3.0),
+    Chase((0, 0, 255), period=1.0),
+]
+mode_count = len(colors) + len(effects)
+# 50 fps stays under the frame's 100 fps cap; drops automatically if frames get slow
+animator = Animator(frame, fps=50)
 
 # --- Mouse Click Control Variables ---
-last_click_time = time.monotonic()
-min_click_delay = 0.05 # Fastest possible click rate
-max_click_delay = 2.0  # Slowest possible click rate
-
-def rainbow_effect():
-    """Continuous rainbow effect that cycles through colors."""
-    global last_rainbow_update
-    current_time = time.monotonic()
-    
-    # Ensure rainbow updates at a controlled speed
-    if current_time - last_rainbow_update >= rainbow_delay:
-        color_index = int((current_time * rainbow_speed) % 256)
-        for i in range(4):
-            pixels[i] = colorwheel(color_index + (i * 64) % 256)  # Spread the colors across the pixels
-        pixels.show()
-        last_rainbow_update = current_time
-
+# Long press steps through these (clicks per second); each click is two HID
+# reports, so ~60/s is the USB ceiling
+CLICK_RATES = (0.5, 1, 2, 5, 10, 20, 30, 50)
+rate_index = 0
+rate_step_time = 0.25  # Seconds of long press per rate step
+clicker = ClickScheduler(rate=CLICK_RATES[rate_index])
+
+def step_click_rate(step):
+    """Move one step along CLICK_RATES and report how the old rate did."""
+    global rate_index
+    new_index = max(0, min(len(CLICK_RATES) - 1, rate_index + step))
+    if new_index == rate_index:
+        return
+    achieved, mean_late, max_late = clicker.stats()
+    print("Click rate {}/s -> {}/s (achieved {:.1f}/s, late {:.1f} ms avg, {:.0f} ms max)".format(
+        CLICK_RATES[rate_index], CLICK_RATES[new_index], achieved, mean_late, max_late))
+    rate_index = new_index
+    clicker.rate = CLICK_RATES[rate_index]
+    clicker.reset_stats()
+
+def step_brightness():
+    global brightness_index
+    brightness_index = (brightness_index + 1) % len(BRIGHTNESS_LEVELS)
+    frame.brightness = BRIGHTNESS_LEVELS[brightness_index]  # Shown with the next frame
+
+# Each pad is measured once per loop; events come from that one sample
+pad1 = TouchPad(touch1, long_press=LONG_PRESS_THRESHOLD, repeat=rate_step_time)
+pad2 = TouchPad(touch2, long_press=LONG_PRESS_THRESHOLD, repeat=rate_step_time)
+
+boot.done()  # Prints where the startup time went
 while True:
     current_time = time.monotonic()
-    time_since_touch = current_time - touched
-
-    # Handle long press to adjust brightness (on touch1 or touch2)
-    # The 'start_time' variable needs to be initialized if a long press is detected.
-    # We'll initialize it when the touch first begins.
-    if touch1.value and not last_touch1:
-        touched = current_time  # Start the touch
-        last_touch1 = True
-        start_time = current_time # Initialize start_time for the current press
-
-    if touch2.value and not last_touch2:
-        touched = current_time  # Start the touch
-        last_touch2 = True
-        start_time = current_time # Initialize start_time for the current press
-
-    # If a long press is detected on touch1 or touch2, adjust brightness
-    # Ensure start_time is defined for the current touch
-    if last_touch1 and (current_time - start_time) > LONG_PRESS_THRESHOLD:
-        # Long press on touch1 for increasing brightness
-        pixels.brightness = min(1.0, pixels.brightness + 0.01)  # Gradual increase for finer control
-        pixels.show()
-
-    elif last_touch2 and (current_time - start_time) > LONG_PRESS_THRESHOLD:
-        # Long press on touch2 for decreasing brightness
-        pixels.brightness = max(0.0, pixels.brightness - 0.01)  # Gradual decrease for finer control
-        pixels.show()
-
-    # Handle color cycling based on release (release the button to trigger color change)
-    if not touch1.value and last_touch1:
-        # Short press released: trigger the color change (cycle forward)
-        color_index = (color_index + 1) % (len(colors) + 1)  # Cycle through colors and rainbow
-        last_touch1 = False
-        touched = current_time
-
-    if not touch2.value and last_touch2:
-        # Short press released: trigger the color change (cycle backward)
-        color_index = (color_index - 1) % (len(colors) + 1)  # Cycle backward through colors and rainbow
-        last_touch2 = False
-        touched = current_time
-
-    # Show color or rainbow effect
+    event1 = pad1.update(current_time)
+    event2 = pad2.update(current_time)
+
+    if pad1.pressed and pad2.pressed:
+        both_pads = True
+    if both_pads:
+        # Both pads held: Touch 1's long press (repeating) steps the brightness
+        # instead of the click rate, and letting go changes no colour
+        if event1 == LONG_PRESS and pad2.pressed:
+            step_brightness()
+        if not pad1.pressed and not pad2.pressed:
+            both_pads = False
+    else:
+        # Long press (repeating while held) adjusts the click rate
+        if event1 == LONG_PRESS:
+            step_click_rate(1)  # Touch 1 clicks faster
+        if event2 == LONG_PRESS:
+            step_click_rate(-1)  # Touch 2 clicks slower
+
+        # Handle color cycling based on release (release the button to trigger color change)
+        if event1 == RELEASE and not pad1.long_pressed:
+            # Short press released: trigger the color change (cycle forward)
+            color_index = (color_index + 1) % mode_count  # Cycle through colors and effects
+
+        if event2 == RELEASE and not pad2.long_pressed:
+            # Short press released: trigger the color change (cycle backward)
+            color_index = (color_index - 1) % mode_count  # Cycle backward through colors and effects
+
+    # Show color or animated effect
     if color_index < len(colors):  # Normal colors
-        pixels.fill(colors[color_index])  # Set to the selected color
-    else:  # Rainbow effect
-        rainbow_effect()  # Call the rainbow effect function
+        frame.fill(colors[color_index])  # Set to the selected color
+    else:  # Rainbow, breathe or chase
+        effect = effects[color_index - len(colors)]
+        if animator.effect is not effect:
+            animator.effect = effect
+        animator.update()  # Renders and shows only when a frame is due
     
-    pixels.show()
-
-    # Reset touch states if touch ends
-    if not touch1.value:
-        last_touch1 = False
-    if not touch2.value:
-        last_touch2 = False
+    frame.show(current_time)  # Skipped when nothing changed
 
     # --- Mouse Click Logic ---
-    # Calculate click delay based on brightness
-    # Invert brightness so higher brightness means lower delay (faster clicks)
-    # Map brightness (0.0 to 1.0) to click delay (max_click_delay to min_click_delay)
-    current_click_delay = max_click_delay - (pixels.brightness * (max_click_delay - min_click_delay))
-    current_click_delay = max(min_click_delay, min(max_click_delay, current_click_delay)) # Ensure it stays within bounds
-
-    if current_time - last_click_time >= current_click_delay:
+    # Deadlines run on their own timeline: a late loop owes a click, not a delay
+    for _ in range(clicker.due()):
         mouse.click(Mouse.LEFT_BUTTON) # Perform a left click at the current cursor position
-        last_click_time = current_time
+        boot.first("first HID report")
 
-    # Small delay to prevent excessive CPU usage
-    time.sleep(0.01)
+    # Small delay to prevent excessive CPU usage, cut short for the next click
+    time.sleep(min(0.01, clicker.time_to_next()))
@@ -1,48 +1,93 @@
-import time
-import board
-import adafruit_nunchuk
-import usb_hid
-from adafruit_hid.keyboard import Keyboard
-from adafruit_hid.keycode import Keycode
-from adafruit_hid.mouse import Mouse
+import startup
+boot = startup.StartupTimer()  # Created first so every step below is timed
+
+with boot.step("imports"):
+    import time
+    import asyncio
+    import board
+    import adafruit_nunchuk
+    import usb_hid
+    from hid_state import HIDState, MouseState
+    from nunchuk_snapshot import NunchukSnapshot
+    from gestures import GestureDetector, SHAKE
+    from motion import MotionPipeline, ResponseCurve
+    from gamepad import GamepadState
+    from tasks import Rate, run
+
+# The six keycodes used, instead of importing adafruit_hid.keycode's whole table
+class Keycode:
+    A = 0x04
+    B = 0x05
+    RIGHT_ARROW = 0x4F
+    LEFT_ARROW = 0x50
+    DOWN_ARROW = 0x51
+    UP_ARROW = 0x52
 
 # Setup I2C and Nunchuk
-i2c = board.I2C()
-nc = adafruit_nunchuk.Nunchuk(i2c)
-
-# HID devices
-kbd = Keyboard(usb_hid.devices)
-mouse = Mouse(usb_hid.devices)
+with boot.step("nunchuk"):
+    i2c = board.I2C()
+    nc = adafruit_nunchuk.Nunchuk(i2c)
+snap = NunchukSnapshot(nc)  # One I2C read per poll for stick, accel and buttons
+poll_rate = 200             # Nunchuk polls per second
+report_rate = 125           # HID reports per second at most (the 8 ms USB poll interval)
+
+# HID devices (state is only sent once per report tick, and only when it changed)
+with boot.step("HID devices"):
+    hid = HIDState(usb_hid.devices)
+    kbd = hid.keyboard
+    mouse = hid.mouse
+
+    # Gamepad: only there when boot.py enabled it (see Wii_Nunchuck_boot.py)
+    try:
+        pad = GamepadState(usb_hid.devices)
+    except ValueError:
+        pad = None
 
 # Modes
 MODE_KEYBOARD = 0
 MODE_JOYSTICK_MOUSE = 1
 MODE_ACCEL_MOUSE = 2
-mode = MODE_KEYBOARD
-
-# Shake detection
-shake_threshold = 60          # Raise if still too sensitive
-shake_window = 3              # Require 3 strong changes
-shake_debounce = 1.5          # Seconds between allowed shakes
-last_shake_check = 0
-shake_history = [0] * shake_window
-prev_ay = 0
+MODE_GAMEPAD = 3
+MODE_NAMES = ("KEYBOARD", "JOYSTICK MOUSE", "ACCEL MOUSE", "GAMEPAD")
+# Holding C+Z steps through these; shake toggles the tilt mouse
+hold_modes = (MODE_KEYBOARD, MODE_JOYSTICK_MOUSE, MODE_GAMEPAD) if pad else (
+    MODE_KEYBOARD, MODE_JOYSTICK_MOUSE)
+mode = MODE_GAMEPAD if pad else MODE_KEYBOARD  # boot.py only enables the gamepad to use it
+
+# Shake detection: any one accel axis jumping by more than the threshold
+gestures = GestureDetector(
+    shake_threshold=60,       # Raise if still too sensitive
+    shake_window=3,
+    shake_count=3,            # Require 3 strong changes
+    debounce=1.5,             # Seconds between allowed shakes
+)
 
 # Long-press detection for joystick mouse toggle
 last_mode_toggle = 0
 mode_hold_time = 1.0
 button_c_pressed = False
 button_z_pressed = False
+quiet_until = 0  # Input is ignored until then after a mode switch
 
-# Movement settings
+# Movement settings, in pixels per second per step of stick offset
+# (0.15 px per loop of the old ~31 Hz loop; top speed about 600 px/s)
 deadzone = 10
-joystick_sensitivity = 0.15
+joystick_sensitivity = 4.7
+joystick_curve = 1.0  # Raise above 1 for finer control near centre, same top speed
 
 # Tilt config 
 tilt_center_x = 500
 tilt_center_y = 500
 tilt_deadzone = 15
-tilt_scale = 0.15  # Raise if movement is too slow
+tilt_scale = 4.7  # Pixels per second per step of tilt; raise if movement is too slow
+
+# Integer motion with sub-pixel carry; the float math happens once, here.
+# The tables are per poll, so they follow poll_rate.
+joystick_motion = MotionPipeline(
+    ResponseCurve(128, deadzone, joystick_sensitivity, joystick_curve, 1 / poll_rate),
+    invert_y=True,
+)
+tilt_motion = MotionPipeline(ResponseCurve(512, tilt_deadzone, tilt_scale, 1.0, 1 / poll_rate))
 
 def handle_keyboard_mode(x, y, c, z):
     if x < 128 - 40:
@@ -76,82 +121,77 @@ def handle_keyboard_mode(x, y, c, z):
     else:
         kbd.release(Keycode.A)
 
-def handle_joystick_mouse_mode(x, y, c, z):
-    dx = (x - 128)
-    dy = (y - 128)
+def handle_gamepad_mode(x, y, ax, ay, az, c, z):
+    # Everything in one report: full stick and accel resolution, no thresholds
+    pad.update(x, y, ax, ay, az, c, z)
 
-    if abs(dx) < deadzone:
-        dx = 0
-    if abs(dy) < deadzone:
-        dy = 0
-
-    dx = int(dx * joystick_sensitivity)
-    dy = int(dy * -joystick_sensitivity)  
-
-    if dx or dy:
-        mouse.move(dx, dy)
+def handle_joystick_mouse_mode(x, y, c, z):
+    joystick_motion.update(x - 128, y - 128)
+    if joystick_motion.dx or joystick_motion.dy:
+        mouse.move(joystick_motion.dx, joystick_motion.dy)
 
     # Mouse buttons: Z = right click, C = left click
     if z:
-        mouse.press(Mouse.RIGHT_BUTTON)
+        mouse.press(MouseState.RIGHT_BUTTON)
     else:
-        mouse.release(Mouse.RIGHT_BUTTON)
+        mouse.release(MouseState.RIGHT_BUTTON)
 
     if c:
-        mouse.press(Mouse.LEFT_BUTTON)
+        mouse.press(MouseState.LEFT_BUTTON)
     else:
-        mouse.release(Mouse.LEFT_BUTTON)
+        mouse.release(MouseState.LEFT_BUTTON)
 
 def handle_accel_mouse_mode(ax, ay, az, c, z):
-    dx = ax - tilt_center_x
-    dy = ay - tilt_center_y
-
-    if abs(dx) < tilt_deadzone:
-        dx = 0
-    if abs(dy) < tilt_deadzone:
-        dy = 0
-
-    dx = int(dx * tilt_scale)
-    dy = int(dy * tilt_scale)
-
-    if dx != 0 or dy != 0:
-        mouse.move(dx, dy)
+    tilt_motion.update(ax - tilt_center_x, ay - tilt_center_y)
+    if tilt_motion.dx or tilt_motion.dy:
+        mouse.move(tilt_motion.dx, tilt_motion.dy)
 
     if z:
-        mouse.press(Mouse.RIGHT_BUTTON)
+        mouse.press(MouseState.RIGHT_BUTTON)
     else:
-        mouse.release(Mouse.RIGHT_BUTTON)
+        mouse.release(MouseState.RIGHT_BUTTON)
 
     if c:
-        mouse.press(Mouse.LEFT_BUTTON)
+        mouse.press(MouseState.LEFT_BUTTON)
     else:
-        mouse.release(Mouse.LEFT_BUTTON)
-
-while True:
-    x, y = nc.joystick
-    ax, ay, az = nc.acceleration
-    c = nc.buttons.C
-    z = nc.buttons.Z
+        mouse.release(MouseState.LEFT_BUTTON)
+
+def switch_mode(new_mode, message, now):
+    """Release everything, then ignore input for a moment while the mode changes."""
+    global mode, quiet_until
+    mode = new_mode
+    print(message)
+    hid.release_all()
+    hid.send()
+    if pad:
+        pad.release_all()
+        pad.flush()
+    joystick_motion.reset()
+    tilt_motion.reset()
+    gestures.reset()  # Samples after the quiet time aren't compared with ones from before it
+    quiet_until = now + 0.3
+
+def poll():
+    global last_mode_toggle, button_c_pressed, button_z_pressed
     now = time.monotonic()
+    if now < quiet_until:
+        return
+    snap.read()  # Requested by the poll task, which awaited the conversion
+    x = snap.x
+    y = snap.y
+    ax = snap.ax
+    ay = snap.ay
+    az = snap.az
+    c = snap.c
+    z = snap.z
 
     # --- Shake detection ---
-    delta_ay = abs(ay - prev_ay)
-    prev_ay = ay
-    shake_history.pop(0)
-    shake_history.append(delta_ay)
-    strong_shakes = sum(1 for d in shake_history if d > shake_threshold)
-
-    if strong_shakes >= shake_window and (now - last_shake_check) > shake_debounce:
-        last_shake_check = now
+    if gestures.update(ax, ay, az, now) == SHAKE:
         if mode != MODE_ACCEL_MOUSE:
-            mode = MODE_ACCEL_MOUSE
-            print("Switched to ACCEL MOUSE mode (tilt)")
+            switch_mode(MODE_ACCEL_MOUSE, "Switched to ACCEL MOUSE mode (tilt)", now)
         else:
-            mode = MODE_KEYBOARD
-            print("Returned to KEYBOARD mode")
-        kbd.release_all()
-        mouse.release_all()
-        time.sleep(0.3)
+            switch_mode(MODE_KEYBOARD, "Returned to KEYBOARD mode", now)
+        return
 
     # --- Button combo for joystick mouse toggle ---
     if c and z:
@@ -161,21 +201,25 @@ while True:
         button_z_pressed = True
     else:
         if button_c_pressed and button_z_pressed:
+            button_c_pressed = False
+            button_z_pressed = False
             if now - last_mode_toggle >= mode_hold_time:
-                if mode == MODE_JOYSTICK_MOUSE:
-                    mode = MODE_KEYBOARD
-                    print("Returned to KEYBOARD mode")
+                if mode in hold_modes:
+                    new_mode = hold_modes[(hold_modes.index(mode) + 1) % len(hold_modes)]
+                else:
+                    new_mode = MODE_JOYSTICK_MOUSE  # From the tilt mouse, as before
+                if new_mode == MODE_KEYBOARD:
+                    switch_mode(new_mode, "Returned to KEYBOARD mode", now)
                 else:
-                    mode = MODE_JOYSTICK_MOUSE
-                    print("Switched to JOYSTICK MOUSE mode")
-                kbd.release_all()
-                mouse.release_all()
-                time.sleep(0.3)
+                    switch_mode(new_mode, "Switched to %s mode" % MODE_NAMES[new_mode], now)
+                return
         button_c_pressed = False
         button_z_pressed = False
 
-    # Skip all inputs during mode switching combo
-    if c and z:
+    # Skip all inputs during mode switching combo (a gamepad reports C+Z as-is)
+    if mode == MODE_GAMEPAD:
+        handle_gamepad_mode(x, y, ax, ay, az, c, z)
+    elif c and z:
         pass
     else:
         if mode == MODE_KEYBOARD:
@@ -185,4 +229,27 @@ while True:
         elif mode == MODE_ACCEL_MOUSE:
             handle_accel_mouse_mode(ax, ay, az, c, z)
 
-    time.sleep(0.01)
+# --- Tasks ---
+async def poll_nunchuck():
+    rate = Rate(poll_rate)
+    while True:
+        # The Nunchuk needs a moment between the request and the read; the
+        # other tasks run during it instead of the whole loop sleeping
+        snap.request()
+        await asyncio.sleep(snap.read_delay)
+        poll()
+        await rate.wait()
+
+async def send_reports():
+    # Paced at the USB poll rate, so send_report() never waits on a pending report
+    rate = Rate(report_rate)
+    while True:
+        sent = hid.send()
+        if pad:
+            sent = pad.flush() or sent
+        if sent:
+            boot.first("first HID report")
+        await rate.wait()
+
+boot.done()  # Prints where the startup time went
+run(poll_nunchuck(), send_reports())
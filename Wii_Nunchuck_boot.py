@@ -0,0 +1,12 @@
+# boot.py for Wii_Nunchuck.py: copy to CIRCUITPY as boot.py (with lib/gamepad.py)
+# to add the gamepad next to the usual keyboard, mouse and consumer control.
+# Takes effect after a hard reset; the script starts in gamepad mode when it's there.
+import usb_hid
+import gamepad
+
+usb_hid.enable((
+    usb_hid.Device.KEYBOARD,
+    usb_hid.Device.MOUSE,
+    usb_hid.Device.CONSUMER_CONTROL,
+    gamepad.device(),
+))
@@ -0,0 +1 @@
+"""Input-to-HID latency, report-rate and loop-cost benchmarks run in the host simulator."""
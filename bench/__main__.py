@@ -0,0 +1,38 @@
+"""Benchmark the scripts in the host simulator.
+
+    python -m bench                      # all scenarios, deltas vs baselines.json
+    python -m bench lemon_taps --update  # re-record the baseline for one scenario
+"""
+import argparse
+import json
+
+from bench.run import format_report, load_baselines, run_scenario, save_baselines
+from bench.scenarios import SCENARIOS
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m bench", description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="*", help="scenario names (default: all)")
+    parser.add_argument("--update", action="store_true", help="write results to baselines.json")
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args()
+
+    known = {scenario.name: scenario for scenario in SCENARIOS}
+    unknown = [name for name in args.scenarios if name not in known]
+    if unknown:
+        parser.error("unknown scenario(s): " + ", ".join(unknown))
+    selected = [known[name] for name in args.scenarios] or SCENARIOS
+
+    results = {scenario.name: run_scenario(scenario) for scenario in selected}
+    baselines = load_baselines()
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_report(results, baselines))
+    if args.update:
+        baselines.update(results)
+        save_baselines(baselines)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Check the Nunchuck gamepad descriptor and report packing against a host-side decoder.
+
+    python -m bench.gamepad
+
+Runs Wii_Nunchuck.py with Wii_Nunchuck_boot.py under random stick, tilt and
+button input, then decodes every gamepad report with the descriptor the
+board enumerated (sim/hid_descriptor.py, independent of lib/gamepad.py) and
+compares it with the Nunchuk I2C read that preceded it. Exits non-zero on
+any mismatch.
+"""
+import random
+import sys
+
+from sim import Simulation
+from sim.hid_descriptor import decode
+from sim.signals import steps
+
+SCRIPT = "Wii_Nunchuck.py"
+BOOT = "Wii_Nunchuck_boot.py"
+
+GENERIC_DESKTOP = 0x01
+BUTTON = 0x09
+USAGES = {
+    "x": (GENERIC_DESKTOP, 0x30), "y": (GENERIC_DESKTOP, 0x31),
+    "ax": (GENERIC_DESKTOP, 0x33), "ay": (GENERIC_DESKTOP, 0x34), "az": (GENERIC_DESKTOP, 0x35),
+    "z": (BUTTON, 1), "c": (BUTTON, 2),
+}
+
+
+def _nunchuk_values(data):
+    """What adafruit_nunchuk would report for one raw 6-byte read."""
+    low = data[5]
+    return {
+        "x": data[0], "y": data[1],
+        "ax": data[2] << 2 | (low >> 6) & 3,
+        "ay": data[3] << 2 | (low >> 4) & 3,
+        "az": data[4] << 2 | (low >> 2) & 3,
+        "c": int(not low & 0x02), "z": int(not low & 0x01),
+    }
+
+
+def _inputs(seed, duration, step=0.05):
+    rng = random.Random(seed)
+    stick, accel, c, z = [], [], [], []
+    t = 0.2
+    while t < duration:
+        stick.append((t, (rng.randrange(256), rng.randrange(256))))
+        accel.append((t, tuple(rng.randrange(1024) for _ in range(3))))
+        # Buttons never overlap for long enough to switch modes
+        c.append((t, rng.random() < 0.3))
+        z.append((t, rng.random() < 0.3))
+        t += step
+    return stick, accel, c, z
+
+
+def main(seed=3, duration=5.0):
+    stick, accel, c, z = _inputs(seed, duration)
+    sim = Simulation(duration=duration)
+    sim.nunchuk(joystick=steps(stick, initial=(128, 128)),
+                acceleration=steps(accel, initial=(512, 512, 512)),
+                c=steps(c, initial=False), z=steps(z, initial=False))
+    sim.run(SCRIPT, boot=BOOT)
+
+    pads = [d for d in sim.hid_devices or () if d.usage_page == GENERIC_DESKTOP and d.usage == 0x05]
+    if not pads:
+        print("no gamepad enabled by", BOOT)
+        return 1
+    pad = pads[0]
+    fields = pad.fields
+
+    last_read = None
+    checked = mismatched = 0
+    for event in sim.recorder.log:
+        if event.kind == "i2c" and event.data[0] == "r" and len(event.data[1]) == 6:
+            last_read = _nunchuk_values(event.data[1])
+        elif event.kind == "hid" and event.source == pad.name and last_read is not None:
+            values = decode(fields, event.data, pad.report_ids[0])
+            decoded = {name: values.get(usage) for name, usage in USAGES.items()}
+            checked += 1
+            if decoded != last_read:
+                mismatched += 1
+                if mismatched <= 5:
+                    print("t={:.4f}: sent {} read {}".format(event.t, decoded, last_read))
+
+    print("descriptor: {} bytes, {} input fields, report {} is {} bytes".format(
+        len(pad.report_descriptor), len(fields), pad.report_ids[0], pad.in_report_lengths[0]))
+    print("reports decoded: {}, mismatched: {}".format(checked, mismatched))
+    return 1 if mismatched or not checked else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Per-sample cost of shake detection as the window grows.
+
+    python -m bench.gestures
+
+Compares lib/gestures.py (ring buffer + running counters) with the list
+pop(0)/append + sum() history the Nunchuck script used to keep. Host timings
+only; the shape of the curve is what matters, not the absolute numbers.
+"""
+import random
+import sys
+from time import perf_counter
+
+from sim.harness import LIB_DIR
+
+sys.path.insert(0, LIB_DIR)
+from gestures import GestureDetector  # noqa: E402
+
+WINDOWS = (3, 12, 48, 192)
+SAMPLES = 20000
+
+
+def _samples(count):
+    rng = random.Random(1)
+    return [(rng.randrange(1024), rng.randrange(1024), rng.randrange(1024)) for _ in range(count)]
+
+
+def list_history(samples, window, threshold=60):
+    history = [0] * window
+    prev_ay = 0
+    start = perf_counter()
+    for ax, ay, az in samples:
+        delta = abs(ay - prev_ay)
+        prev_ay = ay
+        history.pop(0)
+        history.append(delta)
+        sum(1 for d in history if d > threshold)
+    return perf_counter() - start
+
+
+def ring_detector(samples, window, threshold=60):
+    detector = GestureDetector(shake_threshold=threshold, shake_window=window,
+                               shake_count=window, flick_window=window)
+    now = 0.0
+    start = perf_counter()
+    for ax, ay, az in samples:
+        detector.update(ax, ay, az, now)
+        now += 0.005
+    return perf_counter() - start
+
+
+def best_of(runs, bench, samples, window):
+    return min(bench(samples, window) for _ in range(runs)) / len(samples) * 1e9
+
+
+def main():
+    samples = _samples(SAMPLES)
+    print("{:>8} {:>16} {:>16}".format("window", "list+sum ns", "ring ns"))
+    for window in WINDOWS:
+        old = best_of(5, list_history, samples, window)
+        new = best_of(5, ring_detector, samples, window)
+        print("{:>8} {:>16.0f} {:>16.0f}".format(window, old, new))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Float vs fixed-point mouse motion: cost, allocations, slow-move precision and speed.
+
+    python -m bench.motion
+
+The float version is the joystick/tilt handler math the Nunchuck script
+used before lib/motion.py. Its float products are counted by running it
+with a float subclass that counts them; each one is a heap allocation on
+CircuitPython. The fixed-point path makes no floats, and its values are
+checked against CircuitPython's small-int limit (2**30): any int below it
+is stored in place, not on the heap. The fixed-point tables are built
+before timing starts, as the script builds them once at startup.
+
+Host timings only, and they favour floats: on CPython the fixed-point
+update() is slower (a method call and more bytecodes per sample, and
+floats are cheap there). No device timing has been taken. The case for
+the fixed-point path is allocations, not speed: nothing per sample for
+the garbage collector to reclaim in the poll loop, plus the fraction of a
+pixel that int() dropped.
+"""
+import sys
+from time import perf_counter
+
+from sim.harness import LIB_DIR
+
+sys.path.insert(0, LIB_DIR)
+from motion import FRACTION_BITS, MotionPipeline, ResponseCurve  # noqa: E402
+
+SAMPLES = 20000
+DEADZONE = 10
+SENSITIVITY = 4.7           # px/s per step of offset, as Wii_Nunchuck.py
+OLD_LOOP_RATE = 31.3        # Loops per second of the original script
+OLD_SENSITIVITY = 0.15      # Its px per loop per step of offset
+POLL_RATE = 200
+SMALL_INT_LIMIT = 1 << 30    # CircuitPython ints below this aren't heap objects
+
+
+class CountingFloat(float):
+    created = 0
+
+    def __mul__(self, other):
+        CountingFloat.created += 1
+        return float(self) * other
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        CountingFloat.created += 1
+        return CountingFloat(-float(self))
+
+
+def float_motion(offsets, sensitivity=OLD_SENSITIVITY):
+    moved_x = 0
+    for dx, dy in offsets:
+        if abs(dx) < DEADZONE:
+            dx = 0
+        if abs(dy) < DEADZONE:
+            dy = 0
+        dx = int(dx * sensitivity)
+        dy = int(dy * -sensitivity)
+        moved_x += dx
+    return moved_x
+
+
+def pipeline(rate=POLL_RATE):
+    return MotionPipeline(ResponseCurve(128, DEADZONE, SENSITIVITY, 1.0, 1 / rate),
+                          invert_y=True)
+
+
+def fixed_motion(offsets, motion):
+    update = motion.update
+    moved_x = 0
+    for dx, dy in offsets:
+        update(dx, dy)
+        moved_x += motion.dx
+    return moved_x
+
+
+def fixed_values(offsets, motion):
+    """(float results, largest magnitude) over the values update() leaves behind.
+
+    The accumulator of each axis is ``d << FRACTION_BITS`` plus the carried
+    remainder, so this bounds every intermediate as well.
+    """
+    floats = 0
+    largest = max(max(motion._table_x), max(motion._table_y))
+    for dx, dy in offsets:
+        motion.update(dx, dy)
+        values = (motion.dx, motion.dy, motion._rem_x, motion._rem_y,
+                  (motion.dx << FRACTION_BITS) + motion._rem_x,
+                  (motion.dy << FRACTION_BITS) + motion._rem_y)
+        for value in values:
+            if not isinstance(value, int):
+                floats += 1
+            largest = max(largest, abs(value))
+    return floats, largest
+
+
+def _time(run, runs=5):
+    best = None
+    for _ in range(runs):
+        start = perf_counter()
+        run()
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / SAMPLES * 1e9
+
+
+def px_per_second(offset, rate):
+    """Pixels one second of polls at ``rate`` moves the cursor with the stick at ``offset``."""
+    motion = pipeline(rate)
+    moved = 0
+    for _ in range(int(rate)):
+        motion.update(offset, 0)
+        moved += motion.dx
+    return moved
+
+
+def main():
+    sweep = [((i % 256) - 128, 128 - (i * 7 % 256)) for i in range(SAMPLES)]
+    motion = pipeline()     # Built once, outside the timed code
+    print("per sample            float      fixed")
+    print("  host ns          {:8.0f}   {:8.0f}   (fixed is slower on CPython)".format(
+        _time(lambda: float_motion(sweep)), _time(lambda: fixed_motion(sweep, motion))))
+
+    CountingFloat.created = 0
+    float_motion(sweep, sensitivity=CountingFloat(OLD_SENSITIVITY))
+    floats, largest = fixed_values(sweep, pipeline())
+    print("  floats made      {:8.2f}   {:8.2f}".format(
+        CountingFloat.created / SAMPLES, floats / SAMPLES))
+    print("  fixed-point values up to {} ({} the 2**30 small-int limit)".format(
+        largest, "within" if largest < SMALL_INT_LIMIT else "OVER"))
+
+    # Stick barely past the deadzone for one second: ideal 12 * 4.7 = 56 px
+    print("slow move, offset 12 for 1 s (ideal {:.0f} px): float {} px, fixed {} px".format(
+        12 * SENSITIVITY,
+        float_motion([(12, 0)] * round(OLD_LOOP_RATE)),
+        px_per_second(12, POLL_RATE)))
+
+    # The tables are per poll interval, so the speed doesn't follow the poll rate
+    print("px/s at offset        12     40     72    127")
+    for rate in (OLD_LOOP_RATE, 100, POLL_RATE, 500):
+        print("  {:5.0f} Hz polls  {}".format(
+            rate, "".join("{:7d}".format(px_per_second(o, rate)) for o in (12, 40, 72, 127))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Macropad profile dicts vs compiled tables: lookup cost, memory, and file consistency.
+
+    python -m bench.profiles
+
+Checks that macropad_profiles.json compiles to the same tables as the
+built-in profiles in macropad.py and that broken profile files are reported
+rather than raised (exits non-zero if not), then compares the
+per-key-event lookups macropad.py used to do on the profile dicts with the
+compiled tables, and the memory held by 40 profiles in each form. Host
+timings only.
+"""
+import ast
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+from sim.harness import LIB_DIR, REPO_ROOT, STUB_DIR
+
+sys.path.insert(0, LIB_DIR)
+sys.path.insert(0, STUB_DIR)
+from adafruit_hid.keycode import Keycode  # noqa: E402
+from macropad_profiles import ProfileFile, compile_profiles  # noqa: E402
+
+EVENTS = 100000
+PROFILE_COUNT = 40
+TONES = [196, 220, 246, 262, 294, 330, 349, 392, 440, 494, 523, 587]
+
+
+class _MacroPad:
+    Keycode = Keycode
+
+
+def builtin_profiles():
+    """The ``builtin_profiles`` literal from macropad.py, evaluated on the host."""
+    with open(os.path.join(REPO_ROOT, "macropad.py")) as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], "id", None) == "builtin_profiles":
+            return eval(compile(ast.Expression(node.value), "macropad.py", "eval"),
+                        {"macropad": _MacroPad})
+    raise LookupError("builtin_profiles not found in macropad.py")
+
+
+def file_profiles():
+    with open(os.path.join(REPO_ROOT, "macropad_profiles.json")) as f:
+        return json.load(f)["profiles"]
+
+
+def _tables(profile):
+    return (profile.name, profile.display_name, profile.rotation, profile.volume,
+            profile.keycodes, profile.tones, profile.colors, profile.shortcuts)
+
+
+def dict_lookups(profiles, keys):
+    # What press/release handling did per event before the profiles were compiled
+    found = 0
+    for key in keys:
+        mapping = profiles[0].get("keys")
+        if mapping and key in mapping:
+            found += mapping[key]
+            if key < len(TONES):
+                found += TONES[key]
+        if not profiles[0].get("volume", True):
+            found += 1
+    return found
+
+
+def compiled_lookups(profiles, keys):
+    found = 0
+    profile = profiles[0]
+    for key in keys:
+        code = profile.keycodes[key]
+        if code:
+            found += code
+            found += profile.tones[key]
+        if not profile.volume:
+            found += 1
+    return found
+
+
+# Files ProfileFile must report through ``error`` and skip, keeping the profiles it had
+BROKEN_FILES = {
+    "key number 12": '[{"name": "A", "keys": {"12": "A"}}]',
+    "negative key number": '[{"name": "A", "keys": {"-1": "A"}}]',
+    "key number not a number": '[{"name": "A", "keys": {"one": "A"}}]',
+    "keys as a list": '[{"name": "A", "keys": ["A", "B"]}]',
+    "unknown keycode": '[{"name": "A", "keys": {"0": "NOT_A_KEY"}}]',
+    "keycode 256": '[{"name": "A", "keys": {"0": 256}}]',
+    "colour for key 13": '[{"name": "A", "colors": {"13": 255}}]',
+    "13 tones": '[{"name": "A", "tones": [' + ", ".join(["440"] * 13) + ']}]',
+    "tones as a string": '[{"name": "A", "tones": "loud"}]',
+    "colour not a number": '[{"name": "A", "colors": {"0": "red"}}]',
+    "shortcut not a list": '[{"name": "A", "shortcuts": [5]}]',
+    "shortcut item null": '[{"name": "A", "shortcuts": [[null]]}]',
+    "shortcut key missing": '[{"name": "A", "shortcuts": [[{"wait": 1}]]}]',
+    "rotation 45": '[{"name": "A", "rotation": 45}]',
+    "rotation as a string": '[{"name": "A", "rotation": "90"}]',
+    "volume as a string": '[{"name": "A", "volume": "no"}]',
+    "no volume, no shortcuts": '[{"name": "A", "volume": false}]',
+    "no volume, empty shortcuts": '[{"name": "A", "volume": false, "shortcuts": []}]',
+    "profile not a dict": '[["A"]]',
+    "no name": '[{"keys": {}}]',
+    "no profiles": '{"profiles": []}',
+    "not JSON": '[{"name": "A",',
+}
+
+
+def broken_files():
+    """Names of BROKEN_FILES that raised from check() or replaced the profiles."""
+    failed = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "profiles.json")
+        profiles = ProfileFile(path, Keycode, fallback=[{"name": "Fallback"}])
+        for label, text in BROKEN_FILES.items():
+            kept = profiles.profiles
+            with open(path, "w") as f:
+                f.write(text)
+            profiles._stamp = None  # The same size and mtime as the last one is still a change
+            try:
+                loaded = profiles.check()
+            except Exception as error:  # noqa: BLE001 - anything raised is the failure
+                failed.append("{} ({})".format(label, type(error).__name__))
+                continue
+            if loaded or profiles.error is None or profiles.profiles is not kept:
+                failed.append(label)
+    return failed
+
+
+def _time(func, profiles, keys, runs=5):
+    best = None
+    for _ in range(runs):
+        start = perf_counter()
+        func(profiles, keys)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(keys) * 1e9
+
+
+def _held_bytes(build):
+    gc.collect()
+    tracemalloc.start()
+    held = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return size
+
+
+def main():
+    builtin = compile_profiles(builtin_profiles(), Keycode)
+    from_file = compile_profiles(file_profiles(), Keycode)
+    mismatched = [a.name for a, b in zip(builtin, from_file) if _tables(a) != _tables(b)]
+    if len(builtin) != len(from_file):
+        mismatched.append("profile count {} vs {}".format(len(builtin), len(from_file)))
+    print("macropad_profiles.json vs built-in: {} profiles, mismatched: {}".format(
+        len(from_file), ", ".join(mismatched) or "none"))
+
+    failed = broken_files()
+    print("broken profile files reported: {} of {}, raised or loaded: {}".format(
+        len(BROKEN_FILES) - len(failed), len(BROKEN_FILES), ", ".join(failed) or "none"))
+
+    keys = [i * 7 % 12 for i in range(EVENTS)]
+    dicts = builtin_profiles()
+    print("per key event     dicts   compiled")
+    print("  host ns      {:8.0f}   {:8.0f}".format(
+        _time(dict_lookups, dicts, keys), _time(compiled_lookups, builtin, keys)))
+
+    text = json.dumps(file_profiles() * (PROFILE_COUNT // len(from_file)))
+    print("{} profiles held      parsed JSON   compiled".format(PROFILE_COUNT))
+    print("  host bytes        {:10d}   {:8d}".format(
+        _held_bytes(lambda: json.loads(text)),
+        _held_bytes(lambda: compile_profiles(json.loads(text), Keycode))))
+    return 1 if mismatched or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
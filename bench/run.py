@@ -0,0 +1,107 @@
+"""Run the benchmark scenarios and compare them with the tracked baselines."""
+import bisect
+import json
+import os
+
+from sim import Simulation
+from sim.stats import percentile
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+# Host CPU time depends on the machine, so it is shown but never tracked
+UNTRACKED = ("host_us",)
+
+
+def measure(sim, stimuli):
+    """Latency of every stimulus, report rates and main-loop cost for one run."""
+    streams = {}
+    for event in sim.recorder.log:
+        streams.setdefault((event.kind, event.source), []).append(event)
+
+    latencies = []
+    missed = 0
+    for stimulus in stimuli:
+        events = streams.get((stimulus.kind, stimulus.source), [])
+        start = bisect.bisect_left([e.t for e in events], stimulus.t)
+        if stimulus.state and start and stimulus.predicate(events[start - 1].data):
+            latencies.append(0.0)
+            continue
+        for event in events[start:]:
+            if stimulus.predicate(event.data):
+                latencies.append(event.end - stimulus.t)
+                break
+        else:
+            missed += 1
+
+    elapsed = sim.clock.now()
+    loop = sim.loop_stats()
+    startup = sim.startup_stats()
+    result = {
+        "latency_p50_ms": _ms(percentile(latencies, 50)),
+        "latency_p99_ms": _ms(percentile(latencies, 99)),
+        "missed": missed,
+        "loop_p50_ms": _ms(loop["period_p50"]),
+        "loop_p99_ms": _ms(loop["period_p99"]),
+        "host_us": None if loop["host_cost_mean"] is None else round(loop["host_cost_mean"] * 1e6, 1),
+        # Virtual time from power-up (boot.py included) to the main loop and to the first report
+        "startup_ms": _ms(startup["main_loop"]),
+        "first_hid_ms": _ms(startup["first_hid"]),
+    }
+    # Scripts built on asyncio tasks: each task's achieved rate and worst period
+    for name, task in sorted(sim.task_stats().items()):
+        if task["rate"] is not None:
+            result["task_{}_hz".format(name)] = round(task["rate"], 1)
+            result["task_{}_p99_ms".format(name)] = _ms(task["period_p99"])
+    for (kind, source), events in sorted(streams.items(), key=str):
+        if kind in ("hid", "pixels", "i2c", "pwm"):
+            result["{}_{}_per_s".format(kind, source)] = round(len(events) / elapsed, 1)
+    return result
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+def run_scenario(scenario):
+    sim = Simulation(duration=scenario.duration)
+    stimuli = scenario.setup(sim)
+    sim.run(scenario.script, boot=scenario.boot)
+    result = measure(sim, stimuli)
+    if scenario.extra:
+        result.update(scenario.extra(sim))
+    return result
+
+
+def load_baselines():
+    if not os.path.exists(BASELINES):
+        return {}
+    with open(BASELINES) as f:
+        return json.load(f)
+
+
+def save_baselines(results):
+    tracked = {
+        name: {k: v for k, v in metrics.items() if k not in UNTRACKED}
+        for name, metrics in results.items()
+    }
+    with open(BASELINES, "w") as f:
+        json.dump(tracked, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def format_report(results, baselines):
+    lines = []
+    for name, metrics in results.items():
+        base = baselines.get(name, {})
+        lines.append(name)
+        for key, value in metrics.items():
+            old = base.get(key)
+            if key in UNTRACKED or old is None or value is None or old == value:
+                delta = ""
+            else:
+                delta = "  ({:+.3f}{})".format(
+                    value - old, ", {:+.1f}%".format(100 * (value - old) / old) if old else "")
+            lines.append("  {:32} {:>10}{}".format(key, "-" if value is None else value, delta))
+        for key in sorted(set(base) - set(metrics)):
+            lines.append("  {:32} {:>10}  (was {})".format(key, "-", base[key]))
+    return "\n".join(lines)
@@ -0,0 +1,686 @@
+"""Scripted input waveforms for each script and the reports they should cause.
+
+Each scenario's ``setup(sim)`` wires inputs into a fresh
+:class:`sim.Simulation` and returns the :class:`Stimulus` list whose
+latencies are measured. An optional ``extra(sim)`` adds scenario-specific
+metrics after the run.
+"""
+import json
+import math
+import os
+import random
+import struct
+
+from sim.harness import REPO_ROOT, Simulation
+from sim.logdecode import Decoder
+from sim.signals import pulses, steps
+from sim.stats import percentile
+
+KEY_LEFT = 0x50
+KEY_RIGHT = 0x4F
+KEY_A = 0x04
+KEY_B = 0x05
+
+
+def wav_file(seconds, sample_rate=22050, channels=1, bits=16):
+    """A silent PCM WAV file of ``seconds`` length."""
+    block = channels * bits // 8
+    size = int(seconds * sample_rate) * block
+    header = struct.pack("<4sI4s4sIHHIIHH4sI", b"RIFF", 36 + size, b"WAVE", b"fmt ", 16, 1,
+                         channels, sample_rate, sample_rate * block, block, bits, b"data", size)
+    return header + bytes(size)
+
+
+class Stimulus:
+    """An input edge at ``t`` and the first recorded event that answers it.
+
+    With ``state=True`` the events describe held state (keyboard reports,
+    pixel frames): if the last one before ``t`` already satisfies the
+    predicate nothing needs to be sent and the latency is zero.
+    """
+
+    def __init__(self, t, kind, source, predicate, label, state=False):
+        self.t = t
+        self.kind = kind
+        self.source = source
+        self.predicate = predicate
+        self.label = label
+        self.state = state
+
+
+class Scenario:
+    def __init__(self, name, script, duration, setup, boot=None, extra=None):
+        self.name = name
+        self.script = script
+        self.duration = duration
+        self.setup = setup
+        self.boot = boot
+        self.extra = extra
+
+
+# --- Report predicates ---
+def keyboard_has(keycode):
+    return lambda report: keycode in report[2:]
+
+
+def keyboard_lacks(keycode):
+    return lambda report: keycode not in report[2:]
+
+
+def consumer_is(code):
+    return lambda report: report[0] | report[1] << 8 == code
+
+
+def mouse_moves(report):
+    return report[1] != 0 or report[2] != 0
+
+
+def pixels_match(rgb, bpp=3):
+    """Pixel data whose first pixel lights the same GRB channels as ``rgb``."""
+    lit = (rgb[1] > 0, rgb[0] > 0, rgb[2] > 0)
+    return lambda data: tuple(b > 0 for b in data[:3]) == lit
+
+
+def active_low_taps(starts, width):
+    return pulses(starts, width, on=False, off=True)
+
+
+# --- Wii Nunchuck ---
+def nunchuck_sweep(sim):
+    """Stick swept left-centre-right every 100 ms step, Z tapped between sweeps."""
+    points = []
+    stimuli = []
+    t = 0.5
+    left = right = False
+    for cycle in range(4):
+        for x in (128, 60, 20, 60, 128, 196, 236, 196, 128):
+            points.append((t, (x, 128)))
+            if (x < 88) != left:
+                left = x < 88
+                stimuli.append(Stimulus(t, "hid", "keyboard",
+                                        (keyboard_has if left else keyboard_lacks)(KEY_LEFT),
+                                        "stick", state=True))
+            if (x > 168) != right:
+                right = x > 168
+                stimuli.append(Stimulus(t, "hid", "keyboard",
+                                        (keyboard_has if right else keyboard_lacks)(KEY_RIGHT),
+                                        "stick", state=True))
+            t += 0.1
+    z_taps = [0.45 + 0.9 * i for i in range(4)]
+    for start in z_taps:
+        stimuli.append(Stimulus(start, "hid", "keyboard", keyboard_has(KEY_A), "z", state=True))
+        stimuli.append(Stimulus(start + 0.05, "hid", "keyboard", keyboard_lacks(KEY_A), "z",
+                                state=True))
+    sim.nunchuk(joystick=steps(points, initial=(128, 128)), z=pulses(z_taps, 0.05))
+    return stimuli
+
+
+def nunchuck_joystick_mouse(sim):
+    """Hold C+Z to enter joystick-mouse mode, then flick the stick repeatedly."""
+    flicks = [2.0 + 0.25 * i for i in range(8)]
+    points = []
+    for start in flicks:
+        points.append((start, (200, 128)))
+        points.append((start + 0.1, (128, 128)))
+    sim.nunchuk(joystick=steps(points, initial=(128, 128)),
+                c=pulses([0.2], 1.2), z=pulses([0.2], 1.2))
+    return [Stimulus(start, "hid", "mouse", mouse_moves, "stick") for start in flicks]
+
+
+def nunchuck_shake(sim):
+    """Half-second 8 Hz side-to-side shakes (X axis) toggle the tilt-mouse mode."""
+    shakes = [1.0, 3.0]
+
+    def acceleration(t):
+        for start in shakes:
+            if start <= t < start + 0.5:
+                return (512 + 350 * math.sin(2 * math.pi * 8 * (t - start)), 512, 512)
+        return (512, 512, 512)
+
+    sim.nunchuk(acceleration=acceleration)
+    return [
+        Stimulus(shakes[0], "print", "console", lambda line: "ACCEL" in line, "shake"),
+        Stimulus(shakes[1], "print", "console", lambda line: "KEYBOARD" in line, "shake"),
+    ]
+
+
+def gamepad_x_is(x):
+    return lambda report: report[0] == x
+
+
+def nunchuck_gamepad(sim):
+    """Same stick sweep as nunchuck_sweep, read as absolute gamepad X (boot.py enables it)."""
+    points = []
+    stimuli = []
+    t = 0.5
+    for cycle in range(4):
+        for x in (128, 60, 20, 60, 128, 196, 236, 196, 128):
+            points.append((t, (x, 128)))
+            stimuli.append(Stimulus(t, "hid", "gamepad", gamepad_x_is(x), "stick", state=True))
+            t += 0.1
+    sim.nunchuk(joystick=steps(points, initial=(128, 128)))
+    return stimuli
+
+
+def nunchuck_mode_cycle(sim):
+    """With the gamepad enabled, C+Z holds step gamepad -> keyboard -> joystick -> gamepad."""
+    holds = [0.3, 2.5, 4.2]
+    sim.nunchuk(joystick=steps([(2.0, (20, 128)), (2.2, (128, 128))], initial=(128, 128)),
+                c=pulses(holds, 1.2), z=pulses(holds, 1.2))
+    return [
+        Stimulus(1.5, "print", "console", lambda line: "KEYBOARD" in line, "c+z"),
+        Stimulus(2.0, "hid", "keyboard", keyboard_has(KEY_LEFT), "stick", state=True),
+        Stimulus(3.7, "print", "console", lambda line: "JOYSTICK" in line, "c+z"),
+        Stimulus(5.4, "print", "console", lambda line: "GAMEPAD" in line, "c+z"),
+    ]
+
+
+# --- LemonMediaButtons ---
+LEMON_PINS = ("A1", "A2", "A3", "SCK", "MISO", "MOSI")
+LEMON_CODES = (0xB4, 0xE2, 0xEA, 0xB3, 0xE9, 0xCD)
+
+
+def lemon_taps(sim):
+    """Each media button tapped for 80 ms in turn; a short press fires on release."""
+    stimuli = []
+    for i, pin in enumerate(LEMON_PINS):
+        starts = [0.3 + 0.15 * i + 1.0 * n for n in range(4)]
+        sim.set_input(pin, active_low_taps(starts, 0.08))
+        for start in starts:
+            stimuli.append(Stimulus(start + 0.08, "hid", "consumer_control",
+                                    consumer_is(LEMON_CODES[i]), pin))
+    return stimuli
+
+
+def lemon_chord(sim):
+    """Vol+/Vol- chord held into brightness mode while Play/Pause is tapped."""
+    sim.set_input("A3", active_low_taps([0.5], 5.5))
+    sim.set_input("MISO", active_low_taps([0.5], 5.5))
+    taps = [1.0, 2.0, 3.0, 7.0, 8.0]
+    sim.set_input("MOSI", active_low_taps(taps, 0.08))
+    return [Stimulus(t + 0.08, "hid", "consumer_control", consumer_is(0xCD), "MOSI") for t in taps]
+
+
+def lemon_slow_host(sim):
+    """Quick taps while the serial monitor reads the console at only 100 bytes/s."""
+    sim.serial_rate = 100
+    stimuli = []
+    for i, pin in enumerate(LEMON_PINS):
+        starts = [0.3 + 0.2 * i + 1.2 * n for n in range(4)]
+        sim.set_input(pin, active_low_taps(starts, 0.06))
+        for start in starts:
+            stimuli.append(Stimulus(start + 0.06, "hid", "consumer_control",
+                                    consumer_is(LEMON_CODES[i]), pin))
+    return stimuli
+
+
+def lemon_log_data(sim):
+    """Rapid taps with the log on the binary data port, read at 400 bytes/s."""
+    stimuli = lemon_slow_host(sim)
+    sim.serial_rate = 400
+    return stimuli
+
+
+def log_records(sim):
+    """Records decoded from the data port, and the lines they carry."""
+    decoder = Decoder()
+    lines = []
+    for event in sim.recorder.events("cdc", "data"):
+        lines.extend(text for _, _, text in decoder.feed(event.data))
+    return {
+        "log_records": len(lines),
+        "log_button_lines": sum(1 for line in lines if line.startswith("[Button")),
+        "log_bytes_skipped": decoder.skipped,
+    }
+
+
+# --- NeoTrinkey ---
+TRINKEY_COLORS = ((0, 255, 0), (0, 0, 255), (255, 255, 0), (0, 255, 255), (255, 0, 255), (255, 255, 255))
+
+
+def trinkey_taps(sim):
+    """Touch 1 tapped to step through the colours; each release recolours the pixels."""
+    starts = [0.5 + 0.4 * i for i in range(len(TRINKEY_COLORS))]
+    sim.set_input("TOUCH1", pulses(starts, 0.1))
+    return [
+        Stimulus(start + 0.1, "pixels", "NEOPIXEL", pixels_match(color), "touch1", state=True)
+        for start, color in zip(starts, TRINKEY_COLORS)
+    ]
+
+
+def trinkey_rainbow(sim):
+    """Seven taps into the rainbow, then Touch 2 back to white and Touch 1 into the rainbow again."""
+    starts = [0.5 + 0.3 * i for i in range(7)]
+    back = [4.0, 5.0, 6.0]
+    sim.set_input("TOUCH1", pulses(starts + [t + 0.5 for t in back], 0.1))
+    sim.set_input("TOUCH2", pulses(back, 0.1))
+    return [
+        Stimulus(t + 0.1, "pixels", "NEOPIXEL", pixels_match((255, 255, 255)), "touch2",
+                 state=True)
+        for t in back
+    ]
+
+
+def trinkey_clicker(sim):
+    """Touch 1 held for 3 s to ramp the autoclicker to its fastest setting."""
+    sim.set_input("TOUCH1", pulses([0.5], 3.0))
+    return []
+
+
+def red_at(level):
+    """Pixel data whose first pixel is red (GRB) at ``level`` of full brightness."""
+    return lambda data: data[0] == 0 and data[1] == int(255 * level) and data[2] == 0
+
+
+def trinkey_brightness(sim):
+    """Both pads held for 1.6 s: three brightness steps, then the release keeps the colour.
+
+    Touch 1's long press fires at 1.0 s and repeats every 0.25 s, stepping
+    0.1 -> 0.2 -> 0.35 -> 0.5; with both pads down neither the click rate
+    nor the colour changes.
+    """
+    sim.set_input("TOUCH1", pulses([0.5], 1.6))
+    sim.set_input("TOUCH2", pulses([0.52], 1.6))
+    return [Stimulus(t, "pixels", "NEOPIXEL", red_at(level), "both", state=True)
+            for t, level in ((1.5, 0.2), (1.75, 0.35), (2.0, 0.5), (2.2, 0.5))]
+
+
+def click_timing(sim, start=4.5):
+    """Achieved click rate and interval jitter once the clicker has settled."""
+    presses = []
+    held = False
+    for event in sim.recorder.events("hid", "mouse"):
+        down = bool(event.data[0] & 1)
+        if down and not held and event.t >= start:
+            presses.append(event.end)
+        held = down
+    intervals = [b - a for a, b in zip(presses, presses[1:])]
+    if not intervals:
+        return {"clicks_per_s": 0.0, "click_jitter_p99_ms": None}
+    mean = sum(intervals) / len(intervals)
+    return {
+        "clicks_per_s": round((len(presses) - 1) / (presses[-1] - presses[0]), 1),
+        "click_jitter_p99_ms": round(percentile([abs(i - mean) for i in intervals], 99) * 1000, 3),
+    }
+
+
+# --- Macropad ---
+MACROPAD_NUMPAD = (0x1E, 0x1F, 0x20, 0x21, 0x22, 0x23, 0x24, 0x25, 0x26, 0x27, 0x2D, 0x2E)
+
+
+def macropad_storm(sim):
+    """Overlapping 60 ms key presses every 25 ms across all twelve keys (NumPad profile)."""
+    rng = random.Random(2)
+    presses = {i: [] for i in range(12)}
+    stimuli = []
+    t = 0.5
+    busy_until = [0.0] * 12
+    while t < 4.5:
+        key = rng.randrange(12)
+        if busy_until[key] <= t:
+            presses[key].append(t)
+            busy_until[key] = t + 0.1
+            code = MACROPAD_NUMPAD[key]
+            stimuli.append(Stimulus(t, "hid", "keyboard", keyboard_has(code), "press", state=True))
+            stimuli.append(Stimulus(t + 0.06, "hid", "keyboard", keyboard_lacks(code), "release",
+                                    state=True))
+        t += 0.025
+    for key, starts in presses.items():
+        sim.set_input("KEY%d" % (key + 1), active_low_taps(starts, 0.06))
+    return stimuli
+
+
+def macropad_rollover(sim):
+    """Key 1 held for 3 s while the other keys are tapped; it must stay down throughout.
+
+    Profiles come from macropad_profiles.json on the drive (the storm uses the built-ins).
+    """
+    with open(os.path.join(REPO_ROOT, "macropad_profiles.json"), "rb") as f:
+        sim.add_file("/macropad_profiles.json", f.read())
+    held = MACROPAD_NUMPAD[0]
+    stimuli = [Stimulus(0.5, "hid", "keyboard", keyboard_has(held), "hold", state=True)]
+    presses = {i: [] for i in range(1, 12)}
+    t = 0.7
+    key = 1
+    while t < 3.3:
+        presses[key].append(t)
+        code = MACROPAD_NUMPAD[key]
+        stimuli.append(Stimulus(t, "hid", "keyboard", keyboard_has(code), "press", state=True))
+        stimuli.append(Stimulus(t + 0.06, "hid", "keyboard", keyboard_lacks(code), "release",
+                                state=True))
+        # Releasing the tapped key must not let go of the held one
+        stimuli.append(Stimulus(t + 0.09, "hid", "keyboard", keyboard_has(held), "still held",
+                                state=True))
+        key = key % 11 + 1
+        t += 0.1
+    stimuli.append(Stimulus(3.5, "hid", "keyboard", keyboard_lacks(held), "release", state=True))
+    sim.set_input("KEY1", active_low_taps([0.5], 3.0))
+    for key, starts in presses.items():
+        sim.set_input("KEY%d" % (key + 1), active_low_taps(starts, 0.06))
+    return stimuli
+
+
+def macropad_eight_keys(sim):
+    """Eight keys held at once; the seventh and eighth go out as the first two are let go.
+
+    The keyboard report has six slots, so the last two wait until there is room.
+    """
+    starts = [0.5 + 0.05 * key for key in range(8)]
+    ends = [1.2, 1.4] + [1.8] * 6
+    stimuli = [Stimulus(starts[5], "hid", "keyboard", keyboard_has(MACROPAD_NUMPAD[5]),
+                        "sixth", state=True),
+               Stimulus(ends[0], "hid", "keyboard", keyboard_has(MACROPAD_NUMPAD[6]),
+                        "seventh", state=True),
+               Stimulus(ends[1], "hid", "keyboard", keyboard_has(MACROPAD_NUMPAD[7]),
+                        "eighth", state=True),
+               Stimulus(ends[-1], "hid", "keyboard", lambda report: not any(report),
+                        "all up", state=True)]
+    for key in range(8):
+        sim.set_input("KEY%d" % (key + 1), active_low_taps([starts[key]], ends[key] - starts[key]))
+    return stimuli
+
+
+MACRO_PROFILE = {
+    "name": "Macro",
+    "volume": False,
+    "keys": {"0": "ONE"},
+    "shortcuts": [["https://youtube.com", {"key": "RETURN"}]],
+}
+
+
+def macropad_macro(sim):
+    """A 20-character shortcut played from an encoder click while key 1 is tapped."""
+    sim.add_file("/macropad_profiles.json", json.dumps([MACRO_PROFILE]).encode())
+    sim.set_input("BUTTON", active_low_taps([0.5], 0.1))     # released at 0.6: play
+    taps = [0.65 + i * 0.1 for i in range(5)]
+    sim.set_input("KEY1", active_low_taps(taps, 0.05))
+    stimuli = []
+    for t in taps:
+        stimuli.append(Stimulus(t, "hid", "keyboard", keyboard_has(0x1E), "press", state=True))
+        stimuli.append(Stimulus(t + 0.05, "hid", "keyboard", keyboard_lacks(0x1E), "release",
+                                state=True))
+    return stimuli
+
+
+FULL_PROFILE = {
+    "name": "Full",
+    "volume": False,
+    "keys": {str(key): name for key, name in enumerate("ABCDEF")},
+    "shortcuts": [["xa"]],
+}
+
+
+def macropad_macro_full(sim):
+    """A shortcut played while six keys fill the report, one of them holding a key it types.
+
+    "x" waits until keys 2-6 go up; typing "a" must not release the A key 1 still holds.
+    """
+    sim.add_file("/macropad_profiles.json", json.dumps([FULL_PROFILE]).encode())
+    # Keys down once the file's profile has loaded, at about 0.42 s
+    sim.set_input("KEY1", active_low_taps([0.6], 1.4))
+    for key in range(2, 7):
+        sim.set_input("KEY%d" % key, active_low_taps([0.6], 0.9))
+    sim.set_input("BUTTON", active_low_taps([0.7], 0.1))     # released at 0.8: play
+    return [
+        Stimulus(1.5, "hid", "keyboard", keyboard_has(0x1B), "x", state=True),
+        Stimulus(1.7, "hid", "keyboard", keyboard_has(0x04), "a held", state=True),
+        Stimulus(2.0, "hid", "keyboard", keyboard_lacks(0x04), "a up", state=True),
+    ]
+
+
+def macro_timing(sim, start=0.6):
+    """How long the shortcut took to type, up to the report with its final RETURN."""
+    done = [e.end for e in sim.recorder.events("hid", "keyboard")
+            if e.t >= start and 0x28 in e.data[2:]]
+    return {"macro_ms": round((done[-1] - start) * 1000, 1) if done else None}
+
+
+def display_shows(text):
+    return lambda data: text in data[1]
+
+
+def macropad_menu_spin(sim):
+    """Long-press into the profile menu, then spin the encoder 23 steps in under half a second."""
+    sim.set_input("BUTTON", active_low_taps([0.5], 1.2))     # released at 1.7: menu on
+    spin = [(2.0 + i * 0.02, i + 1) for i in range(23)]
+    sim.set_input("ENCODER_A", steps(spin, initial=0))
+    # 23 steps from NumPad lands on the fourth profile
+    return [Stimulus(spin[-1][0], "display", "oled", display_shows("Windows\nShortcuts"),
+                     "menu", state=True)]
+
+
+def spin_redraws(sim, start=2.0, end=2.6):
+    """Display redraws, and text groups built from scratch, while the encoder spins."""
+    def count(source):
+        return sum(1 for e in sim.recorder.events("display", source) if start <= e.t < end)
+    return {"spin_redraws": count("oled"), "spin_group_builds": count("build")}
+
+
+VOLUME_UP = 0xE9
+VOLUME_DOWN = 0xEA
+
+
+def macropad_volume_spin(sim):
+    """A fast 40-detent spin, five slow detents, then a quick 10-detent turn back.
+
+    The fast turns move two detents between position reads, as when a loop is busy.
+    """
+    points = [(0.5 + i * 0.02, 2 * (i + 1)) for i in range(20)]
+    points += [(2.0 + i * 0.3, 41 + i) for i in range(5)]
+    points += [(4.0 + i * 0.02, 43 - 2 * i) for i in range(5)]
+    sim.set_input("ENCODER_A", steps(points, initial=0))
+    # Each slow detent should cause exactly one tap, promptly
+    return [Stimulus(2.0 + i * 0.3, "hid", "consumer_control", consumer_is(VOLUME_UP), "slow")
+            for i in range(5)]
+
+
+def volume_taps(sim):
+    """Volume taps sent for each part of macropad_volume_spin, and the peak tap rate."""
+    taps = [(e.t, e.data[0] | e.data[1] << 8) for e in sim.recorder.events("hid", "consumer_control")]
+    taps = [(t, code) for t, code in taps if code in (VOLUME_UP, VOLUME_DOWN)]
+
+    def count(code, start, end):
+        return sum(1 for t, c in taps if c == code and start <= t < end)
+
+    times = [t for t, _ in taps]
+    peak = max((sum(1 for u in times if t <= u < t + 1.0) for t in times), default=0)
+    return {
+        "fast_spin_taps": count(VOLUME_UP, 0.5, 2.0),
+        "slow_taps": count(VOLUME_UP, 2.0, 4.0),
+        "turn_back_taps": count(VOLUME_DOWN, 4.0, 6.0),
+        "taps_peak_per_s": peak,
+    }
+
+
+# --- Prop-Maker ---
+def propmaker_tilt(sim):
+    """Slow tilt sweep across the colour zones with a little sensor noise."""
+    rng = random.Random(5)
+    points = []
+    for i in range(200):
+        x = -1.0 + (i % 100) / 50.0
+        points.append((i * 0.02, (x + rng.uniform(-0.01, 0.01), 0.0, 1.0)))
+    sim.lis3dh(acceleration=steps(points, initial=(0.0, 0.0, 1.0)))
+    sim.add_file("/StreetChicken.wav", wav_file(2.0))
+    return []
+
+
+def propmaker_hold(sim):
+    """Held tilted with x on the green/blue boundary and hand tremor, then set down flat."""
+    rng = random.Random(6)
+
+    def acceleration(t):
+        if t < 2.0:
+            return (rng.gauss(0.0, 0.03), 0.3 + rng.gauss(0.0, 0.03), 0.95 + rng.gauss(0.0, 0.03))
+        return (rng.gauss(0.0, 0.01), rng.gauss(0.0, 0.01), 1.0 + rng.gauss(0.0, 0.01))
+
+    sim.lis3dh(acceleration=acceleration)
+    sim.add_file("/StreetChicken.wav", wav_file(2.0))
+    return []
+
+
+def propmaker_taps(sim):
+    """Held level and tapped every 0.5 s (a 15 ms 1.5 g jolt), with /tap.wav to play."""
+    starts = [1.0 + 0.5 * n for n in range(6)]
+    jolts = pulses(starts, 0.015, on=(1.5, 0.0, 1.0), off=(0.2, 0.0, 1.0))
+    sim.lis3dh(acceleration=jolts)
+    sim.add_file("/StreetChicken.wav", wav_file(2.0))
+    sim.add_file("/tap.wav", wav_file(0.2))
+    return [Stimulus(t, "audio", "voice", lambda data: data == ("play", "RawSample"), "tap")
+            for t in starts]
+
+
+def accel_traffic(sim):
+    """Accelerometer samples the script received, and the I2C bytes each one cost."""
+    model = sim.i2c_devices[0x18]
+    events = sim.recorder.events("i2c", 0x18)
+    # The address byte of every transaction, then the data
+    wire = sum(1 + len(e.data[1]) for e in events)
+    samples = model.samples_read
+    return {
+        "accel_samples_per_s": round(samples / sim.clock.now(), 1),
+        "accel_i2c_bytes_per_sample": round(wire / samples, 2) if samples else None,
+    }
+
+
+# --- AudioBFF ---
+def sd_file(sim, name, data):
+    """Put ``name`` in the root of the simulated SD card (inserted if it isn't yet)."""
+    directory = sim.sd_dir or sim.sd_card()
+    with open(os.path.join(directory, name), "wb") as f:
+        f.write(data)
+
+
+def audio_answered(data):
+    return data[0] in ("play", "stop")
+
+
+def audiobff_buttons(sim):
+    """Short clips on flash and SD and one long track; the button pressed every 0.7 s.
+
+    Each press starts a clip, or stops the one playing; its latency runs to
+    the mixer voice starting or stopping.
+    """
+    sim.add_file("/1.wav", wav_file(0.4))
+    sd_file(sim, "2.wav", wav_file(0.3))
+    sd_file(sim, "3.wav", wav_file(0.5))
+    sd_file(sim, "4.wav", wav_file(6.0))
+    starts = [1.0 + 0.7 * n for n in range(12)]
+    sim.set_input("BUTTON", active_low_taps(starts, 0.12))
+    return [Stimulus(t, "audio", "voice", audio_answered, "BUTTON") for t in starts]
+
+
+def audio_starts(sim):
+    """Voice starts from RAM and from files, mixer buffers allocated and I2S output restarts."""
+    plays = [e.data for e in sim.recorder.events("audio", "voice") if e.data[0] == "play"]
+    return {
+        "audio_ram_starts": sum(1 for data in plays if data[1] == "RawSample"),
+        "audio_file_starts": sum(1 for data in plays if data[1] == "WaveFile"),
+        "audio_mixer_allocs": len(sim.recorder.events("audio", "mixer")),
+        "audio_output_restarts": sum(
+            1 for e in sim.recorder.events("audio", "i2s") if e.data[0] == "play"),
+    }
+
+
+def audiobff_library(sim):
+    """A card of 160 clips in two folders, scanned on a first boot and again from its manifest.
+
+    The button is pressed a few times to check clips found in subfolders play.
+    """
+    sim.add_file("/1.wav", wav_file(0.2))
+    directory = sim.sd_card()
+    for folder, count in (("clips", 150), ("sfx", 10)):
+        os.mkdir(os.path.join(directory, folder))
+        for n in range(count):
+            sd_file(sim, "{}/{} take {}.wav".format(folder, folder, n + 1), wav_file(0.05))
+    starts = [1.0 + 0.7 * n for n in range(4)]
+    sim.set_input("BUTTON", active_low_taps(starts, 0.12))
+    return [Stimulus(t, "audio", "voice", audio_answered, "BUTTON") for t in starts]
+
+
+def _scan_ms(sim):
+    # From the card mounting to the "Audio files found: <count> in <ms> ms" line
+    prints = sim.recorder.events("print", "console")
+    mounted = next((e for e in prints if e.data.startswith("Mounted SD card")), None)
+    found = next((e for e in prints if e.data.startswith("Audio files found")), None)
+    if mounted is None or found is None:
+        return None, None
+    return round((found.t - mounted.t) * 1000, 3), int(found.data.split()[3])
+
+
+def library_scan(sim):
+    """Files found, and the SD scan time on a first boot and on a boot with the manifest."""
+    first_ms, found = _scan_ms(sim)
+    again = Simulation(duration=1.5, drive=sim.drive)
+    again.sd_card(sim.sd_dir)
+    again.run("Qtpy ESP32-S3 AudioBFF")
+    cached_ms, _ = _scan_ms(again)
+    return {"library_files": found, "library_scan_ms": first_ms,
+            "library_cached_scan_ms": cached_ms}
+
+
+def audiobff_rewritten(sim):
+    """A card clip rewritten in another format after the manifest was saved, then played.
+
+    Rewriting a file in place leaves its folder's time, size and listing
+    alone, so the manifest still has the old format for it; the press must
+    play it anyway (on a mixer for the new format) and update the manifest.
+    """
+    directory = sim.sd_card()
+    with open(os.path.join(directory, "2.wav"), "wb") as f:
+        f.write(wav_file(0.3))
+    first = Simulation(duration=0.5)
+    first.sd_card(directory)
+    first.run("Qtpy ESP32-S3 AudioBFF")     # Boots once: writes the manifest
+    sim.drive = first.drive
+    with open(os.path.join(directory, "2.wav"), "r+b") as f:
+        f.write(wav_file(0.3, sample_rate=44100, channels=2))
+    starts = [1.0, 1.7]
+    sim.set_input("BUTTON", active_low_taps(starts, 0.12))
+    return [Stimulus(1.0, "audio", "voice", lambda data: data == ("play", "WaveFile"), "BUTTON")]
+
+
+def manifest_format(sim):
+    """The sample rate and channels the manifest has for the rewritten clip, after the run."""
+    with open(os.path.join(sim.sd_dir, ".media_index.json")) as f:
+        entry = json.load(f)["files"]["/sd/2.wav"]
+    return {"manifest_rate": entry[2], "manifest_channels": entry[3],
+            "audio_mixer_allocs": len(sim.recorder.events("audio", "mixer"))}
+
+
+SCENARIOS = [
+    Scenario("nunchuck_sweep", "Wii_Nunchuck.py", 4.5, nunchuck_sweep),
+    Scenario("nunchuck_joystick_mouse", "Wii_Nunchuck.py", 4.5, nunchuck_joystick_mouse),
+    Scenario("nunchuck_shake", "Wii_Nunchuck.py", 4.0, nunchuck_shake),
+    Scenario("nunchuck_gamepad", "Wii_Nunchuck.py", 4.5, nunchuck_gamepad,
+             boot="Wii_Nunchuck_boot.py"),
+    Scenario("nunchuck_mode_cycle", "Wii_Nunchuck.py", 6.0, nunchuck_mode_cycle,
+             boot="Wii_Nunchuck_boot.py"),
+    Scenario("lemon_taps", "LemonMediaButtons.py", 4.5, lemon_taps),
+    Scenario("lemon_chord", "LemonMediaButtons.py", 9.0, lemon_chord),
+    Scenario("lemon_slow_host", "LemonMediaButtons.py", 5.5, lemon_slow_host),
+    Scenario("lemon_log_data", "LemonMediaButtons.py", 5.5, lemon_log_data,
+             boot="LemonMediaButtons_boot.py", extra=log_records),
+    Scenario("trinkey_taps", "NeoTrinkey_MouseClicker.py", 3.5, trinkey_taps),
+    Scenario("trinkey_rainbow", "NeoTrinkey_MouseClicker.py", 7.0, trinkey_rainbow),
+    Scenario("trinkey_brightness", "NeoTrinkey_MouseClicker.py", 3.0, trinkey_brightness),
+    Scenario("trinkey_clicker", "NeoTrinkey_MouseClicker.py", 9.0, trinkey_clicker,
+             extra=click_timing),
+    Scenario("macropad_storm", "macropad.py", 5.0, macropad_storm),
+    Scenario("macropad_rollover", "macropad.py", 4.0, macropad_rollover),
+    Scenario("macropad_eight_keys", "macropad.py", 2.5, macropad_eight_keys),
+    Scenario("macropad_macro", "macropad.py", 2.0, macropad_macro, extra=macro_timing),
+    Scenario("macropad_macro_full", "macropad.py", 2.5, macropad_macro_full),
+    Scenario("macropad_menu_spin", "macropad.py", 3.0, macropad_menu_spin, extra=spin_redraws),
+    Scenario("macropad_volume_spin", "macropad.py", 6.0, macropad_volume_spin, extra=volume_taps),
+    Scenario("propmaker_tilt", "RP2040 Prop-Maker Feather", 4.0, propmaker_tilt,
+             extra=accel_traffic),
+    Scenario("propmaker_hold", "RP2040 Prop-Maker Feather", 4.0, propmaker_hold),
+    Scenario("propmaker_taps", "RP2040 Prop-Maker Feather", 4.0, propmaker_taps),
+    Scenario("audiobff_buttons", "Qtpy ESP32-S3 AudioBFF", 10.0, audiobff_buttons,
+             extra=audio_starts),
+    Scenario("audiobff_rewritten", "Qtpy ESP32-S3 AudioBFF", 2.5, audiobff_rewritten,
+             extra=manifest_format),
+    Scenario("audiobff_library", "Qtpy ESP32-S3 AudioBFF", 4.0, audiobff_library,
+             extra=library_scan),
+]
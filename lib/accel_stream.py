@@ -0,0 +1,158 @@
+"""Stream LIS3DH acceleration through its 32-sample FIFO, a batch per I2C burst.
+
+Polling ``adafruit_lis3dh.LIS3DH.acceleration`` costs a range register read
+and a 6-byte read for every sample, returns floats in m/s^2, and gets one
+sample per loop however fast the sensor runs. AccelStream puts the sensor's
+FIFO in stream mode instead: it samples at ``data_rate`` on its own, and
+read() fetches everything queued since the last call in one burst into a
+preallocated buffer and converts it to milli-g with integer maths. With
+``int1`` (the pin the sensor's INT1 is wired to) read() doesn't touch the
+bus at all until the FIFO holds more than ``watermark`` samples or a tap
+was detected.
+
+    i2c = busio.I2C(board.SCL, board.SDA, frequency=400000)
+    accel = AccelStream(i2c, data_rate=400, watermark=4, int1=int1_pin)
+    while True:
+        if accel.read():
+            print(accel.x, accel.y, accel.z)          # batch mean, mg
+            for i in range(accel.count):
+                effect(accel.samples[3 * i])         # every x sample, mg
+        ...
+
+``samples`` holds ``count`` x, y, z triples, oldest first; it is
+overwritten by the next read(). ``overruns`` counts reads that found the
+FIFO full, so the oldest samples had been lost. ``taps`` counts the single
+taps detected (enable them with ``tap_threshold``).
+"""
+from array import array
+
+from adafruit_bus_device.i2c_device import I2CDevice
+
+_WHO_AM_I = 0x0F
+_CTRL_REG1 = 0x20
+_CTRL_REG3 = 0x22
+_CTRL_REG4 = 0x23
+_CTRL_REG5 = 0x24
+_OUT_X_L = 0x28
+_FIFO_CTRL_REG = 0x2E
+_FIFO_SRC_REG = 0x2F
+_CLICK_CFG = 0x38
+_CLICK_SRC = 0x39
+_CLICK_THS = 0x3A
+_TIME_LIMIT = 0x3B
+_AUTO_INCREMENT = 0x80
+
+FIFO_SIZE = 32
+
+# CTRL_REG1 ODR codes by sample rate, and CTRL_REG4 FS codes by range in g
+_DATA_RATES = {1: 1, 10: 2, 25: 3, 50: 4, 100: 5, 200: 6, 400: 7, 1344: 9}
+_RANGES = {2: 0, 4: 1, 8: 2, 16: 3}
+# High-resolution sensitivity, mg per 12-bit count, for each range
+_MG_PER_COUNT = {2: 1, 4: 2, 8: 4, 16: 12}
+
+
+class AccelStream:
+    """FIFO-streamed LIS3DH at ``address``; x, y, z and samples in milli-g."""
+
+    def __init__(self, i2c, address=0x18, *, data_rate=400, range=2, watermark=8,
+                 int1=None, tap_threshold=None):
+        if data_rate not in _DATA_RATES:
+            raise ValueError("data_rate must be one of %s" % sorted(_DATA_RATES))
+        if range not in _RANGES:
+            raise ValueError("range must be 2, 4, 8 or 16")
+        if not 1 <= watermark < FIFO_SIZE:
+            raise ValueError("watermark must be 1-31")
+        self._device = I2CDevice(i2c, address)
+        self._int1 = int1
+        self._scale = _MG_PER_COUNT[range]
+        self._command = bytearray(2)
+        self._status = bytearray(1)
+        self._raw = bytearray(FIFO_SIZE * 6)
+        self.samples = array("h", bytes(FIFO_SIZE * 6))
+        self.count = 0
+        self.x = 0
+        self.y = 0
+        self.z = 0
+        self.overruns = 0
+        self.taps = 0
+        self._taps_enabled = tap_threshold is not None
+
+        if self._read_register(_WHO_AM_I) != 0x33:
+            raise RuntimeError("Failed to find LIS3DH!")
+        # Bypass first: empties whatever an earlier run left in the FIFO
+        self._write_register(_FIFO_CTRL_REG, 0x00)
+        # All axes, normal mode; BDU, high resolution and the range
+        self._write_register(_CTRL_REG1, (_DATA_RATES[data_rate] << 4) | 0x07)
+        self._write_register(_CTRL_REG4, 0x88 | (_RANGES[range] << 4))
+        # FIFO on. (LIR_INT1 would only latch the unused INT1_CFG events; the
+        # watermark is a level, and a click is latched through CLICK_THS.)
+        self._write_register(_CTRL_REG5, 0x40)
+        # Stream mode: keeps the newest 32 samples; WTM once above the watermark
+        self._write_register(_FIFO_CTRL_REG, 0x80 | watermark)
+        routed = 0x04   # I1_WTM
+        if self._taps_enabled:
+            # Single tap on any axis; threshold in 1/128ths of the range.
+            # LIR_Click keeps a tap in CLICK_SRC (and INT1 up) until read()
+            # reads it, so one between two reads isn't lost.
+            self._write_register(_CLICK_CFG, 0x15)
+            self._write_register(_CLICK_THS, 0x80 | (tap_threshold & 0x7F))
+            self._write_register(_TIME_LIMIT, 10)
+            routed |= 0x80  # I1_CLICK
+        self._write_register(_CTRL_REG3, routed)
+
+    def read(self):
+        """Fetch and convert the queued samples; returns how many (0: nothing new)."""
+        if self._int1 is not None and not self._int1.value:
+            return 0
+        status = self._status
+        command = self._command
+        raw = self._raw
+        with self._device as i2c:
+            if self._taps_enabled:
+                command[0] = _CLICK_SRC
+                i2c.write_then_readinto(command, status, out_end=1)
+                if status[0] & 0x40:
+                    self.taps += 1
+            command[0] = _FIFO_SRC_REG
+            i2c.write_then_readinto(command, status, out_end=1)
+            source = status[0]
+            if source & 0x40:
+                self.overruns += 1
+                count = FIFO_SIZE
+            else:
+                count = source & 0x1F
+            if count:
+                command[0] = _OUT_X_L | _AUTO_INCREMENT
+                i2c.write_then_readinto(command, raw, out_end=1, in_end=count * 6)
+        if not count:
+            return 0
+        # Left-aligned 12-bit two's complement, little-endian, x y z per sample
+        samples = self.samples
+        scale = self._scale
+        sum_x = sum_y = sum_z = 0
+        for i in range(count * 3):
+            value = raw[2 * i] | (raw[2 * i + 1] << 8)
+            if value & 0x8000:
+                value -= 0x10000
+            samples[i] = (value >> 4) * scale
+        for i in range(0, count * 3, 3):
+            sum_x += samples[i]
+            sum_y += samples[i + 1]
+            sum_z += samples[i + 2]
+        self.count = count
+        self.x = sum_x // count
+        self.y = sum_y // count
+        self.z = sum_z // count
+        return count
+
+    def _read_register(self, register):
+        self._command[0] = register
+        with self._device as i2c:
+            i2c.write_then_readinto(self._command, self._status, out_end=1)
+        return self._status[0]
+
+    def _write_register(self, register, value):
+        self._command[0] = register
+        self._command[1] = value
+        with self._device as i2c:
+            i2c.write(self._command)
@@ -0,0 +1,183 @@
+"""Motion to servo and LEDs: filtered, gated, and written only when they change.
+
+Driving a servo straight from raw accelerometer readings passes the sensor
+noise on as a duty-cycle write every loop, and the servo twitches after
+every one of them; mapping tilt to a colour with hard thresholds flickers
+between two colours whenever the tilt sits on a boundary. These pieces sit
+between the two, in integer maths with nothing allocated per update:
+
+    tilt = TiltFilter(shift=4)                  # ~16-sample time constant
+    arm = ServoGate(prop_servo, deadband=2)     # degrees
+    zones = ZoneSelector((-500, 0, 500), hysteresis=50)
+    fade = ColorFade(duration_ms=250)
+    while True:
+        if accel.read():
+            tilt.update(accel.samples, accel.count)
+        arm.update((tilt.x + 1000) * 180 // 2000)   # writes only on a real move
+        fade.target(COLORS[zones.update(tilt.x)])
+        if fade.update():
+            frame.fill(fade.color)
+        frame.show()                                # PixelFrame: only if changed
+"""
+import supervisor
+
+from ticks import ticks_diff
+
+
+class TiltFilter:
+    """Per-axis exponential low-pass over x, y, z sample triples (any unit, ints).
+
+    Each sample moves the output 1/2**shift of the way towards it, so the
+    time constant is 2**shift samples: 40 ms for shift=4 at 400 Hz.
+    """
+
+    def __init__(self, shift=4):
+        self._shift = shift
+        self._acc_x = None  # Filtered values scaled up by 2**shift, for the fraction
+        self._acc_y = 0
+        self._acc_z = 0
+        self.x = 0
+        self.y = 0
+        self.z = 0
+
+    def update(self, samples, count):
+        """Feed ``count`` triples from ``samples`` (x0, y0, z0, x1, ...)."""
+        if not count:
+            return
+        shift = self._shift
+        if self._acc_x is None:
+            # Start from the first sample rather than ramping up from zero
+            self._acc_x = samples[0] << shift
+            self._acc_y = samples[1] << shift
+            self._acc_z = samples[2] << shift
+        acc_x = self._acc_x
+        acc_y = self._acc_y
+        acc_z = self._acc_z
+        for i in range(0, count * 3, 3):
+            acc_x += samples[i] - (acc_x >> shift)
+            acc_y += samples[i + 1] - (acc_y >> shift)
+            acc_z += samples[i + 2] - (acc_z >> shift)
+        self._acc_x = acc_x
+        self._acc_y = acc_y
+        self._acc_z = acc_z
+        self.x = acc_x >> shift
+        self.y = acc_y >> shift
+        self.z = acc_z >> shift
+
+
+class ServoGate:
+    """Sets ``servo.angle`` only when the wanted angle is ``deadband`` degrees or more away.
+
+    Smaller changes are dropped rather than accumulated, so the servo holds
+    still through noise and ``angle`` stays within ``deadband`` of what was
+    asked for. ``writes`` counts the angles actually written.
+    """
+
+    def __init__(self, servo, deadband=2, minimum=0, maximum=180):
+        self._servo = servo
+        self.deadband = deadband
+        self.minimum = minimum
+        self.maximum = maximum
+        self.angle = servo.angle
+        self.writes = 0
+
+    def update(self, angle):
+        """Move to ``angle`` (clamped to the range) if outside the dead-band; True if written."""
+        if angle < self.minimum:
+            angle = self.minimum
+        elif angle > self.maximum:
+            angle = self.maximum
+        current = self.angle
+        if current is not None and -self.deadband < angle - current < self.deadband:
+            return False
+        self._servo.angle = angle
+        self.angle = angle
+        self.writes += 1
+        return True
+
+
+class ZoneSelector:
+    """Which of the ranges split by ``edges`` (ascending) a value is in, with hysteresis.
+
+    The zone only changes once the value is ``hysteresis`` past an edge, so
+    a value sitting on an edge doesn't flip between its two neighbours.
+    """
+
+    def __init__(self, edges, hysteresis=0):
+        self._edges = edges
+        self._hysteresis = hysteresis
+        self.zone = None
+
+    def update(self, value):
+        """Returns the zone index, 0 to len(edges)."""
+        edges = self._edges
+        zone = self.zone
+        if zone is None:
+            zone = 0
+            while zone < len(edges) and value >= edges[zone]:
+                zone += 1
+        else:
+            margin = self._hysteresis
+            while zone > 0 and value < edges[zone - 1] - margin:
+                zone -= 1
+            while zone < len(edges) and value >= edges[zone] + margin:
+                zone += 1
+        self.zone = zone
+        return zone
+
+
+class ColorFade:
+    """An integer crossfade of ``channels`` colour bytes towards a target.
+
+    ``color`` is a bytearray, updated in place, to pass to
+    ``PixelFrame.fill()``. A new target fades from wherever the colour is
+    now over ``duration_ms``; setting the same target again does nothing.
+    """
+
+    def __init__(self, channels=4, duration_ms=250):
+        self.duration_ms = duration_ms
+        self.color = bytearray(channels)
+        self._start_color = bytearray(channels)
+        self._target = bytearray(channels)
+        self._start = 0
+        self._fading = False
+        self._changed = True    # The first update() reports the (all off) colour
+
+    def target(self, color):
+        """Fade to ``color`` (a tuple or bytearray of ``channels`` values)."""
+        wanted = self._target
+        for i in range(len(wanted)):
+            if wanted[i] != color[i]:
+                break
+        else:
+            return
+        self._start_color[:] = self.color
+        for i in range(len(wanted)):
+            wanted[i] = color[i]
+        self._start = supervisor.ticks_ms()
+        self._fading = True
+
+    def update(self):
+        """Step the fade; True if ``color`` changed since the last call."""
+        if not self._fading:
+            changed = self._changed
+            self._changed = False
+            return changed
+        elapsed = ticks_diff(supervisor.ticks_ms(), self._start)
+        color = self.color
+        target = self._target
+        if elapsed >= self.duration_ms:
+            color[:] = target
+            self._fading = False
+            self._changed = False
+            return True
+        # Fade position in 1/256ths, then every channel by integer interpolation
+        step = (elapsed << 8) // self.duration_ms
+        start = self._start_color
+        changed = False
+        for i in range(len(color)):
+            value = start[i] + (((target[i] - start[i]) * step) >> 8)
+            if value != color[i]:
+                color[i] = value
+                changed = True
+        return changed
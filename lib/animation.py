@@ -0,0 +1,161 @@
+"""Table-driven pixel animations with integer phase stepping and a per-frame budget.
+
+The colour wheel and brightness curves are computed once, gamma-corrected,
+into 256-entry tables. Each frame the Animator advances a 16-bit phase by
+integer maths from supervisor.ticks_ms() and the effect renders by table
+lookups into a PixelFrame, so nothing per frame touches floats or calls
+colorwheel().
+
+    frame = PixelFrame(pixels)
+    animator = Animator(frame, fps=60)
+    animator.effect = Rainbow(period=5.0, spread=64)
+    while True:
+        animator.update()   # renders and shows only when a frame is due
+"""
+import supervisor
+
+from ticks import ticks_add, ticks_diff
+
+GAMMA = 2.6
+
+_PHASE_BITS = 24                # 16-bit phase plus 8 fractional bits
+
+
+def _gamma(level):
+    return int(255 * (level / 255) ** GAMMA + 0.5)
+
+
+def _build_tables():
+    gamma = bytearray(_gamma(i) for i in range(256))
+    wheel = bytearray(256 * 3)
+    for pos in range(256):
+        # Same red -> green -> blue -> red cycle as rainbowio.colorwheel()
+        if pos < 85:
+            r, g, b = 255 - pos * 3, pos * 3, 0
+        elif pos < 170:
+            r, g, b = 0, 255 - (pos - 85) * 3, (pos - 85) * 3
+        else:
+            r, g, b = (pos - 170) * 3, 0, 255 - (pos - 170) * 3
+        wheel[pos * 3] = gamma[r]
+        wheel[pos * 3 + 1] = gamma[g]
+        wheel[pos * 3 + 2] = gamma[b]
+    # Triangle up and down over one period, gamma-corrected so it looks even
+    breath = bytearray(gamma[i * 2 if i < 128 else 511 - i * 2] for i in range(256))
+    return gamma, wheel, breath
+
+
+GAMMA_TABLE, WHEEL, BREATH = _build_tables()
+
+
+class Effect:
+    """Base for effects: ``period`` seconds per cycle of the 0..65535 phase."""
+
+    def __init__(self, period=2.0):
+        self.period = period
+
+    def render(self, frame, phase):
+        raise NotImplementedError
+
+
+class Rainbow(Effect):
+    """The colour wheel turning along the strip, ``spread`` wheel steps apart per pixel."""
+
+    def __init__(self, period=5.0, spread=64):
+        super().__init__(period)
+        self.spread = spread
+
+    def render(self, frame, phase):
+        wheel = WHEEL
+        position = phase >> 8
+        for i in range(frame.n):
+            offset = ((position + i * self.spread) & 0xFF) * 3
+            frame.set_rgb(i, wheel[offset], wheel[offset + 1], wheel[offset + 2])
+
+
+class Breathe(Effect):
+    """All pixels fading one colour up and down."""
+
+    def __init__(self, color, period=3.0):
+        super().__init__(period)
+        self.r, self.g, self.b = color[0], color[1], color[2]
+
+    def render(self, frame, phase):
+        level = BREATH[phase >> 8]
+        frame.fill_rgb(self.r * level >> 8, self.g * level >> 8, self.b * level >> 8)
+
+
+class Chase(Effect):
+    """One lit pixel running along the strip with a fading tail of ``tail`` pixels."""
+
+    def __init__(self, color, period=1.0, tail=2):
+        super().__init__(period)
+        self.r, self.g, self.b = color[0], color[1], color[2]
+        self.tail = tail
+
+    def render(self, frame, phase):
+        n = frame.n
+        head = (phase * n) >> 16
+        frame.fill_rgb(0, 0, 0)
+        for step in range(self.tail + 1):
+            # Each tail pixel at half the perceived brightness of the one ahead
+            level = GAMMA_TABLE[255 >> step]
+            frame.set_rgb((head - step) % n, self.r * level >> 8, self.g * level >> 8,
+                          self.b * level >> 8)
+
+
+class Animator:
+    """Renders ``effect`` into ``frame`` at up to ``fps`` frames per second.
+
+    If rendering and showing one frame takes longer than ``budget`` seconds,
+    the frame rate is halved (down to ``min_fps``) so the caller's loop keeps
+    its time for input; it climbs back once frames are cheap again. The phase
+    always follows elapsed time, so a lower frame rate never slows an effect.
+    Keep ``fps`` at or below the frame's own ``max_fps``, or the cap will hold
+    back every other frame.
+    """
+
+    def __init__(self, frame, fps=60, budget=0.004, min_fps=10):
+        self.frame = frame
+        self._base_interval = max(1, 1000 // fps)
+        self._max_interval = max(self._base_interval, 1000 // min_fps)
+        self._interval = self._base_interval
+        self._budget = max(1, int(budget * 1000))
+        self._effect = None
+        self._rate = 0
+        self._phase = 0
+        self._last = supervisor.ticks_ms()
+
+    @property
+    def effect(self):
+        return self._effect
+
+    @effect.setter
+    def effect(self, effect):
+        self._effect = effect
+        self._phase = 0
+        # Phase units (with 8 fractional bits) per millisecond
+        self._rate = int((1 << _PHASE_BITS) / (effect.period * 1000)) if effect else 0
+        self._last = ticks_add(supervisor.ticks_ms(), -self._interval)
+
+    @property
+    def fps(self):
+        return 1000 // self._interval
+
+    def update(self):
+        """Render and show a frame if one is due; True if the pixels were written."""
+        if self._effect is None:
+            return False
+        now = supervisor.ticks_ms()
+        elapsed = ticks_diff(now, self._last)
+        if elapsed < self._interval:
+            return False
+        self._last = now
+        self._phase = (self._phase + elapsed * self._rate) & ((1 << _PHASE_BITS) - 1)
+        self._effect.render(self.frame, self._phase >> 8)
+        written = self.frame.show()
+        cost = ticks_diff(supervisor.ticks_ms(), now)
+        if cost > self._budget and self._interval < self._max_interval:
+            self._interval = min(self._max_interval, self._interval * 2)
+        elif cost * 2 <= self._budget and self._interval > self._base_interval:
+            self._interval = max(self._base_interval, self._interval // 2)
+        return written
@@ -0,0 +1,106 @@
+"""Short press, long press and chord events from a background-scanned ``keypad`` queue.
+
+``keypad.Keys`` scans the pins on its own timer and queues every change with
+the timestamp of the scan that saw it, so nothing is lost while the main
+loop is busy. ButtonEvents turns that queue into higher-level events without
+ever blocking:
+
+- PRESS as soon as a key goes down;
+- LONG_PRESS once it has been held ``long_press`` seconds;
+- SHORT_PRESS on release, unless it became a long press or was part of a chord;
+- HOLD when every key of a registered hold (one key or a chord) has been
+  down together for that hold's duration.
+
+    buttons = ButtonEvents(keypad.Keys(pins, value_when_pressed=False), long_press=1.0)
+    VOLUME_CHORD = buttons.add_hold((2, 4), 5.0)
+    while True:
+        for kind, number in buttons.update():
+            if kind == SHORT_PRESS:
+                ...
+"""
+import keypad
+import supervisor
+
+from ticks import ticks_diff
+
+PRESS = 1
+SHORT_PRESS = 2
+LONG_PRESS = 3
+HOLD = 4
+
+
+class ButtonEvents:
+    """Events for the keys of ``keys`` (a keypad scanner); call update() every tick."""
+
+    def __init__(self, keys, long_press=1.0):
+        self._keys = keys
+        self._event = keypad.Event()
+        count = keys.key_count
+        self.long_press = long_press
+        self._down = [False] * count
+        self._down_at = [0] * count
+        self._long = [False] * count
+        self._consumed = [False] * count
+        self._holds = []
+        self._events = []
+
+    def add_hold(self, key_numbers, duration):
+        """Register a hold; returns the number HOLD events carry for it."""
+        self._holds.append([tuple(key_numbers), int(duration * 1000), False])
+        return len(self._holds) - 1
+
+    def pressed(self, key_number):
+        return self._down[key_number]
+
+    def update(self):
+        """This tick's events as a list of ``(kind, key or hold number)``."""
+        events = self._events
+        events.clear()
+        event = self._event
+        while self._keys.events.get_into(event):
+            number = event.key_number
+            if event.pressed:
+                self._down[number] = True
+                self._down_at[number] = event.timestamp
+                self._long[number] = False
+                self._consumed[number] = False
+                self._join_chords(number)
+                events.append((PRESS, number))
+            elif self._down[number]:
+                self._down[number] = False
+                if not self._long[number] and not self._consumed[number]:
+                    events.append((SHORT_PRESS, number))
+
+        now = supervisor.ticks_ms()
+        long_ms = int(self.long_press * 1000)
+        for number, down in enumerate(self._down):
+            if down and not self._long[number]:
+                if ticks_diff(now, self._down_at[number]) >= long_ms:
+                    self._long[number] = True
+                    events.append((LONG_PRESS, number))
+        for index, hold in enumerate(self._holds):
+            self._check_hold(index, hold, now)
+        return events
+
+    def _join_chords(self, number):
+        # A key that completes a chord makes the whole chord stop counting as short presses
+        for keys, _, _ in self._holds:
+            if len(keys) > 1 and number in keys and all(self._down[k] for k in keys):
+                for k in keys:
+                    self._consumed[k] = True
+
+    def _check_hold(self, index, hold, now):
+        keys, duration, fired = hold
+        for k in keys:
+            if not self._down[k]:
+                hold[2] = False
+                return
+        if fired:
+            return
+        # Held since the last of its keys went down
+        since = min(ticks_diff(now, self._down_at[k]) for k in keys)
+        if since >= duration:
+            hold[2] = True
+            for k in keys:
+                self._consumed[k] = True
+            self._events.append((HOLD, index))
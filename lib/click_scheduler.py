@@ -0,0 +1,95 @@
+"""Deadline-based click timing: the average rate holds even when the loop runs late.
+
+Checking ``now - last_click >= delay`` once per loop rounds every interval
+up to the next loop tick, so the real rate is always below the setting and
+wobbles with the loop period. ClickScheduler keeps an absolute timeline of
+deadlines instead: a late click does not push the following ones back, and
+a tick that is late enough owes two clicks.
+
+Time comes from supervisor.ticks_ms() and the timeline is kept in 1/256 ms
+as a countdown, so everything stays in small integers.
+
+    clicker = ClickScheduler(rate=10)
+    while True:
+        for _ in range(clicker.due()):
+            mouse.click(Mouse.LEFT_BUTTON)
+        time.sleep(min(0.01, clicker.time_to_next()))
+"""
+import supervisor
+
+from ticks import ticks_diff
+
+_FRACTION = 256                 # timeline resolution: 1/256 ms
+
+
+class ClickScheduler:
+    """Clicks due at ``rate`` per second, with achieved-rate and jitter statistics.
+
+    At most ``max_backlog`` owed clicks are kept; after a longer stall the
+    rest are dropped (and counted) rather than fired as one burst.
+    """
+
+    def __init__(self, rate=1.0, max_backlog=2):
+        self.max_backlog = max_backlog
+        self._last = supervisor.ticks_ms()
+        self._interval = 0
+        self._until = 0
+        self.rate = rate
+        self.reset_stats()
+
+    @property
+    def rate(self):
+        return self._rate
+
+    @rate.setter
+    def rate(self, rate):
+        self._rate = rate
+        self._interval = max(1, int(1000 * _FRACTION / rate)) if rate > 0 else 0
+        # Start the new timeline one interval from now
+        self._until = self._interval
+
+    def reset_stats(self):
+        self.clicks = 0
+        self.dropped = 0
+        self._late_sum = 0
+        self._late_max = 0
+        self._stats_start = supervisor.ticks_ms()
+
+    def _advance(self):
+        now = supervisor.ticks_ms()
+        elapsed = ticks_diff(now, self._last)
+        self._last = now
+        self._until -= elapsed * _FRACTION
+
+    def due(self):
+        """Number of clicks to send now (0 most ticks)."""
+        self._advance()
+        if not self._interval or self._until > 0:
+            return 0
+        count = 0
+        while self._until <= 0:
+            count += 1
+            late = -self._until
+            self._late_sum += late
+            if late > self._late_max:
+                self._late_max = late
+            self._until += self._interval
+        if count > self.max_backlog:
+            self.dropped += count - self.max_backlog
+            count = self.max_backlog
+        self.clicks += count
+        return count
+
+    def time_to_next(self):
+        """Seconds from the last due() call until the next click is due."""
+        if not self._interval:
+            return 1.0
+        return max(0, self._until) / (_FRACTION * 1000)
+
+    def stats(self):
+        """(achieved clicks/s, mean lateness ms, max lateness ms) since reset_stats()."""
+        elapsed = ticks_diff(supervisor.ticks_ms(), self._stats_start)
+        fired = self.clicks + self.dropped
+        achieved = self.clicks * 1000 / elapsed if elapsed else 0.0
+        mean_late = self._late_sum / fired / _FRACTION if fired else 0.0
+        return achieved, mean_late, self._late_max / _FRACTION
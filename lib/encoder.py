@@ -0,0 +1,112 @@
+"""Rotary encoder deltas with acceleration, and a paced queue for the steps they cause.
+
+Comparing the encoder position with the last one only gives a direction;
+a fast spin that moves several detents between two reads counts as one
+step. EncoderSteps returns the whole delta since the last read, plus an
+acceleration multiplier picked from the spin speed:
+
+    encoder = EncoderSteps(macropad.encoder, curve=((0, 1), (10, 2), (20, 4)))
+    volume = StepQueue(interval=0.03, limit=50)
+    while True:
+        delta = encoder.update(macropad.encoder)
+        volume.add(delta * encoder.multiplier)
+        step = volume.take()        # -1, 0 or 1, at most one per interval
+        if step:
+            cc.send(VOLUME_INCREMENT if step > 0 else VOLUME_DECREMENT)
+
+``curve`` is a list of ``(detents per second, multiplier)`` pairs in rising
+order; the multiplier of the last pair whose speed is reached applies.
+StepQueue keeps a signed count of pending steps, so turning back cancels
+steps not sent yet, and drops anything beyond ``limit`` rather than keep
+sending long after the knob stopped.
+"""
+import supervisor
+
+from ticks import ticks_add, ticks_diff
+
+# Speed is measured over a window of at least _MIN_SPAN_MS and restarted
+# every _WINDOW_MS, so slowing down takes effect; a pause of _IDLE_MS or a
+# change of direction starts a new spin at multiplier 1
+_MIN_SPAN_MS = 20
+_WINDOW_MS = 200
+_IDLE_MS = 250
+
+
+class EncoderSteps:
+    """Detent deltas from an encoder position; call update() every tick."""
+
+    def __init__(self, position, curve=((0, 1),)):
+        self._position = position
+        self.curve = curve
+        self.multiplier = 1
+        self._direction = 0
+        self._last_move = 0
+        self._window_start = 0
+        self._window_steps = 0
+
+    def update(self, position):
+        """Detents moved since the last call (signed); sets ``multiplier`` for them."""
+        delta = position - self._position
+        if not delta:
+            return 0
+        self._position = position
+        now = supervisor.ticks_ms()
+        direction = 1 if delta > 0 else -1
+        if direction != self._direction or ticks_diff(now, self._last_move) >= _IDLE_MS:
+            self._direction = direction
+            self._window_start = now
+            self._window_steps = 0
+            self.multiplier = 1
+        self._last_move = now
+        self._window_steps += abs(delta)
+        span = ticks_diff(now, self._window_start)
+        if span >= _MIN_SPAN_MS:
+            speed = self._window_steps * 1000 // span
+            multiplier = 1
+            for threshold, value in self.curve:
+                if speed >= threshold:
+                    multiplier = value
+            self.multiplier = multiplier
+            if span >= _WINDOW_MS:
+                self._window_start = now
+                self._window_steps = 0
+        return delta
+
+
+class StepQueue:
+    """Signed pending steps, released one at a time at most every ``interval`` seconds."""
+
+    def __init__(self, interval=0.03, limit=50):
+        self.interval = int(interval * 1000)
+        self.limit = limit
+        self.pending = 0
+        self.dropped = 0
+        self._next = supervisor.ticks_ms()
+
+    def add(self, steps):
+        pending = self.pending + steps
+        if pending > self.limit:
+            self.dropped += pending - self.limit
+            pending = self.limit
+        elif pending < -self.limit:
+            self.dropped += -self.limit - pending
+            pending = -self.limit
+        self.pending = pending
+
+    def clear(self):
+        self.pending = 0
+
+    def take(self):
+        """-1, 0 or 1: the next step, if one is pending and due."""
+        if not self.pending:
+            return 0
+        now = supervisor.ticks_ms()
+        if ticks_diff(self._next, now) > 0:
+            return 0
+        # Idle time doesn't bank up: the next step is due one interval from now
+        self._next = ticks_add(now, self.interval)
+        if self.pending > 0:
+            self.pending -= 1
+            return 1
+        self.pending += 1
+        return -1
@@ -0,0 +1,107 @@
+"""Nunchuk as a USB HID gamepad: stick, accelerometer and buttons in one 6-byte report.
+
+The gamepad is not one of CircuitPython's default HID devices, so boot.py
+has to enable it next to the usual ones (see Wii_Nunchuck_boot.py):
+
+    usb_hid.enable((usb_hid.Device.KEYBOARD, usb_hid.Device.MOUSE,
+                    usb_hid.Device.CONSUMER_CONTROL, gamepad.device()))
+
+Then, in code.py:
+
+    pad = GamepadState(usb_hid.devices)
+    pad.update(snap.x, snap.y, snap.ax, snap.ay, snap.az, snap.c, snap.z)
+    pad.flush()
+"""
+from adafruit_hid import find_device
+
+REPORT_ID = 4
+REPORT_LENGTH = 6
+
+# Report layout, least significant bit first:
+#   X, Y       8 bits each, 0-255 (joystick)
+#   Rx, Ry, Rz 10 bits each, 0-1023 (accelerometer)
+#   buttons    2 bits (1 = Z, 2 = C)
+REPORT_DESCRIPTOR = bytes((
+    0x05, 0x01,        # Usage Page (Generic Desktop)
+    0x09, 0x05,        # Usage (Game Pad)
+    0xA1, 0x01,        # Collection (Application)
+    0x85, REPORT_ID,   #   Report ID
+    0x09, 0x30,        #   Usage (X)
+    0x09, 0x31,        #   Usage (Y)
+    0x15, 0x00,        #   Logical Minimum (0)
+    0x26, 0xFF, 0x00,  #   Logical Maximum (255)
+    0x75, 0x08,        #   Report Size (8)
+    0x95, 0x02,        #   Report Count (2)
+    0x81, 0x02,        #   Input (Data, Var, Abs)
+    0x09, 0x33,        #   Usage (Rx)
+    0x09, 0x34,        #   Usage (Ry)
+    0x09, 0x35,        #   Usage (Rz)
+    0x26, 0xFF, 0x03,  #   Logical Maximum (1023)
+    0x75, 0x0A,        #   Report Size (10)
+    0x95, 0x03,        #   Report Count (3)
+    0x81, 0x02,        #   Input (Data, Var, Abs)
+    0x05, 0x09,        #   Usage Page (Button)
+    0x19, 0x01,        #   Usage Minimum (1)
+    0x29, 0x02,        #   Usage Maximum (2)
+    0x25, 0x01,        #   Logical Maximum (1)
+    0x75, 0x01,        #   Report Size (1)
+    0x95, 0x02,        #   Report Count (2)
+    0x81, 0x02,        #   Input (Data, Var, Abs)
+    0xC0,              # End Collection
+))
+
+
+def device():
+    """The usb_hid.Device to pass to usb_hid.enable() in boot.py."""
+    import usb_hid
+
+    return usb_hid.Device(
+        report_descriptor=REPORT_DESCRIPTOR,
+        usage_page=0x01,
+        usage=0x05,
+        report_ids=(REPORT_ID,),
+        in_report_lengths=(REPORT_LENGTH,),
+        out_report_lengths=(0,),
+    )
+
+
+def pack(report, x, y, ax, ay, az, c, z):
+    """Write one gamepad report into the 6-byte ``report`` buffer."""
+    report[0] = x & 0xFF
+    report[1] = y & 0xFF
+    # Three 10-bit axes and the two buttons fill the remaining 32 bits exactly
+    report[2] = ax & 0xFF
+    report[3] = (ax >> 8 & 0x03) | (ay & 0x3F) << 2
+    report[4] = (ay >> 6 & 0x0F) | (az & 0x0F) << 4
+    report[5] = (az >> 4 & 0x3F) | (0x40 if z else 0) | (0x80 if c else 0)
+
+
+class GamepadState:
+    """Latest Nunchuk reading as a gamepad report, sent only when it changes."""
+
+    def __init__(self, devices):
+        self._report = bytearray(REPORT_LENGTH)
+        self._sent = bytearray(REPORT_LENGTH)
+        self.release_all()
+        self._device = find_device(devices, usage_page=0x01, usage=0x05)
+        self._dirty = True
+
+    def update(self, x, y, ax, ay, az, c, z):
+        pack(self._report, x, y, ax, ay, az, c, z)
+
+    def release_all(self):
+        """Centre the stick and axes and release both buttons."""
+        pack(self._report, 128, 128, 512, 512, 512, False, False)
+
+    def flush(self):
+        if self._dirty or self._report != self._sent:
+            try:
+                self._device.send_report(self._report)
+            except OSError:
+                # Host not listening yet (just plugged in): still unsent, so the
+                # next flush() tries again instead of sleeping in the send task
+                return False
+            self._sent[:] = self._report
+            self._dirty = False
+            return True
+        return False
@@ -0,0 +1,141 @@
+"""Streaming shake / flick / tilt-hold detection over a 3-axis accelerometer.
+
+Each update() is O(1) whatever the window sizes: per-sample jerk (the largest
+change on any one axis) goes into a fixed ring buffer, and the detector
+keeps running counters for each window instead of rescanning history.
+
+    gestures = GestureDetector(shake_window=3, shake_count=3)
+    while True:
+        gesture = gestures.update(ax, ay, az, time.monotonic())
+        if gesture == SHAKE:
+            ...
+"""
+from array import array
+
+NONE = 0
+SHAKE = 1
+FLICK = 2
+TILT_HOLD = 3
+
+# Directions reported in GestureDetector.direction after TILT_HOLD
+TILT_LEFT = 1
+TILT_RIGHT = 2
+TILT_BACK = 3
+TILT_FORWARD = 4
+
+
+class GestureDetector:
+    """Feed raw accelerometer samples; update() returns the gesture detected, if any.
+
+    - SHAKE: at least ``shake_count`` of the last ``shake_window`` samples have
+      a jerk above ``shake_threshold``.
+    - FLICK: the jerk summed over the last ``flick_window`` samples reaches
+      ``flick_threshold`` and the latest sample is already quiet, without
+      being a shake.
+    - TILT_HOLD: X or Y stays more than ``tilt_threshold`` from ``tilt_center``
+      for ``tilt_hold`` seconds; ``direction`` says which way.
+
+    Shakes and flicks are each suppressed for ``debounce`` seconds after they fire.
+    """
+
+    def __init__(self, shake_threshold=60, shake_window=3, shake_count=3,
+                 flick_threshold=150, flick_window=4,
+                 tilt_center=(512, 512), tilt_threshold=120, tilt_hold=1.0,
+                 debounce=1.5):
+        self.shake_threshold = shake_threshold
+        self.shake_window = shake_window
+        self.shake_count = shake_count
+        self.flick_threshold = flick_threshold
+        self.flick_window = flick_window
+        self.tilt_cx, self.tilt_cy = tilt_center
+        self.tilt_threshold = tilt_threshold
+        self.tilt_hold = tilt_hold
+        self.debounce = debounce
+        self.direction = 0
+
+        self._size = max(shake_window, flick_window)
+        self._jerk = array("H", [0] * self._size)
+        self._head = 0
+        self._strong = 0        # samples above shake_threshold in the shake window
+        self._energy = 0        # jerk summed over the flick window
+        self._prev = None       # last sample as [ax, ay, az], updated in place
+        self._tilt_dir = 0
+        self._tilt_since = 0.0
+        self._tilt_fired = False
+        self._last_shake = -debounce
+        self._last_flick = -debounce
+
+    def update(self, ax, ay, az, now):
+        prev = self._prev
+        if prev is None:
+            self._prev = [ax, ay, az]
+            jerk = 0
+        else:
+            # Per axis, so a threshold means the same as on a single axis:
+            # summing the three would let three small changes count as one big one
+            jerk = abs(ax - prev[0])
+            delta = abs(ay - prev[1])
+            if delta > jerk:
+                jerk = delta
+            delta = abs(az - prev[2])
+            if delta > jerk:
+                jerk = delta
+            prev[0] = ax
+            prev[1] = ay
+            prev[2] = az
+        jerk = min(jerk, 0xFFFF)
+
+        # Slide both windows by one sample: drop the value leaving each window
+        ring = self._jerk
+        size = self._size
+        head = self._head
+        leaving_shake = ring[(head - self.shake_window) % size]
+        leaving_flick = ring[(head - self.flick_window) % size]
+        if leaving_shake > self.shake_threshold:
+            self._strong -= 1
+        self._energy -= leaving_flick
+        ring[head] = jerk
+        self._head = (head + 1) % size
+        if jerk > self.shake_threshold:
+            self._strong += 1
+        self._energy += jerk
+
+        if self._strong >= self.shake_count:
+            if now - self._last_shake > self.debounce:
+                self._last_shake = now
+                return SHAKE
+        elif (self._energy >= self.flick_threshold and jerk <= self.shake_threshold
+              and now - self._last_flick > self.debounce):
+            self._last_flick = now
+            return FLICK
+        return self._tilt(ax, ay, now)
+
+    def _tilt(self, ax, ay, now):
+        dx = ax - self.tilt_cx
+        dy = ay - self.tilt_cy
+        limit = self.tilt_threshold
+        if abs(dx) >= abs(dy):
+            direction = TILT_LEFT if dx < -limit else TILT_RIGHT if dx > limit else 0
+        else:
+            direction = TILT_BACK if dy < -limit else TILT_FORWARD if dy > limit else 0
+        if direction != self._tilt_dir:
+            self._tilt_dir = direction
+            self._tilt_since = now
+            self._tilt_fired = False
+            return NONE
+        if direction and not self._tilt_fired and now - self._tilt_since >= self.tilt_hold:
+            self._tilt_fired = True
+            self.direction = direction
+            return TILT_HOLD
+        return NONE
+
+    def reset(self):
+        """Forget history, e.g. after a blocking pause in the caller."""
+        for i in range(self._size):
+            self._jerk[i] = 0
+        self._strong = 0
+        self._energy = 0
+        self._prev = None       # The next sample starts afresh rather than jerking from a stale one
+        self._tilt_dir = 0
+        self._tilt_since = 0.0
+        self._tilt_fired = False
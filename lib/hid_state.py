@@ -0,0 +1,225 @@
+"""Per-tick HID state that only goes out on the wire when it changes.
+
+``adafruit_hid``'s Keyboard/Mouse/ConsumerControl send a USB report on every
+press()/release() call, even when nothing changed. Here press()/release()/
+move() only update the state wanted for this tick; HIDState.send() then sends
+at most one report per device, and only if it differs from the last one sent.
+
+    hid = HIDState(usb_hid.devices)
+    hid.keyboard.press(Keycode.A)
+    hid.mouse.move(3, 0)
+    hid.send()
+"""
+import time
+
+from adafruit_hid import find_device
+
+
+def _find_ready(devices, usage_page, usage, report):
+    device = find_device(devices, usage_page=usage_page, usage=usage)
+    # Same readiness check as adafruit_hid: send a no-op, retry once after 1 s
+    try:
+        device.send_report(report)
+    except OSError:
+        time.sleep(1)
+        device.send_report(report)
+    return device
+
+
+class KeyboardState:
+    """Held keys (max six plus modifiers) for a boot-protocol keyboard report."""
+
+    def __init__(self, devices):
+        self._report = bytearray(8)
+        self._sent = bytearray(8)
+        self._device = _find_ready(devices, 0x01, 0x06, self._report)
+        self._dirty = False
+
+    def press(self, *keycodes):
+        report = self._report
+        for keycode in keycodes:
+            if 0xE0 <= keycode <= 0xE7:
+                report[0] |= 1 << (keycode - 0xE0)
+                continue
+            free = 0
+            for i in range(2, 8):
+                if report[i] == keycode:
+                    break
+                if not free and report[i] == 0:
+                    free = i
+            else:
+                if not free:
+                    raise ValueError("Trying to press more than six keys at once.")
+                report[free] = keycode
+
+    def has_room(self, keycode):
+        """True if press(keycode) fits: a modifier, already held, or a free slot of six."""
+        if 0xE0 <= keycode <= 0xE7:
+            return True
+        report = self._report
+        for i in range(2, 8):
+            if report[i] == keycode or report[i] == 0:
+                return True
+        return False
+
+    def release(self, *keycodes):
+        report = self._report
+        for keycode in keycodes:
+            if 0xE0 <= keycode <= 0xE7:
+                report[0] &= ~(1 << (keycode - 0xE0))
+                continue
+            for i in range(2, 8):
+                if report[i] == keycode:
+                    report[i] = 0
+
+    def release_all(self):
+        for i in range(8):
+            self._report[i] = 0
+
+    def invalidate(self):
+        """Force the next flush(), e.g. after something else wrote to the keyboard."""
+        self._dirty = True
+
+    def flush(self):
+        if self._dirty or self._report != self._sent:
+            self._device.send_report(self._report)
+            self._sent[:] = self._report
+            self._dirty = False
+            return True
+        return False
+
+
+class MouseState:
+    """Held buttons plus the motion accumulated during this tick."""
+
+    LEFT_BUTTON = 1
+    RIGHT_BUTTON = 2
+    MIDDLE_BUTTON = 4
+
+    def __init__(self, devices):
+        self._report = bytearray(4)
+        self._device = _find_ready(devices, 0x01, 0x02, self._report)
+        self._buttons = 0
+        self._sent_buttons = 0
+        self._x = 0
+        self._y = 0
+        self._wheel = 0
+
+    def press(self, buttons):
+        self._buttons |= buttons
+
+    def release(self, buttons):
+        self._buttons &= ~buttons
+
+    def release_all(self):
+        self._buttons = 0
+
+    def move(self, x=0, y=0, wheel=0):
+        self._x += x
+        self._y += y
+        self._wheel += wheel
+
+    def flush(self):
+        x, y, wheel = self._x, self._y, self._wheel
+        if self._buttons == self._sent_buttons and not (x or y or wheel):
+            return False
+        # One report per tick; motion beyond +/-127 is carried to the next one
+        sx = min(127, max(-127, x))
+        sy = min(127, max(-127, y))
+        sw = min(127, max(-127, wheel))
+        report = self._report
+        report[0] = self._buttons
+        report[1] = sx & 0xFF
+        report[2] = sy & 0xFF
+        report[3] = sw & 0xFF
+        self._device.send_report(report)
+        self._sent_buttons = self._buttons
+        self._x = x - sx
+        self._y = y - sy
+        self._wheel = wheel - sw
+        return True
+
+
+class ConsumerState:
+    """Consumer control usage; send() taps are pressed one tick and released the next."""
+
+    def __init__(self, devices):
+        self._report = bytearray(2)
+        self._device = _find_ready(devices, 0x0C, 0x01, self._report)
+        self._held = 0
+        self._sent = 0
+        self._taps = []
+        self._tapping = False
+
+    def send(self, consumer_code):
+        self._taps.append(consumer_code)
+
+    def press(self, consumer_code):
+        self._held = consumer_code
+
+    def release(self):
+        self._held = 0
+
+    def flush(self):
+        if self._tapping:
+            code = 0
+            self._tapping = False
+        elif self._taps:
+            code = self._taps.pop(0)
+            self._tapping = True
+        else:
+            code = self._held
+        if code == self._sent and not self._tapping:
+            return False
+        self._report[0] = code & 0xFF
+        self._report[1] = code >> 8
+        self._device.send_report(self._report)
+        self._sent = code
+        return True
+
+
+class HIDState:
+    """Keyboard, mouse and consumer control state, created on first use."""
+
+    def __init__(self, devices):
+        self._devices = devices
+        self._keyboard = None
+        self._mouse = None
+        self._consumer = None
+
+    @property
+    def keyboard(self):
+        if self._keyboard is None:
+            self._keyboard = KeyboardState(self._devices)
+        return self._keyboard
+
+    @property
+    def mouse(self):
+        if self._mouse is None:
+            self._mouse = MouseState(self._devices)
+        return self._mouse
+
+    @property
+    def consumer(self):
+        if self._consumer is None:
+            self._consumer = ConsumerState(self._devices)
+        return self._consumer
+
+    def release_all(self):
+        if self._keyboard is not None:
+            self._keyboard.release_all()
+        if self._mouse is not None:
+            self._mouse.release_all()
+        if self._consumer is not None:
+            self._consumer.release()
+
+    def send(self):
+        """Send this tick's changes: at most one report per device; True if any went out."""
+        sent = False
+        if self._keyboard is not None:
+            sent = self._keyboard.flush()
+        if self._mouse is not None:
+            sent = self._mouse.flush() or sent
+        if self._consumer is not None:
+            sent = self._consumer.flush() or sent
+        return sent
@@ -0,0 +1,202 @@
+"""Macropad profiles compiled into flat per-key tables, loaded from a JSON file.
+
+Profiles are written as dicts (in Python or in a JSON file on CIRCUITPY);
+walking them on every key event means ``.get()`` calls and dict lookups
+in the hot path. compile_profile() turns one definition into a Profile
+whose per-key data are flat sequences indexed by key number:
+
+- ``keycodes``: a 12-byte ``bytes``, 0 where the key does nothing;
+- ``tones``: the tone (Hz) played while each key is held, 0 for silence;
+- ``colors``: the LED colour (0xRRGGBB) of each key while held;
+- ``shortcuts``: item sequences, or whatever the ``shortcut`` function
+  passed in compiles them to (e.g. macros for a MacroPlayer).
+
+Tones and colours default to shared tables, so a profile that doesn't
+override them costs only its 12 keycode bytes.
+
+ProfileFile re-reads its file only when the size or modification time
+changes, and keeps just the compiled profiles, not the parsed JSON:
+
+    profiles = ProfileFile("/macropad_profiles.json", Keycode, fallback=BUILT_IN,
+                           shortcut=lambda items: compile_macro(items, layout))
+    profiles.check()                     # True if (re)loaded
+    profile = profiles.profiles[0]
+    code = profile.keycodes[key]
+
+Keycodes are Keycode values in Python definitions, or their names
+("W", "SPACE") in JSON. In shortcuts, a string is typed as text, a
+keycode is written as ``{"key": "RETURN"}`` in JSON and a pause as
+``{"delay": 0.5}`` (seconds; a float also works in Python).
+"""
+import json
+import os
+
+from rainbowio import colorwheel
+
+KEY_COUNT = 12
+
+TONES = (196, 220, 246, 262, 294, 330, 349, 392, 440, 494, 523, 587)
+COLORS = tuple(colorwheel(int(255 / KEY_COUNT) * key) for key in range(KEY_COUNT))
+
+
+class Profile:
+    """One compiled profile; treat it as read-only."""
+
+    def __init__(self, name, display_name, rotation, volume, keycodes, tones, colors,
+                 shortcuts):
+        self.name = name
+        self.display_name = display_name
+        self.rotation = rotation
+        self.volume = volume
+        self.keycodes = keycodes
+        self.tones = tones
+        self.colors = colors
+        self.shortcuts = shortcuts
+
+    def __repr__(self):
+        return "<Profile {}>".format(self.name)
+
+
+def _keycode(keycode, value):
+    if isinstance(value, int):
+        if not 0 <= value <= 0xFF:
+            raise ValueError("keycode out of range: {!r}".format(value))
+        return value
+    code = getattr(keycode, str(value).upper(), None)
+    if not isinstance(code, int):
+        raise ValueError("unknown keycode {!r}".format(value))
+    return code
+
+
+def _key_number(key):
+    # Key numbers are ints in Python and strings in JSON object keys
+    number = int(key)
+    if not 0 <= number < KEY_COUNT:
+        raise ValueError("key number out of range: {!r}".format(key))
+    return number
+
+
+def _per_key(values, default):
+    # A list of 12 values, or a dict of key number (int or JSON string) -> int value
+    if values is None:
+        return default
+    if isinstance(values, dict):
+        items = values.items()
+    elif isinstance(values, (list, tuple)):
+        if len(values) > KEY_COUNT:
+            raise ValueError("more than {} per-key values".format(KEY_COUNT))
+        items = enumerate(values)
+    else:
+        raise ValueError("per-key values must be a list or a dict")
+    table = list(default)
+    for key, value in items:
+        if not isinstance(value, int):
+            raise ValueError("per-key value must be a number: {!r}".format(value))
+        table[_key_number(key)] = value
+    return tuple(table)
+
+
+def compile_profile(definition, keycode, shortcut=None):
+    """Compile one profile dict; ``keycode`` is the Keycode class used to resolve names.
+
+    Raises ValueError (or KeyError for a missing name) for a malformed definition.
+    """
+    if not isinstance(definition, dict):
+        raise ValueError("profile must be a dict")
+    name = definition["name"]
+    keys = definition.get("keys", {})
+    if not isinstance(keys, dict):
+        raise ValueError("keys must be a dict of key number -> keycode")
+    codes = bytearray(KEY_COUNT)
+    for key, value in keys.items():
+        codes[_key_number(key)] = _keycode(keycode, value)
+    sequences = definition.get("shortcuts", ())
+    if not isinstance(sequences, (list, tuple)):
+        raise ValueError("shortcuts must be a list")
+    shortcuts = []
+    for sequence in sequences:
+        if not isinstance(sequence, (list, tuple)):
+            raise ValueError("shortcut must be a list of items")
+        items = []
+        for item in sequence:
+            if isinstance(item, dict):
+                if "delay" in item:
+                    item = float(item["delay"])
+                else:
+                    item = _keycode(keycode, item["key"])
+            elif isinstance(item, bool) or not isinstance(item, (str, int, float)):
+                raise ValueError("unknown shortcut item {!r}".format(item))
+            elif isinstance(item, int):
+                item = _keycode(keycode, item)
+            items.append(item)
+        shortcuts.append(shortcut(items) if shortcut else tuple(items))
+    rotation = definition.get("rotation", 0)
+    if isinstance(rotation, bool) or rotation not in (0, 90, 180, 270):
+        raise ValueError("rotation must be 0, 90, 180 or 270: {!r}".format(rotation))
+    volume = definition.get("volume", True)
+    if not isinstance(volume, bool):
+        raise ValueError("volume must be true or false: {!r}".format(volume))
+    if not volume and not shortcuts:
+        # The encoder steps through the shortcuts instead of the volume
+        raise ValueError("a profile without volume needs shortcuts")
+    return Profile(
+        name,
+        definition.get("display_name", name),
+        rotation,
+        volume,
+        bytes(codes),
+        _per_key(definition.get("tones"), TONES),
+        _per_key(definition.get("colors"), COLORS),
+        tuple(shortcuts),
+    )
+
+
+def compile_profiles(definitions, keycode, shortcut=None):
+    return tuple(compile_profile(definition, keycode, shortcut) for definition in definitions)
+
+
+class ProfileFile:
+    """Compiled profiles from a JSON file, reloaded when the file changes.
+
+    The file holds a list of profile dicts, or ``{"profiles": [...]}``.
+    Until it exists (or if it doesn't parse) ``fallback`` definitions are used.
+    """
+
+    def __init__(self, path, keycode, fallback=(), shortcut=None):
+        self.path = path
+        self._keycode = keycode
+        self._shortcut = shortcut
+        self._fallback = fallback
+        self._stamp = None
+        self.profiles = compile_profiles(fallback, keycode, shortcut)
+        self.error = None
+
+    def check(self):
+        """Reload if the file appeared, changed or went away; True if the profiles changed."""
+        try:
+            stat = os.stat(self.path)
+            stamp = (stat[6], stat[8])  # size, mtime
+        except OSError:
+            stamp = None
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        if stamp is None:
+            self.profiles = compile_profiles(self._fallback, self._keycode, self._shortcut)
+            return True
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                data = data["profiles"]
+            profiles = compile_profiles(data, self._keycode, self._shortcut)
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            # Half-saved or broken file: keep what we had, try again on the next change
+            self.error = error
+            return False
+        if not profiles:
+            self.error = ValueError("no profiles in " + self.path)
+            return False
+        self.error = None
+        self.profiles = profiles
+        return True
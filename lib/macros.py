@@ -0,0 +1,164 @@
+"""Keyboard macros compiled to report steps and played back without blocking.
+
+``keyboard_layout.write("https://youtube.com")`` types a whole string
+before returning, so a macro freezes the keys and encoder until it is done.
+compile_macro() turns a macro into a compact ``bytes`` of two-byte ops
+once, when its profile is loaded, and MacroPlayer plays them back one
+keyboard report at a time from the main loop (or a task):
+
+    player = MacroPlayer(hid.keyboard, interval=0.008)
+    player.play(compile_macro([Keycode.GUI, "r", 0.5, "notepad", Keycode.RETURN], layout))
+    while True:
+        player.update()   # at most one step, then return
+        hid.send()
+
+Macro items:
+
+- a string is typed character by character (press, then release);
+- a modifier keycode (CONTROL, SHIFT, ALT, GUI) is held down with the next
+  key or character, so ``[Keycode.GUI, "r"]`` is GUI+R;
+- any other keycode is tapped on its own;
+- a float is a pause in seconds, e.g. to wait for a dialog to open.
+
+Only keys the macro pressed are released, and not those ``held(keycode)``
+says are still held on the keypad. A chord that doesn't fit in the six
+report slots waits for room instead of raising.
+"""
+import supervisor
+
+from ticks import ticks_add, ticks_diff
+
+PRESS = 1       # arg: keycode; consecutive presses go out in one report
+RELEASE = 2     # release everything this step pressed
+DELAY = 3       # arg: pause in 10 ms units
+
+
+def _is_modifier(keycode):
+    return 0xE0 <= keycode <= 0xE7
+
+
+def compile_macro(items, layout):
+    """Compile macro ``items`` to ops; ``layout`` (a KeyboardLayout) maps characters to keycodes."""
+    ops = bytearray()
+    held = []   # modifiers waiting for the next key
+
+    def chord(keycodes):
+        for keycode in held:
+            ops.extend((PRESS, keycode))
+        for keycode in keycodes:
+            ops.extend((PRESS, keycode))
+        ops.extend((RELEASE, 0))
+        held.clear()
+
+    for item in items:
+        if isinstance(item, str):
+            for char in item:
+                chord(layout.keycodes(char))
+        elif isinstance(item, float):
+            ticks = int(item * 100 + 0.5)
+            while ticks > 0:
+                ops.extend((DELAY, min(ticks, 255)))
+                ticks -= 255
+        elif _is_modifier(item):
+            held.append(item)
+        else:
+            chord((item,))
+    if held:
+        chord(())   # Trailing modifiers: tap them together
+    return bytes(ops)
+
+
+class MacroPlayer:
+    """Plays compiled macros on a hid_state KeyboardState, one step per update().
+
+    A step is a press (one report) or a release (another report), so
+    ``interval`` should be at least the report interval: 8 ms sends one
+    character every 16 ms. Macros played while one is running wait in a
+    queue of up to ``max_queued``; more are dropped. ``held``, if given, is
+    called with a keycode and returns True if something else still holds
+    it down, so the macro leaves it pressed.
+    """
+
+    def __init__(self, keyboard, interval=0.008, max_queued=4, held=None):
+        self._keyboard = keyboard
+        self._held = held
+        self.interval = int(interval * 1000)
+        self.max_queued = max_queued
+        self._queue = []
+        self._ops = None
+        self._pos = 0
+        self._next = 0
+        self._pressed = []
+
+    @property
+    def playing(self):
+        return self._ops is not None
+
+    def play(self, macro):
+        """Queue ``macro`` (from compile_macro); False if the queue is full."""
+        if not macro:
+            return True
+        if len(self._queue) >= self.max_queued:
+            return False
+        self._queue.append(macro)
+        if self._ops is None:
+            self._start(supervisor.ticks_ms())
+        return True
+
+    def stop(self):
+        """Drop the running and queued macros and release what they hold."""
+        self._queue.clear()
+        self._ops = None
+        self._release()
+
+    def _start(self, now):
+        self._ops = self._queue.pop(0)
+        self._pos = 0
+        self._next = now
+
+    def _release(self, start=0):
+        # Everything pressed from ``start`` on, except keys held elsewhere
+        pressed = self._pressed
+        held = self._held
+        for keycode in pressed[start:]:
+            if held is None or not held(keycode):
+                self._keyboard.release(keycode)
+        del pressed[start:]
+
+    def update(self):
+        """Apply the next step if it is due."""
+        ops = self._ops
+        if ops is None:
+            return
+        now = supervisor.ticks_ms()
+        if ticks_diff(self._next, now) > 0:
+            return
+        pos = self._pos
+        op = ops[pos]
+        if op == DELAY:
+            self._next = ticks_add(now, ops[pos + 1] * 10)
+            pos += 2
+        else:
+            if op == PRESS:
+                keyboard = self._keyboard
+                start = len(self._pressed)
+                while pos < len(ops) and ops[pos] == PRESS:
+                    keycode = ops[pos + 1]
+                    if not keyboard.has_room(keycode):
+                        # All six slots are held: undo this chord, try it again next step
+                        self._release(start)
+                        self._next = ticks_add(now, self.interval)
+                        return
+                    keyboard.press(keycode)
+                    self._pressed.append(keycode)
+                    pos += 2
+            else:
+                self._release()
+                pos += 2
+            self._next = ticks_add(now, self.interval)
+        if pos < len(ops):
+            self._pos = pos
+        elif self._queue:
+            self._start(self._next)
+        else:
+            self._ops = None
@@ -0,0 +1,196 @@
+"""Find the WAV files under some folders, with their formats, from a cached manifest.
+
+Probing fixed names (``/1.wav`` .. ``/10.wav``) with one os.stat() each
+costs a filesystem lookup per name whether or not the file exists, and
+misses every other name. MediaIndex lists each folder once instead,
+accepts any ``.wav`` name at any depth, and reads each file's header
+(rate, channels, bits, where the samples are) only the first time it sees
+it. What it found goes into a small JSON manifest, saved on a writable
+card; on the next scan a folder whose stat and listing match the manifest
+is taken from it without touching its files, and a changed folder only has
+its new or changed (size, mtime) files opened.
+
+    index = MediaIndex("/sd/.media_index.json")
+    paths = index.scan(("/", "/sd"))     # sorted; "/sd" is not walked from "/"
+    index.save()                         # if anything changed and it can be written
+    header = index.header(paths[0])      # format, without opening the file
+
+FAT doesn't always update a folder's modification time when a file in it
+is rewritten under the same name; scan(full=True) stats every file, and
+refresh(path) re-reads one file found not to match its entry.
+"""
+import json
+import os
+
+from wave_header import WaveHeader
+
+EXTENSION = ".wav"
+SKIP = ("lib", "System Volume Information")
+_DIRECTORY = 0x4000     # S_IFDIR in os.stat()[0]
+_VERSION = 1
+
+
+def _join(directory, name):
+    return directory + name if directory.endswith("/") else directory + "/" + name
+
+
+class MediaIndex:
+    """WAV files by path, each with its (size, mtime) and WaveHeader (None if unplayable)."""
+
+    def __init__(self, manifest=None, extension=EXTENSION):
+        self.manifest = manifest
+        self.extension = extension
+        self.paths = []
+        self.changed = False
+        self.opened = 0         # headers read from files by the last scan
+        self._files = {}        # path -> [size, mtime, header]
+        self._dirs = {}         # directory -> [mtime, size, names]
+        self._loaded = False
+
+    def header(self, path):
+        """The WaveHeader of indexed ``path``, or None if it isn't playable."""
+        entry = self._files.get(path)
+        return None if entry is None else entry[2]
+
+    def refresh(self, path):
+        """Read ``path``'s header again; returns it (None if unplayable or gone).
+
+        For a file found to differ from its entry, such as one rewritten
+        under the same name in a folder FAT didn't mark as changed.
+        """
+        entry = self._check_file(path, None)
+        if entry is None:
+            if self._files.pop(path, None) is not None:
+                self.changed = True
+            return None
+        self._files[path] = entry
+        return entry[2]
+
+    def scan(self, roots, full=False):
+        """Index the WAV files under ``roots``; returns their paths, sorted."""
+        if not self._loaded:
+            self._load()
+        old_files = self._files
+        old_dirs = self._dirs
+        self._files = {}
+        self._dirs = {}
+        self.opened = 0
+        for root in roots:
+            self._scan(root, roots, old_files, old_dirs, full)
+        # Anything that went away (a folder, a file, a whole card) is a change too
+        if len(self._files) != len(old_files) or len(self._dirs) != len(old_dirs):
+            self.changed = True
+        self.paths = sorted(path for path, entry in self._files.items() if entry[2] is not None)
+        return self.paths
+
+    def save(self):
+        """Write the manifest if the index changed; False if it couldn't be written."""
+        if not self.changed or self.manifest is None:
+            return True
+        files = {}
+        for path, (size, mtime, header) in self._files.items():
+            if header is None:
+                files[path] = [size, mtime]
+            else:
+                files[path] = [size, mtime, header.sample_rate, header.channel_count,
+                               header.bits_per_sample, header.data_offset, header.data_bytes]
+        directory, _, name = self.manifest.rpartition("/")
+        directory = directory or "/"
+        for _ in range(2):
+            data = json.dumps({"v": _VERSION, "dirs": self._dirs, "files": files},
+                              separators=(",", ":"))
+            try:
+                with open(self.manifest, "wb") as f:
+                    f.write(data.encode())
+                stat = os.stat(directory)
+            except OSError:
+                return False    # Read-only (CIRCUITPY while USB has it), or no card
+            # Writing the manifest changes its own folder's stat (and, the first
+            # time, its listing): record that, or the next scan would see a change
+            entry = self._dirs.get(directory)
+            if entry is None or (entry[0] == stat[8] and entry[1] == stat[6] and name in entry[2]):
+                break
+            entry[0] = stat[8]
+            entry[1] = stat[6]
+            if name not in entry[2]:
+                entry[2] = sorted(entry[2] + [name])
+        self.changed = False
+        self._loaded = True     # The manifest now says what the index does
+        return True
+
+    def _load(self):
+        # Only marked loaded once read, so a manifest on a card mounted later is still found
+        if self.manifest is None:
+            return
+        try:
+            with open(self.manifest, "rb") as f:
+                data = json.loads(f.read())
+            if data.get("v") != _VERSION:
+                return
+            dirs = data["dirs"]
+            files = {}
+            for path, entry in data["files"].items():
+                header = None
+                if len(entry) == 7:
+                    header = WaveHeader(entry[2], entry[3], entry[4], entry[5], entry[6])
+                files[path] = [entry[0], entry[1], header]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return  # No manifest (or not yet mounted), or a broken one: rebuild it
+        self._dirs = dirs
+        self._files = files
+        self._loaded = True
+
+    def _scan(self, directory, roots, old_files, old_dirs, full):
+        try:
+            stat = os.stat(directory)
+            names = sorted(os.listdir(directory))
+        except OSError:
+            return
+        old = old_dirs.get(directory)
+        same = (not full and old is not None and old[0] == stat[8] and old[1] == stat[6]
+                and old[2] == names)
+        if not same:
+            self.changed = True
+        self._dirs[directory] = [stat[8], stat[6], names]
+        extension = self.extension
+        for name in names:
+            if name.startswith(".") or name in SKIP:
+                continue    # Hidden files, macOS "._" shadows, the library folder
+            path = _join(directory, name)
+            if path in roots:
+                continue    # A mount point scanned as a root of its own
+            if name.lower().endswith(extension):
+                entry = old_files.get(path)
+                if not (same and entry is not None):
+                    entry = self._check_file(path, entry)
+                if entry is not None:
+                    self._files[path] = entry
+            elif same:
+                # Known folder contents: its subfolders are the ones in the manifest
+                if path in old_dirs:
+                    self._scan(path, roots, old_files, old_dirs, full)
+            else:
+                try:
+                    is_directory = os.stat(path)[0] & _DIRECTORY
+                except OSError:
+                    continue
+                if is_directory:
+                    self._scan(path, roots, old_files, old_dirs, full)
+
+    def _check_file(self, path, entry):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if entry is not None and entry[0] == stat[6] and entry[1] == stat[8]:
+            return entry
+        self.changed = True
+        self.opened += 1
+        header = None
+        try:
+            with open(path, "rb") as f:
+                header = WaveHeader.read(f)
+        except (OSError, ValueError):
+            pass    # Kept with no header, so it isn't opened again until it changes
+        return [stat[6], stat[8], header]
+
@@ -0,0 +1,81 @@
+"""Integer mouse motion from stick or tilt offsets, with sub-pixel carry.
+
+All float math happens once, when a ResponseCurve builds its lookup table.
+Per tick, MotionPipeline.update() only indexes that table and does integer
+adds and shifts, so it allocates nothing, and the fraction of a pixel that
+``int()`` used to throw away is carried into the next tick.
+
+    stick = MotionPipeline(ResponseCurve(128, deadzone=10, sensitivity=4.7,
+                                         interval=1 / poll_rate))
+    stick.update(x - 128, y - 128)
+    if stick.dx or stick.dy:
+        mouse.move(stick.dx, stick.dy)
+"""
+from array import array
+
+FRACTION_BITS = 8
+ONE = 1 << FRACTION_BITS
+
+
+class ResponseCurve:
+    """Lookup table from an offset magnitude (0..max_input) to 1/256 px per update().
+
+    Offsets below ``deadzone`` give 0. Above it the speed in pixels per
+    second is ``sensitivity * max_input * (offset / max_input) ** exponent``:
+    an exponent of 1 is the plain ``offset * sensitivity``, larger exponents
+    give finer control near the centre with the same top speed. The table
+    holds that speed times ``interval``, the seconds between update() calls,
+    so the cursor moves as fast whatever the poll rate.
+    """
+
+    def __init__(self, max_input, deadzone=0, sensitivity=1.0, exponent=1.0, interval=1.0):
+        self.max_input = max_input
+        self.table = array("l", [0] * (max_input + 1))
+        for offset in range(deadzone, max_input + 1):
+            speed = sensitivity * max_input * (offset / max_input) ** exponent
+            self.table[offset] = int(speed * interval * ONE + 0.5)
+
+
+class MotionPipeline:
+    """Two axes through response curves, giving whole-pixel dx/dy each tick."""
+
+    def __init__(self, curve_x, curve_y=None, invert_y=False):
+        self._table_x = curve_x.table
+        self._table_y = (curve_y or curve_x).table
+        self._max_x = curve_x.max_input
+        self._max_y = (curve_y or curve_x).max_input
+        self._invert_y = invert_y
+        self._rem_x = 0
+        self._rem_y = 0
+        self.dx = 0
+        self.dy = 0
+
+    def update(self, offset_x, offset_y):
+        # Both axes written out inline: a helper returning (whole, remainder)
+        # would allocate a tuple every tick
+        table = self._table_x
+        if offset_x < 0:
+            acc = self._rem_x - table[min(-offset_x, self._max_x)]
+        else:
+            acc = self._rem_x + table[min(offset_x, self._max_x)]
+        # Truncate toward zero so both directions carry their remainder the same way
+        whole = -((-acc) >> FRACTION_BITS) if acc < 0 else acc >> FRACTION_BITS
+        self._rem_x = acc - (whole << FRACTION_BITS)
+        self.dx = whole
+
+        if self._invert_y:
+            offset_y = -offset_y
+        table = self._table_y
+        if offset_y < 0:
+            acc = self._rem_y - table[min(-offset_y, self._max_y)]
+        else:
+            acc = self._rem_y + table[min(offset_y, self._max_y)]
+        whole = -((-acc) >> FRACTION_BITS) if acc < 0 else acc >> FRACTION_BITS
+        self._rem_y = acc - (whole << FRACTION_BITS)
+        self.dy = whole
+
+    def reset(self):
+        self._rem_x = 0
+        self._rem_y = 0
+        self.dx = 0
+        self.dy = 0
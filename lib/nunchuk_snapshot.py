@@ -0,0 +1,66 @@
+"""Read the whole Nunchuk state in one I2C transaction per tick.
+
+Every ``adafruit_nunchuk.Nunchuk`` property (``joystick``, ``acceleration``,
+``buttons``) does its own register read, so a loop that uses all of them pays
+for several full reads. NunchukSnapshot.update() does one read into a
+preallocated buffer and decodes it into plain int/bool attributes without
+allocating.
+
+    nc = adafruit_nunchuk.Nunchuk(board.I2C())
+    snap = NunchukSnapshot(nc)
+    snap.update()
+    print(snap.x, snap.y, snap.ax, snap.ay, snap.az, snap.c, snap.z)
+
+update() sleeps ``read_delay`` between asking for a reading and reading it.
+A task can split the two and let the other tasks run during the wait:
+
+    snap.request()
+    await asyncio.sleep(snap.read_delay)
+    snap.read()
+"""
+import time
+
+_REGISTER = b"\x00"
+
+
+class NunchukSnapshot:
+    """Joystick, 10-bit acceleration and buttons from a single 6-byte read."""
+
+    def __init__(self, nunchuk, read_delay=0.002):
+        # Reuse the library's device: it has already turned off encryption
+        self._device = nunchuk.i2c_device
+        self.read_delay = read_delay
+        self._buffer = bytearray(6)
+        self.x = 128
+        self.y = 128
+        self.ax = 512
+        self.ay = 512
+        self.az = 512
+        self.c = False
+        self.z = False
+
+    def update(self):
+        """Request a reading, sleep ``read_delay`` for it, and decode it."""
+        self.request()
+        time.sleep(self.read_delay)
+        self.read()
+
+    def request(self):
+        """Start a conversion; read() it ``read_delay`` or more later."""
+        with self._device as i2c:
+            i2c.write(_REGISTER)
+
+    def read(self):
+        """Read and decode the conversion started by the last request()."""
+        buf = self._buffer
+        with self._device as i2c:
+            i2c.readinto(buf)
+        low = buf[5]
+        self.x = buf[0]
+        self.y = buf[1]
+        # Same bit layout as adafruit_nunchuk: high 8 bits in bytes 2-4, low 2 in byte 5
+        self.ax = (buf[2] << 2) | ((low & 0xC0) >> 6)
+        self.ay = (buf[3] << 2) | ((low & 0x30) >> 4)
+        self.az = (buf[4] << 2) | ((low & 0x0C) >> 2)
+        self.c = not low & 0x02
+        self.z = not low & 0x01
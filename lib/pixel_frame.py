@@ -0,0 +1,128 @@
+"""A NeoPixel framebuffer that only goes out on the wire when the frame changed.
+
+Scripts fill and show their pixels every loop whether or not anything
+changed; each show() costs ~30 us per pixel of bit-banged output with
+interrupts off. PixelFrame keeps the wanted colours in a preallocated
+bytearray, remembers what was last shown, and its show() copies only the
+changed pixels into the strip and writes it, at most ``max_fps`` times a
+second. Unchanged frames cost one bytearray compare.
+
+    frame = PixelFrame(pixels, max_fps=60)
+    frame.fill((255, 0, 0))
+    frame[0:2] = ((0, 0, 255), (0, 255, 0))
+    frame.show()          # no-op if the frame is the same as last time
+"""
+import time
+
+
+class PixelFrame:
+    """Colours for ``pixels`` (an auto_write=False NeoPixel), shown only when changed."""
+
+    def __init__(self, pixels, max_fps=None):
+        self._pixels = pixels
+        self.n = len(pixels)
+        self.bpp = pixels.bpp
+        self._frame = bytearray(self.n * self.bpp)
+        self._shown = bytearray(self.n * self.bpp)
+        self._interval = 1 / max_fps if max_fps else 0
+        self._last_show = -self._interval
+        # Force the first show() so the strip matches the (all off) frame
+        self._dirty = True
+
+    def __len__(self):
+        return self.n
+
+    def _write(self, index, color):
+        frame = self._frame
+        bpp = self.bpp
+        offset = index * bpp
+        if isinstance(color, int):
+            frame[offset] = (color >> 16) & 0xFF
+            frame[offset + 1] = (color >> 8) & 0xFF
+            frame[offset + 2] = color & 0xFF
+            if bpp == 4:
+                frame[offset + 3] = 0
+            return
+        for i in range(bpp):
+            frame[offset + i] = color[i] if i < len(color) else 0
+
+    def __setitem__(self, index, color):
+        if isinstance(index, slice):
+            for i, value in zip(range(*index.indices(self.n)), color):
+                self._write(i, value)
+        else:
+            if index < 0:
+                index += self.n
+            self._write(index, color)
+
+    def set_rgb(self, index, r, g, b, w=0):
+        """Set one pixel from separate channel values, without building a tuple."""
+        frame = self._frame
+        offset = index * self.bpp
+        frame[offset] = r
+        frame[offset + 1] = g
+        frame[offset + 2] = b
+        if self.bpp == 4:
+            frame[offset + 3] = w
+
+    def __getitem__(self, index):
+        offset = index * self.bpp
+        return tuple(self._frame[offset:offset + self.bpp])
+
+    def fill(self, color):
+        self._write(0, color)
+        self._repeat_first()
+
+    def fill_rgb(self, r, g, b, w=0):
+        self.set_rgb(0, r, g, b, w)
+        self._repeat_first()
+
+    def _repeat_first(self):
+        frame = self._frame
+        bpp = self.bpp
+        # Copy the first pixel's bytes along the frame by doubling, no per-pixel calls
+        filled = bpp
+        total = len(frame)
+        while filled < total:
+            count = min(filled, total - filled)
+            frame[filled:filled + count] = frame[0:count]
+            filled += count
+
+    @property
+    def brightness(self):
+        return self._pixels.brightness
+
+    @brightness.setter
+    def brightness(self, value):
+        if value != self._pixels.brightness:
+            self._pixels.brightness = value
+            self._dirty = True
+
+    def show(self, now=None):
+        """Write the frame if it changed and the frame-rate cap allows; True if written.
+
+        A change held back by the cap stays pending and goes out on a later call.
+        """
+        frame = self._frame
+        shown = self._shown
+        if not self._dirty and frame == shown:
+            return False
+        if self._interval:
+            if now is None:
+                now = time.monotonic()
+            if now - self._last_show < self._interval:
+                return False
+            self._last_show = now
+        pixels = self._pixels
+        bpp = self.bpp
+        force = self._dirty
+        for i in range(self.n):
+            offset = i * bpp
+            for j in range(offset, offset + bpp):
+                if force or frame[j] != shown[j]:
+                    pixels[i] = tuple(frame[offset:offset + bpp])
+                    break
+        shown[:] = frame
+        self._dirty = False
+        pixels.show()
+        return True
@@ -0,0 +1,177 @@
+"""Track playback on one I2S output: a mixer per format, the next track ready early.
+
+Building an ``audiomixer.Mixer`` for every track allocates its output
+buffers again and restarts the I2S output, and opening a file and parsing
+its header only after the press adds that time to every start. Player keeps
+one mixer per sample format, switching the output only when the format
+changes; prepare() opens and parses the next track (or finds it in a
+SampleCache) ahead of time, so play() only has to start the voice. Streamed
+tracks take turns with two preallocated WaveFile buffers.
+
+    player = Player(audiobusio.I2SOut(bclk, lrclk, data), cache=SampleCache())
+    order = Shuffle(wave_files)
+    upcoming = order.next()
+    player.prepare(upcoming)
+    ...
+    player.play(upcoming)           # on a press: starts at once
+    upcoming = order.next()
+    player.prepare(upcoming)        # while it plays
+
+``mixers`` counts the mixers created, ``switches`` the times the output was
+pointed at a different one, and ``mismatches`` the headers passed to
+prepare() that no longer matched the file's format (it was rewritten since
+they were read); the mixer always follows the file.
+"""
+import random
+
+import audiocore
+import audiomixer
+
+
+class Shuffle:
+    """Endless shuffled order of ``items``: each once per round, never twice in a row."""
+
+    def __init__(self, items):
+        self._items = list(items)
+        self._position = len(self._items)
+        self.last = None
+
+    def next(self):
+        """The next item, or None when there are none."""
+        items = self._items
+        if not items:
+            return None
+        if self._position >= len(items):
+            # Fisher-Yates (CircuitPython's random has no shuffle())
+            for i in range(len(items) - 1, 0, -1):
+                j = random.randrange(i + 1)
+                items[i], items[j] = items[j], items[i]
+            if len(items) > 1 and items[0] == self.last:
+                # Don't repeat the end of the last round at the start of this one
+                j = random.randrange(1, len(items))
+                items[0], items[j] = items[j], items[0]
+            self._position = 0
+        self.last = items[self._position]
+        self._position += 1
+        return self.last
+
+
+class Player:
+    """Plays tracks on ``audio`` (an I2SOut), one at a time, at ``level``."""
+
+    def __init__(self, audio, cache=None, level=0.5, buffer_size=1024, wave_buffer=1024):
+        self._audio = audio
+        self._cache = cache
+        self.level = level
+        self._buffer_size = buffer_size
+        self._mixers = {}
+        self._mixer = None              # The one the output plays
+        # Halved by WaveFile for double buffering; one for the playing track, one for the next
+        self._buffers = (bytearray(wave_buffer), bytearray(wave_buffer))
+        self._free = 0                  # Index of the buffer the playing track doesn't use
+        self._file = None
+        self._next_path = None
+        self._next_sample = None
+        self._next_format = None        # Its WaveHeader, or the WaveFile itself
+        self._next_file = None
+        self.mixers = 0
+        self.switches = 0
+        self.mismatches = 0
+
+    @property
+    def playing(self):
+        mixer = self._mixer
+        return mixer is not None and mixer.voice[0].playing
+
+    @property
+    def prepared(self):
+        """The path prepare() made ready, or None."""
+        return self._next_path
+
+    def prepare(self, path, header=None):
+        """Get ``path`` ready to start at once.
+
+        ``header`` (a WaveHeader, say from a MediaIndex) saves opening a file
+        too long for the cache just to find that out. If it turns out not to
+        match the file, ``mismatches`` goes up and the file's format is used.
+        """
+        self._drop_next()
+        cache = self._cache
+        sample = None
+        file = None
+        if cache is not None:
+            sample = cache.get(path)
+            if sample is None and (header is None or header.data_bytes <= cache.max_bytes):
+                sample = cache.preload(path)    # None when too long for RAM
+        if sample is not None:
+            # A RawSample has no channel count or sample size to read back
+            fmt = cache.header(path)
+        else:
+            file = open(path, "rb")
+            try:
+                sample = audiocore.WaveFile(file, self._buffers[self._free])
+            except Exception:
+                file.close()
+                raise
+            fmt = sample
+        if header is not None and not header.same_format(fmt):
+            self.mismatches += 1
+        self._next_path = path
+        self._next_sample = sample
+        self._next_format = fmt
+        self._next_file = file
+
+    def play(self, path=None, header=None):
+        """Start ``path`` (the prepared track if None) from the beginning."""
+        if path is not None and path != self._next_path:
+            self.prepare(path, header)
+        if self._next_path is None:
+            raise ValueError("nothing prepared")
+        sample = self._next_sample
+        # By the format prepare() read, so a stale header can't pick the wrong mixer
+        mixer = self._mixer_for(self._next_format)
+        self.stop()
+        if mixer is not self._mixer:
+            # Another format: point the output at that mixer (its buffers are kept)
+            self._audio.play(mixer)
+            self._mixer = mixer
+            self.switches += 1
+        mixer.voice[0].play(sample)
+        if self._next_file is not None:
+            self._file = self._next_file
+            self._free ^= 1
+        self._next_path = None
+        self._next_sample = None
+        self._next_format = None
+        self._next_file = None
+
+    def stop(self):
+        """Stop the track playing (if any) and close its file."""
+        if self._mixer is not None:
+            self._mixer.voice[0].stop()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _drop_next(self):
+        if self._next_file is not None:
+            self._next_file.close()
+        self._next_path = None
+        self._next_sample = None
+        self._next_format = None
+        self._next_file = None
+
+    def _mixer_for(self, fmt):
+        # ``fmt`` is a WaveHeader or a WaveFile
+        key = (fmt.sample_rate, fmt.channel_count, fmt.bits_per_sample)
+        mixer = self._mixers.get(key)
+        if mixer is None:
+            mixer = audiomixer.Mixer(voice_count=1, buffer_size=self._buffer_size,
+                                     sample_rate=fmt.sample_rate,
+                                     channel_count=fmt.channel_count,
+                                     bits_per_sample=fmt.bits_per_sample,
+                                     samples_signed=fmt.bits_per_sample == 16)
+            mixer.voice[0].level = self.level
+            self._mixers[key] = mixer
+            self.mixers += 1
+        return mixer
@@ -0,0 +1,299 @@
+"""Leveled log records in a fixed RAM ring buffer, written to USB serial without blocking.
+
+print() waits whenever the host is slow to read the console (a paused
+terminal, a busy serial monitor), so a message per button press can hold
+up the input loop for as long as the host likes. RingLog packs each record
+into a preallocated ring buffer instead, and drain() writes out only what
+the serial port accepts right now. When the buffer is full new records are
+dropped and counted, never waited for.
+
+    log = ringlog.usb_log(size=1024, rate=20)
+    PRESSED = log.define("Button {} sent {}")   # once, at startup
+    while True:
+        ...
+        log.info(PRESSED, i, code)
+        log.drain()                             # every tick
+
+Messages are ``str.format`` strings defined up front; a record is the
+message id, the level, supervisor.ticks_ms() and the arguments (ints are
+32-bit, floats 32-bit, anything else is sent as text). With boot.py
+enabling ``usb_cdc.data`` records go out as compact binary frames there and
+``python -m sim.logdecode /dev/ttyACM1`` turns them back into text;
+otherwise drain() formats them and writes as many lines as the console port
+takes.
+
+Frames are ``A5 <len> <payload> <sum of payload & 0xFF>``; the payload is
+``<level> <ticks u32> <id>`` then each argument as ``'i' <i32>``,
+``'f' <f32>`` or ``'s' <len> <utf-8>``. A level of 0 defines message
+``id`` as the format in its one text argument; the definitions are sent
+again whenever the host reopens the port.
+
+Records below ERROR are rate-limited to ``rate`` a second with bursts of
+``burst``; the number suppressed (and dropped for lack of space) is logged
+as soon as there is room again.
+"""
+import struct
+
+import supervisor
+
+from ticks import ticks_diff
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+DEFINE = 0      # level of a frame that defines a message format
+
+SYNC = 0xA5
+MAX_PAYLOAD = 255
+ARG_INT = 0x69      # 'i'
+ARG_FLOAT = 0x66    # 'f'
+ARG_TEXT = 0x73     # 's'
+
+# Messages every log has, for the records it had to leave out
+SUPPRESSED = 0
+DROPPED = 1
+_BUILTIN = (
+    "{} records suppressed by the rate limit",
+    "{} records dropped, log buffer full",
+)
+
+_NOTE_SIZE = 14     # frame of a builtin message with one int
+_LEVEL_NAMES = {WARNING: "WARNING: ", ERROR: "ERROR: "}
+
+
+def usb_log(**kwargs):
+    """A RingLog on ``usb_cdc.data`` if boot.py enabled it, else text on the console port."""
+    import usb_cdc
+    if usb_cdc.data is not None:
+        return RingLog(usb_cdc.data, binary=True, **kwargs)
+    return RingLog(usb_cdc.console, binary=False, **kwargs)
+
+
+def parse_args(buf, pos, end):
+    """The arguments packed in ``buf[pos:end]``, as a list."""
+    args = []
+    while pos < end:
+        kind = buf[pos]
+        if kind == ARG_INT:
+            args.append(struct.unpack_from("<i", buf, pos + 1)[0])
+            pos += 5
+        elif kind == ARG_FLOAT:
+            args.append(struct.unpack_from("<f", buf, pos + 1)[0])
+            pos += 5
+        else:
+            count = buf[pos + 1]
+            args.append(bytes(buf[pos + 2:pos + 2 + count]).decode())
+            pos += 2 + count
+    return args
+
+
+class RingLog:
+    """Log records for ``port`` (a usb_cdc.Serial, or None to only keep them).
+
+    ``records`` counts records written, ``suppressed`` and ``dropped`` the
+    ones left out and not yet reported.
+    """
+
+    def __init__(self, port, binary=True, size=1024, level=INFO, rate=20, burst=20):
+        self._port = port
+        if port is not None:
+            port.write_timeout = 0  # write() takes what fits and returns at once
+        self.binary = binary
+        self.level = level
+        self._ring = bytearray(size)
+        self._ring_view = memoryview(self._ring)
+        self._size = size
+        self._head = 0
+        self._tail = 0
+        self._used = 0
+        self._frame = bytearray(MAX_PAYLOAD + 3)
+        self._frame_view = memoryview(self._frame)
+        self._formats = []
+        self._defs = bytearray()
+        self._def_pos = 0
+        self._connected = False
+        self._line = None   # text mode: the rest of a line the port didn't take
+        # Token bucket in thousandths of a record; one token per ms per record/s
+        self._rate = rate
+        self._capacity = burst * 1000
+        self._tokens = self._capacity
+        self._last = supervisor.ticks_ms()
+        self.records = 0
+        self.suppressed = 0
+        self.dropped = 0
+        for text in _BUILTIN:
+            self.define(text)
+
+    def define(self, text):
+        """Register a format string; returns the message id to log it with."""
+        msg = len(self._formats)
+        self._formats.append(text)
+        length = self._pack(DEFINE, msg, (text,))
+        self._defs.extend(self._frame_view[:length])
+        return msg
+
+    def debug(self, msg, *args):
+        return self.log(DEBUG, msg, args)
+
+    def info(self, msg, *args):
+        return self.log(INFO, msg, args)
+
+    def warning(self, msg, *args):
+        return self.log(WARNING, msg, args)
+
+    def error(self, msg, *args):
+        return self.log(ERROR, msg, args)
+
+    def log(self, level, msg, args=()):
+        """Queue one record; False if it was filtered, rate-limited or didn't fit."""
+        if level < self.level:
+            return False
+        if level < ERROR and not self._allow():
+            self.suppressed += 1
+            return False
+        notes = (1 if self.suppressed else 0) + (1 if self.dropped else 0)
+        if notes:
+            # Say what was left out before the record that follows it: both fit, or neither
+            if self._pack(level, msg, args) + notes * _NOTE_SIZE > self._size - self._used:
+                self.dropped += 1
+                return False
+            self._notes()
+        if not self._put(level, msg, args):
+            self.dropped += 1
+            return False
+        self.records += 1
+        return True
+
+    def _notes(self):
+        if self.suppressed and self._put(WARNING, SUPPRESSED, (self.suppressed,)):
+            self.suppressed = 0
+        if self.dropped and self._put(WARNING, DROPPED, (self.dropped,)):
+            self.dropped = 0
+
+    def _allow(self):
+        now = supervisor.ticks_ms()
+        elapsed = ticks_diff(now, self._last)
+        self._last = now
+        tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+        if tokens < 1000:
+            self._tokens = tokens
+            return False
+        self._tokens = tokens - 1000
+        return True
+
+    def _pack(self, level, msg, args):
+        """Build one frame in self._frame; returns its length."""
+        frame = self._frame
+        struct.pack_into("<BBBIB", frame, 0, SYNC, 0, level, supervisor.ticks_ms(), msg)
+        pos = 8
+        for arg in args:
+            if isinstance(arg, int):
+                if pos + 5 > MAX_PAYLOAD + 2:
+                    break
+                struct.pack_into("<Bi", frame, pos, ARG_INT, arg)
+                pos += 5
+            elif isinstance(arg, float):
+                if pos + 5 > MAX_PAYLOAD + 2:
+                    break
+                struct.pack_into("<Bf", frame, pos, ARG_FLOAT, arg)
+                pos += 5
+            else:
+                data = str(arg).encode()
+                count = min(len(data), MAX_PAYLOAD + 2 - pos - 2)
+                if count < 0:
+                    break
+                frame[pos] = ARG_TEXT
+                frame[pos + 1] = count
+                frame[pos + 2:pos + 2 + count] = data[:count]
+                pos += 2 + count
+        frame[1] = pos - 2
+        check = 0
+        for i in range(2, pos):
+            check += frame[i]
+        frame[pos] = check & 0xFF
+        return pos + 1
+
+    def _put(self, level, msg, args):
+        length = self._pack(level, msg, args)
+        if length > self._size - self._used:
+            return False
+        head = self._head
+        first = min(length, self._size - head)
+        self._ring[head:head + first] = self._frame_view[:first]
+        if length > first:
+            self._ring[:length - first] = self._frame_view[first:length]
+        self._head = (head + length) % self._size
+        self._used += length
+        return True
+
+    def _get(self, count):
+        """Move ``count`` bytes from the ring into self._frame."""
+        tail = self._tail
+        first = min(count, self._size - tail)
+        self._frame[:first] = self._ring_view[tail:tail + first]
+        if count > first:
+            self._frame[first:count] = self._ring_view[:count - first]
+        self._tail = (tail + count) % self._size
+        self._used -= count
+
+    def drain(self):
+        """Write whatever the port accepts right now; returns the bytes written."""
+        port = self._port
+        if port is None:
+            return 0
+        if self.dropped and self._used <= self._size // 2:
+            # The buffer filled up: say so once it has drained well below full
+            self._put(WARNING, DROPPED, (self.dropped,))
+            self.dropped = 0
+        if not self.binary:
+            return self._drain_text(port)
+        connected = port.connected
+        if connected and not self._connected:
+            self._def_pos = 0   # A new reader: it needs the formats first
+        self._connected = connected
+        if not connected:
+            return 0
+        total = 0
+        if self._def_pos < len(self._defs):
+            chunk = memoryview(self._defs)[self._def_pos:]
+            written = port.write(chunk) or 0
+            self._def_pos += written
+            total += written
+            if written < len(chunk):
+                return total
+        # At most two writes: up to the end of the ring, then from its start
+        while self._used:
+            tail = self._tail
+            count = min(self._used, self._size - tail)
+            written = port.write(self._ring_view[tail:tail + count]) or 0
+            self._tail = (tail + written) % self._size
+            self._used -= written
+            total += written
+            if written < count:
+                break
+        return total
+
+    def _drain_text(self, port):
+        total = 0
+        while True:
+            if self._line is None:
+                if not self._used:
+                    break
+                # Frames in the ring are whole: header, payload, check byte
+                self._get(2)
+                length = self._frame[1]
+                self._get(length + 1)
+                level = self._frame[0]
+                msg = self._frame[5]
+                args = parse_args(self._frame, 6, length)
+                line = _LEVEL_NAMES.get(level, "") + self._formats[msg].format(*args) + "\r\n"
+                self._line = memoryview(line.encode())
+            count = len(self._line)
+            written = port.write(self._line) or 0
+            total += written
+            if written < count:
+                self._line = self._line[written:]
+                break
+            self._line = None
+        return total
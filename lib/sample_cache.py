@@ -0,0 +1,142 @@
+"""Short WAV clips held in RAM as RawSamples, so a trigger plays at once.
+
+Playing a clip through ``audiocore.WaveFile`` opens the file, parses its
+header and reads the first buffer from flash or SD before anything comes
+out, every time. SampleCache loads clips up to ``max_bytes`` of sample data
+once into a RawSample and keeps them within a total ``budget`` of bytes,
+evicting the least recently played first. Longer files still stream.
+
+    cache = SampleCache(budget=96 * 1024, max_bytes=32 * 1024)
+    for path in clips:
+        cache.preload(path)               # at startup, while there's time
+    ...
+    sample, file = cache.open(path)      # on a button press
+    mixer.voice[0].play(sample)
+    # file is the open file of a streamed WaveFile (close it when done), else None
+
+``hits`` and ``misses`` count open() calls answered from RAM or not.
+"""
+from array import array
+
+import audiocore
+
+from wave_header import WaveHeader
+
+
+class SampleCache:
+    """RawSamples by path, least recently played first out once over ``budget`` bytes."""
+
+    def __init__(self, budget=64 * 1024, max_bytes=None):
+        self.budget = budget
+        self.max_bytes = budget if max_bytes is None else min(max_bytes, budget)
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self._samples = {}
+        self._headers = {}
+        self._order = []    # Paths, least recently played first
+
+    def __contains__(self, path):
+        return path in self._samples
+
+    def __len__(self):
+        return len(self._samples)
+
+    def get(self, path):
+        """The cached RawSample for ``path`` (now the most recently used), or None."""
+        sample = self._samples.get(path)
+        if sample is not None:
+            order = self._order
+            if order[-1] != path:
+                order.remove(path)
+                order.append(path)
+        return sample
+
+    def header(self, path):
+        """The WaveHeader of cached ``path``: its format, for picking a mixer."""
+        return self._headers[path]
+
+    def preload(self, path, evict=True):
+        """Load ``path`` into RAM if it's small enough; returns the RawSample or None.
+
+        With ``evict=False`` it is only loaded if it fits in what's left of
+        the budget, so preloading a list never pushes out earlier entries.
+        Raises OSError or ValueError for a missing or unplayable file.
+        """
+        sample = self.get(path)
+        if sample is not None:
+            return sample
+        with open(path, "rb") as file:
+            header = WaveHeader.read(file)
+            size = header.data_bytes
+            if size > self.max_bytes:
+                return None
+            if self.used + size > self.budget:
+                if not evict:
+                    return None
+                self._evict(self.used + size - self.budget)
+            try:
+                sample = self._load(file, header)
+            except MemoryError:
+                # The heap is fragmented or short: make room and try once more
+                self._evict(self.used)
+                try:
+                    sample = self._load(file, header)
+                except MemoryError:
+                    return None
+        self._samples[path] = sample
+        self._headers[path] = header
+        self._order.append(path)
+        self.used += size
+        return sample
+
+    def open(self, path):
+        """A sample ready to play and the file it streams from (None when from RAM).
+
+        Tries RAM first, then loads the clip if it is short enough, and
+        otherwise opens a streaming WaveFile.
+        """
+        sample = self.get(path)
+        if sample is not None:
+            self.hits += 1
+            return sample, None
+        self.misses += 1
+        sample = self.preload(path)
+        if sample is not None:
+            return sample, None
+        file = open(path, "rb")
+        try:
+            return audiocore.WaveFile(file), file
+        except Exception:
+            file.close()
+            raise
+
+    def discard(self, path):
+        """Forget ``path`` (say, after the file changed); its RAM goes once it stops playing."""
+        if self._samples.pop(path, None) is not None:
+            self.used -= self._headers.pop(path).data_bytes
+            self._order.remove(path)
+
+    def clear(self):
+        self._samples.clear()
+        self._headers.clear()
+        self._order.clear()
+        self.used = 0
+
+    def _evict(self, needed):
+        order = self._order
+        while needed > 0 and order:
+            path = order[0]
+            needed -= self._headers[path].data_bytes
+            self.discard(path)
+
+    @staticmethod
+    def _load(file, header):
+        # WAV stores 8-bit samples unsigned and 16-bit signed, as RawSample takes them
+        typecode = "h" if header.bits_per_sample == 16 else "B"
+        # array() takes bytes as raw data; the zeroed bytes are freed straight away
+        size = header.data_bytes - header.data_bytes % header.frame_bytes
+        buffer = array(typecode, bytes(size))
+        file.readinto(buffer)
+        return audiocore.RawSample(buffer, channel_count=header.channel_count,
+                                   sample_rate=header.sample_rate)
@@ -0,0 +1,97 @@
+"""Startup timing, and setup work deferred until the main loop is running.
+
+Everything at the top of a script runs before the first input is read:
+imports (each .py file is compiled on the spot), device setup, file
+opens. StartupTimer times the pieces and prints where the time went, and
+holds setup that the first frame doesn't need so the loop can run it
+later, one piece per tick:
+
+    import startup
+    boot = startup.StartupTimer()
+    with boot.step("import adafruit_lis3dh"):
+        import adafruit_lis3dh
+    with boot.step("LIS3DH"):
+        lis3dh = adafruit_lis3dh.LIS3DH_I2C(board.I2C())
+    boot.later("audio", start_audio)
+    boot.done()                     # prints the steps and the total so far
+    while True:
+        boot.run_later()            # at most one deferred setup per call
+        ...
+        if sent:
+            boot.first("first HID report")
+
+Times are in ms from the moment the StartupTimer was created, so import
+it first.
+"""
+import time
+
+
+class _Step:
+    def __init__(self, timer, name):
+        self._timer = timer
+        self._name = name
+        self._start = 0
+
+    def __enter__(self):
+        self._start = time.monotonic_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self._timer.steps.append((self._name, (time.monotonic_ns() - self._start) / 1000000))
+
+
+class StartupTimer:
+    """Named startup steps with their cost in ms; ``verbose`` prints as it goes."""
+
+    def __init__(self, verbose=True):
+        self._start = time.monotonic_ns()
+        self.verbose = verbose
+        self.steps = []
+        self.marks = []
+        self._later = []
+
+    def elapsed(self):
+        """ms since the timer was created."""
+        return (time.monotonic_ns() - self._start) / 1000000
+
+    def step(self, name):
+        """A ``with`` block timed as one step."""
+        return _Step(self, name)
+
+    def later(self, name, setup):
+        """Run ``setup()`` from run_later() once the main loop is going."""
+        self._later.append((name, setup))
+
+    def run_later(self):
+        """Run the next deferred setup, timed; False once there is nothing left."""
+        if not self._later:
+            return False
+        name, setup = self._later.pop(0)
+        start = time.monotonic_ns()
+        setup()
+        cost = (time.monotonic_ns() - start) / 1000000
+        self.steps.append((name + " (later)", cost))
+        if self.verbose:
+            print("startup: {} {:.1f} ms, later".format(name, cost))
+        return True
+
+    def first(self, name):
+        """Record when ``name`` first happened; True the first time only."""
+        for mark, _ in self.marks:
+            if mark == name:
+                return False
+        at = self.elapsed()
+        self.marks.append((name, at))
+        if self.verbose:
+            print("startup: {} at {:.1f} ms".format(name, at))
+        return True
+
+    def done(self):
+        """Print the steps so far and the time to here (the start of the main loop)."""
+        at = self.elapsed()
+        self.marks.append(("main loop", at))
+        if self.verbose:
+            for name, cost in self.steps:
+                print("startup: {:24} {:7.1f} ms".format(name, cost))
+            print("startup: main loop at {:.1f} ms".format(at))
+        return at
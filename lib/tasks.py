@@ -0,0 +1,58 @@
+"""Fixed-rate cooperative tasks on CircuitPython's ``asyncio``.
+
+Each part of a script (sensor polling, HID output, LEDs, display) becomes
+its own ``async`` loop paced by a Rate, so a slow LED or display update runs
+at its own rate instead of stretching every input poll:
+
+    async def poll_keys():
+        rate = Rate(200)
+        while True:
+            ...
+            await rate.wait()
+
+    run(poll_keys(), update_leds())
+
+A Rate keeps a fixed timeline in supervisor.ticks_ms(): a late step
+shortens the next sleep instead of pushing every later step back.
+"""
+import asyncio
+import supervisor
+
+from ticks import ticks_add, ticks_diff
+
+
+class Rate:
+    """Paces a task loop at ``hz`` steps per second.
+
+    ``overruns`` counts steps that finished after the next one was due and
+    ``max_late`` is the worst lateness in ms. A step more than one interval
+    late restarts the timeline from now, so a stall is not followed by a
+    burst of catch-up steps.
+    """
+
+    def __init__(self, hz):
+        self.interval = max(1, int(1000 / hz + 0.5))
+        self._next = supervisor.ticks_ms()
+        self.overruns = 0
+        self.max_late = 0
+
+    async def wait(self):
+        now = supervisor.ticks_ms()
+        self._next = ticks_add(self._next, self.interval)
+        delay = ticks_diff(self._next, now)
+        if delay < 0:
+            self.overruns += 1
+            if -delay > self.max_late:
+                self.max_late = -delay
+            if -delay >= self.interval:
+                self._next = now
+            delay = 0
+        await asyncio.sleep_ms(delay)
+
+
+def run(*coroutines):
+    """Run the given task coroutines together, forever."""
+    async def main():
+        await asyncio.gather(*[asyncio.create_task(coro) for coro in coroutines])
+
+    asyncio.run(main())
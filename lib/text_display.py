@@ -0,0 +1,92 @@
+"""A title and a few lines of text on a displayio display, built once and redrawn at a capped rate.
+
+``macropad.display_text()`` builds a new group of labels every time it is
+called and showing it redraws the whole display, so a message per encoder
+step means a rebuild, a ~25 ms refresh and garbage each time. TextDisplay
+builds its labels once and only assigns ``.text`` when it actually changes.
+With ``auto_refresh`` off, refresh() redraws only if something changed and
+at most ``max_fps`` times a second, so a fast run of updates shows up as
+one redraw of the latest text.
+
+    text = TextDisplay(macropad.display, lines=2, max_fps=10)
+    text.show("Profile", "NumPad")
+    while True:
+        ...
+        text.refresh()
+
+``redraw_ms`` is how long the last redraw took and ``max_redraw_ms`` the
+slowest so far; ``redraws`` counts them.
+"""
+import time
+
+import displayio
+import terminalio
+from adafruit_display_text import label
+
+LINE_HEIGHT = 12
+
+
+class TextDisplay:
+    """A title line plus ``lines`` text lines; call refresh() every tick."""
+
+    def __init__(self, display, lines=4, max_fps=10, font=terminalio.FONT):
+        self._display = display
+        self._group = displayio.Group()
+        self._labels = []
+        for i in range(lines + 1):
+            text = label.Label(font, text="", x=0, y=LINE_HEIGHT // 2 + i * LINE_HEIGHT)
+            self._labels.append(text)
+            self._group.append(text)
+        self._interval = 1000000000 // max_fps if max_fps else 0
+        self._last_refresh = None
+        self._dirty = True
+        self.redraw_ms = 0.0
+        self.max_redraw_ms = 0.0
+        self.redraws = 0
+        display.auto_refresh = False
+        display.root_group = self._group
+
+    def __setitem__(self, index, text):
+        """Set line ``index`` (0 is the title)."""
+        line = self._labels[index]
+        if line.text != text:
+            line.text = text
+            self._dirty = True
+
+    def show(self, title, *lines):
+        """Set the title and the lines below it; lines not given are cleared."""
+        self[0] = title
+        for i in range(1, len(self._labels)):
+            self[i] = lines[i - 1] if i <= len(lines) else ""
+
+    @property
+    def rotation(self):
+        return self._display.rotation
+
+    @rotation.setter
+    def rotation(self, value):
+        if value != self._display.rotation:
+            # Rotating redraws at once; time it like any other redraw
+            start = time.monotonic_ns()
+            self._display.rotation = value
+            self._redrawn(start)
+
+    def refresh(self):
+        """Redraw if anything changed and the frame-rate cap allows; True if redrawn."""
+        if not self._dirty:
+            return False
+        start = time.monotonic_ns()
+        if self._last_refresh is not None and start - self._last_refresh < self._interval:
+            return False
+        self._display.refresh()
+        self._redrawn(start)
+        return True
+
+    def _redrawn(self, start):
+        now = time.monotonic_ns()
+        self._last_refresh = start
+        self._dirty = False
+        self.redraws += 1
+        self.redraw_ms = (now - start) / 1000000
+        if self.redraw_ms > self.max_redraw_ms:
+            self.max_redraw_ms = self.redraw_ms
@@ -0,0 +1,33 @@
+"""supervisor.ticks_ms() arithmetic that stays right across its wrap.
+
+ticks_ms() counts milliseconds in 29 bits, wrapping every 2**29 ms (about
+6.2 days), so timestamps are only compared through these helpers. This is
+the same arithmetic as ``adafruit_ticks``, without its extra import, and
+with nothing that pulls in ``asyncio`` for scripts that don't use it.
+
+    start = supervisor.ticks_ms()
+    deadline = ticks_add(start, 250)
+    ...
+    if ticks_diff(deadline, supervisor.ticks_ms()) <= 0:   # 250 ms have passed
+        print("took", ticks_since(start), "ms")
+"""
+import supervisor
+
+TICKS_PERIOD = 1 << 29
+_TICKS_MASK = TICKS_PERIOD - 1
+_TICKS_HALF = TICKS_PERIOD // 2
+
+
+def ticks_add(ticks, delta):
+    """``ticks`` moved by ``delta`` ms (either sign), wrapped like ticks_ms()."""
+    return (ticks + delta) & _TICKS_MASK
+
+
+def ticks_diff(end, start):
+    """Signed ``end - start`` in ms, for times less than 2**28 ms apart."""
+    return ((end - start + _TICKS_HALF) & _TICKS_MASK) - _TICKS_HALF
+
+
+def ticks_since(start):
+    """Milliseconds from ``start`` to now."""
+    return ticks_diff(supervisor.ticks_ms(), start)
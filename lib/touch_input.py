@@ -0,0 +1,80 @@
+"""Capacitive touch pads sampled once per tick, with a drifting baseline and hysteresis.
+
+Every ``TouchIn.value`` read is a fresh capacitive measurement, so a loop
+that checks a pad several times pays for several measurements and can see
+it touched and untouched within the same tick. TouchPad.update() reads
+``raw_value`` once and turns it into press / release / long-press events:
+
+- the untouched level is tracked as an exponentially weighted average, so
+  slow drift (humidity, a hand resting nearby) does not cause presses;
+- a press needs ``press_delta`` counts above that baseline, a release drops
+  below the lower ``release_delta``, so noise at the edge cannot chatter.
+
+    pad = TouchPad(touchio.TouchIn(board.TOUCH1), long_press=1.0)
+    event = pad.update(time.monotonic())
+    if event == RELEASE and not pad.long_pressed:
+        ...
+"""
+NONE = 0
+PRESS = 1
+RELEASE = 2
+LONG_PRESS = 3
+
+_SHIFT = 4      # baseline kept with 4 fractional bits
+
+
+class TouchPad:
+    """One pad; call update() once per tick and act on the event it returns.
+
+    ``press_delta`` defaults to the margin touchio chose for the pad's own
+    threshold at startup; ``release_delta`` to two thirds of it. The
+    baseline follows untouched readings with weight 1/2**``smoothing``.
+    With ``repeat`` set, LONG_PRESS is returned again every ``repeat``
+    seconds while the pad stays held.
+    """
+
+    def __init__(self, touch, press_delta=None, release_delta=None, smoothing=5,
+                 long_press=1.0, repeat=None):
+        self._touch = touch
+        raw = touch.raw_value
+        self._baseline = raw << _SHIFT
+        self.press_delta = press_delta or max(1, touch.threshold - raw)
+        self.release_delta = release_delta or self.press_delta * 2 // 3
+        self.smoothing = smoothing
+        self.long_press = long_press
+        self.repeat = repeat
+        self.raw = raw
+        self.pressed = False
+        self.long_pressed = False
+        self.pressed_at = 0.0
+        self._next_long = 0.0
+
+    @property
+    def baseline(self):
+        return self._baseline >> _SHIFT
+
+    def update(self, now):
+        raw = self._touch.raw_value
+        self.raw = raw
+        level = raw - (self._baseline >> _SHIFT)
+        if not self.pressed:
+            if level > self.press_delta:
+                self.pressed = True
+                self.long_pressed = False
+                self.pressed_at = now
+                self._next_long = now + self.long_press
+                return PRESS
+            # Only untouched readings move the baseline
+            self._baseline += ((raw << _SHIFT) - self._baseline) >> self.smoothing
+            return NONE
+        if level < self.release_delta:
+            self.pressed = False
+            return RELEASE
+        if now >= self._next_long and (self.repeat or not self.long_pressed):
+            self.long_pressed = True
+            self._next_long = now + (self.repeat or 0)
+            return LONG_PRESS
+        return NONE
+
+    def held_for(self, now):
+        return now - self.pressed_at if self.pressed else 0.0
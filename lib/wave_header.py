@@ -0,0 +1,77 @@
+"""Read a WAV file's format and where its samples are, without audiocore.
+
+``audiocore.WaveFile`` only says what it found once it has been built around
+an open file, and building one keeps the file and its buffers. WaveHeader
+reads just the RIFF chunks up to the data, into a small reused buffer, so
+a script can find out what a clip is (to size a mixer, or to load it into
+RAM) before deciding how to play it.
+
+    with open("/sd/1.wav", "rb") as f:
+        header = WaveHeader.read(f)
+    print(header.sample_rate, header.channel_count, header.bits_per_sample,
+          header.duration)
+"""
+import struct
+
+_buffer = bytearray(16)
+
+
+class WaveHeader:
+    """PCM format of a WAV file and the offset and length of its sample data."""
+
+    def __init__(self, sample_rate, channel_count, bits_per_sample, data_offset, data_bytes):
+        self.sample_rate = sample_rate
+        self.channel_count = channel_count
+        self.bits_per_sample = bits_per_sample
+        self.data_offset = data_offset
+        self.data_bytes = data_bytes
+
+    @property
+    def frame_bytes(self):
+        return self.channel_count * self.bits_per_sample // 8
+
+    @property
+    def duration(self):
+        return self.data_bytes / (self.sample_rate * self.frame_bytes)
+
+    def same_format(self, other):
+        """True if ``other`` (a header or a WaveFile) plays on the same mixer."""
+        return (self.sample_rate == other.sample_rate
+                and self.channel_count == other.channel_count
+                and self.bits_per_sample == other.bits_per_sample)
+
+    @staticmethod
+    def read(file):
+        """Parse the header of ``file`` (open in binary mode, at its start).
+
+        Leaves the file positioned at the first sample. Raises ValueError
+        for anything but uncompressed 8- or 16-bit PCM.
+        """
+        buffer = _buffer
+        view = memoryview(buffer)
+        if file.readinto(view[:12]) != 12 or buffer[0:4] != b"RIFF" or buffer[8:12] != b"WAVE":
+            raise ValueError("Invalid WAVE")
+        offset = 12
+        fmt = None
+        while True:
+            if file.readinto(view[:8]) != 8:
+                raise ValueError("Data chunk must follow fmt chunk")
+            size = struct.unpack_from("<I", buffer, 4)[0]
+            offset += 8
+            if buffer[0:4] == b"fmt ":
+                if size < 16 or file.readinto(view[:16]) != 16:
+                    raise ValueError("Invalid WAVE")
+                fmt = struct.unpack_from("<HHIIHH", buffer)
+                if size > 16:
+                    file.seek(size - 16, 1)
+            elif buffer[0:4] == b"data":
+                break
+            else:
+                file.seek(size + (size & 1), 1)  # Chunks are padded to an even length
+            offset += size + (size & 1)
+        if fmt is None:
+            raise ValueError("Data chunk must follow fmt chunk")
+        encoding, channels, rate, _, _, bits = fmt
+        if encoding != 1 or bits not in (8, 16):
+            raise ValueError("Unsupported WAVE format")
+        return WaveHeader(rate, channels, bits, offset, size)
@@ -1,22 +1,58 @@
-from adafruit_macropad import MacroPad
-from rainbowio import colorwheel
-import time
+import startup
+boot = startup.StartupTimer()  # Created first so every step below is timed
 
-macropad = MacroPad()
-encoder_last_position = macropad.encoder
+with boot.step("imports"):
+    from adafruit_macropad import MacroPad
+    from adafruit_hid.keyboard_layout_us import KeyboardLayoutUS
+    from encoder import EncoderSteps, StepQueue
+    from hid_state import HIDState
+    from macropad_profiles import ProfileFile
+    from macros import MacroPlayer, compile_macro
+    from pixel_frame import PixelFrame
+    from tasks import Rate, run
+    import keypad
+    import time
+    import usb_hid
+
+with boot.step("MacroPad"):
+    macropad = MacroPad()
+hid = HIDState(usb_hid.devices)  # Key and volume reports, sent once per report tick
+macropad.pixels.auto_write = False
+frame = PixelFrame(macropad.pixels)  # Key LEDs, written by the LED task when changed
+key_event = keypad.Event()  # Reused for every queued key event
 encoder_pressed_time = None
 profile_last_action = time.monotonic()
 
-# --- Tones for keypresses ---
-tones = [196, 220, 246, 262, 294, 330, 349, 392, 440, 494, 523, 587]
+# --- Task rates (per second) ---
+input_rate = 500     # Keys, encoder and menu logic
+report_rate = 125    # HID reports (the 8 ms USB poll interval)
+led_rate = 30
+display_rate = 50    # How often the display task looks for changed text
+display_fps = 10     # A redraw takes ~25 ms, so at most this many a second
+profile_check_rate = 0.5  # Look for an edited profile file every 2 s
+macro_step_interval = 0.008  # One macro press or release per HID report
+volume_step_interval = 0.02  # At most 50 volume taps a second (each is two reports)
+
+# --- Encoder ---
+# Volume speeds up with the spin: (detents per second, steps per detent)
+VOLUME_CURVE = ((0, 1), (15, 2), (40, 3))
+encoder = EncoderSteps(macropad.encoder, curve=VOLUME_CURVE)
+# Under a second of taps; more is dropped so the volume stops with the knob
+volume_steps = StepQueue(interval=volume_step_interval, limit=32)
 
 # --- State ---
+pending_text = None      # (title, message) and rotation, applied by the display task
+pending_rotation = None
+text = None              # TextDisplay, set up by the display task after the first input poll
+held_keys = []  # (key number, keycode, tone) for every key down, oldest first
 profile_menu = False
 current_profile = 0
 shortcut_index = 0
 
 # --- Profiles ---
-profiles = [
+# Used when CIRCUITPY has no profile file. Per-key tones and LED colours
+# default to the tables in macropad_profiles.
+builtin_profiles = [
     {
         "name": "NumPad",
         "display_name": "NumPad",
@@ -73,8 +109,11 @@ profiles = [
         "rotation": 0,
         "volume": False,
         "shortcuts": [
-            [macropad.Keycode.GUI, "r", macropad.Keycode.RETURN, "https://youtube.com", macropad.Keycode.RETURN],
-            [macropad.Keycode.GUI, "r", macropad.Keycode.RETURN, "steam", macropad.Keycode.RETURN],
+            # GUI+R, then a pause for the Run dialog to open. The RETURN the
+            # original sent straight after "r" is left out on purpose: it landed
+            # in the dialog before the text and ran whatever it last remembered.
+            [macropad.Keycode.GUI, "r", 0.5, "https://youtube.com", macropad.Keycode.RETURN],
+            [macropad.Keycode.GUI, "r", 0.5, "steam", macropad.Keycode.RETURN],
             [macropad.Keycode.GUI, macropad.Keycode.E],  # File explorer
             []
         ]
@@ -93,36 +132,92 @@ profiles = [
     }
 ]
 
+# Parsed only when the file changes; the hot path reads the compiled tables
+# and shortcuts are compiled to macros (the layout only maps text to keycodes)
+PROFILE_FILE = "/macropad_profiles.json"
+layout = KeyboardLayoutUS(None)
+with boot.step("profiles"):
+    # The built-ins come up first; the profile task reads the file once running
+    profile_file = ProfileFile(PROFILE_FILE, macropad.Keycode, fallback=builtin_profiles,
+                               shortcut=lambda items: compile_macro(items, layout))
+profiles = profile_file.profiles
+profile = profiles[current_profile]  # The active profile
+
 # --- Display helper ---
-def display_message(title, message=""):
-    text_lines = macropad.display_text(title=title)
-    if message:
-        text_lines[1].text = message
-    text_lines.show()
+def display_message(title, message="", rotation=None):
+    """Set the text; the display task redraws it (only the latest of a burst is drawn)."""
+    global pending_text, pending_rotation
+    pending_text = (title, message)
+    if rotation is not None:
+        pending_rotation = rotation
 
 # --- Profile loader ---
 def load_profile(index):
+    global profile
     profile = profiles[index]
-    macropad.display.rotation = profile.get("rotation", 0)
-    display_message("Profile", profile.get("display_name", profile["name"]))
-
-# --- Key sequence processor ---
-def process_sequence(seq):
-    for item in seq:
-        if isinstance(item, str):
-            macropad.keyboard_layout.write(item)
-        elif isinstance(item, int):
-            macropad.keyboard.press(item)
-    macropad.keyboard.release_all()
+    display_message("Profile", profile.display_name, profile.rotation)
+
+# --- Shortcut playback: one step per report, input keeps running meanwhile ---
+player = MacroPlayer(hid.keyboard, interval=macro_step_interval,
+                     held=lambda code: any(held[1] == code for held in held_keys))
+
+# --- Key handling ---
+# Every key can be held at once, but the boot keyboard report has six slots:
+# keys pressed once it is full wait in held_keys and go out as slots free up.
+def press_key(key):
+    code = profile.keycodes[key]
+    if profile_menu or not code:
+        return
+    tone = profile.tones[key]
+    held_keys.append((key, code, tone))
+    if hid.keyboard.has_room(code):
+        hid.keyboard.press(code)
+    frame[key] = profile.colors[key]
+    if tone:
+        macropad.start_tone(tone)
+
+def release_key(key):
+    for held in held_keys:
+        if held[0] == key:
+            break
+    else:
+        return  # Pressed in the menu or unmapped
+    held_keys.remove(held)
+    code = held[1]
+    # Keys sharing a keycode (SPACE in WASD) keep it down until the last one goes up
+    for other in held_keys:
+        if other[1] == code:
+            break
+    else:
+        hid.keyboard.release(code)
+        # A slot may have freed up for the oldest key still waiting
+        for other in held_keys:
+            if hid.keyboard.has_room(other[1]):
+                hid.keyboard.press(other[1])
+    frame[key] = 0
+    # The tone follows the most recent key still down
+    for other in reversed(held_keys):
+        if other[2]:
+            macropad.start_tone(other[2])
+            break
+    else:
+        macropad.stop_tone()
+
+def release_all_keys():
+    held_keys.clear()
+    hid.keyboard.release_all()
+    frame.fill(0)
+    macropad.stop_tone()
 
 # --- Startup ---
 load_profile(current_profile)
 
-while True:
+def poll():
+    global encoder_pressed_time, profile_last_action
+    global profile_menu, current_profile, shortcut_index
     now = time.monotonic()
-    key_event = macropad.keys.events.get()
     macropad.encoder_switch_debounced.update()
-    new_position = macropad.encoder
+    delta = encoder.update(macropad.encoder)  # Every detent since the last tick
 
     # --- Exit profile menu after timeout ---
     if profile_menu and now - profile_last_action > 60:
@@ -140,54 +235,113 @@ while True:
         if held > 1:
             profile_menu = not profile_menu
             shortcut_index = 0
+            volume_steps.clear()
             if profile_menu:
-                macropad.display.rotation = 0
-                display_message("Profile Menu", "Rotate to select")
+                display_message("Profile Menu", "Rotate to select", 0)
             else:
                 load_profile(current_profile)
             profile_last_action = now
-        elif not profile_menu and not profiles[current_profile].get("volume", True):
-            shortcuts = profiles[current_profile]["shortcuts"]
-            if shortcut_index < len(shortcuts):
-                process_sequence(shortcuts[shortcut_index])
+        elif not profile_menu and not profile.volume:
+            if shortcut_index < len(profile.shortcuts):
+                if not player.play(profile.shortcuts[shortcut_index]):
+                    print("Shortcut queue full")
 
     # --- Rotate encoder to change volume or select shortcut/profile ---
-    if new_position != encoder_last_position:
-        profile = profiles[current_profile]
+    if delta:
         if profile_menu:
-            if new_position > encoder_last_position:
-                current_profile = (current_profile + 1) % len(profiles)
-            else:
-                current_profile = (current_profile - 1) % len(profiles)
-            encoder_last_position = new_position
-            display_message("Profile Menu", profiles[current_profile]["display_name"])
+            current_profile = (current_profile + delta) % len(profiles)
+            display_message("Profile Menu", profiles[current_profile].display_name)
             profile_last_action = now
 
-        elif not profile.get("volume", True):
-            if new_position > encoder_last_position:
-                shortcut_index = (shortcut_index + 1) % len(profile["shortcuts"])
-            else:
-                shortcut_index = (shortcut_index - 1) % len(profile["shortcuts"])
-            encoder_last_position = new_position
-            display_message(profile["display_name"], f"Option {shortcut_index + 1}")
+        elif not profile.volume:
+            shortcut_index = (shortcut_index + delta) % len(profile.shortcuts)
+            display_message(profile.display_name, f"Option {shortcut_index + 1}")
         else:
-            if new_position > encoder_last_position:
-                macropad.consumer_control.send(macropad.ConsumerControlCode.VOLUME_INCREMENT)
-            else:
-                macropad.consumer_control.send(macropad.ConsumerControlCode.VOLUME_DECREMENT)
-            encoder_last_position = new_position
+            # Sent one at a time by the report task
+            volume_steps.add(delta * encoder.multiplier)
 
-    # --- Handle key events + tones ---
-    if key_event and not profile_menu and profiles[current_profile].get("keys"):
-        key = key_event.key_number
+    # --- Handle every queued key event; the report task sends one report per tick ---
+    events = macropad.keys.events
+    while events.get_into(key_event):
         if key_event.pressed:
-            if key in profiles[current_profile]["keys"]:
-                macropad.keyboard.press(profiles[current_profile]["keys"][key])
-                if key < len(tones):
-                    macropad.pixels[key] = colorwheel(int(255 / 12) * key)
-                    macropad.start_tone(tones[key])
-        elif key_event.released:
-            macropad.keyboard.release_all()
-            macropad.pixels.fill((0, 0, 0))
-            macropad.stop_tone()
-4556645
+            press_key(key_event.key_number)
+        else:
+            release_key(key_event.key_number)
+    if events.overflowed:
+        # Lost events: start again from nothing held rather than leave keys stuck
+        events.clear()
+        macropad.keys.reset()
+        release_all_keys()
+
+# --- Tasks ---
+async def poll_input():
+    rate = Rate(input_rate)
+    while True:
+        poll()
+        await rate.wait()
+
+async def send_reports():
+    rate = Rate(report_rate)
+    while True:
+        player.update()
+        step = volume_steps.take()
+        if step:
+            hid.consumer.send(macropad.ConsumerControlCode.VOLUME_INCREMENT if step > 0
+                              else macropad.ConsumerControlCode.VOLUME_DECREMENT)
+        hid.send()
+        await rate.wait()
+
+async def update_leds():
+    rate = Rate(led_rate)
+    while True:
+        frame.show()
+        await rate.wait()
+
+def start_display():
+    global text
+    from text_display import TextDisplay
+    text = TextDisplay(macropad.display, lines=1, max_fps=display_fps)  # Labels built once
+
+boot.later("display", start_display)
+
+async def update_display():
+    global pending_text, pending_rotation
+    rate = Rate(display_rate)
+    slowest = 0
+    # Deferred setup, one piece per step; keys and HID are already running
+    while boot.run_later():
+        await rate.wait()
+    while True:
+        if pending_text is not None:
+            text.show(*pending_text)
+            pending_text = None
+        if pending_rotation is not None:
+            text.rotation = pending_rotation  # Redraws with the latest text
+            pending_rotation = None
+        text.refresh()
+        if text.max_redraw_ms > slowest:
+            slowest = text.max_redraw_ms
+            print("Display redraw {:.1f} ms (slowest so far)".format(slowest))
+        await rate.wait()
+
+async def watch_profiles():
+    global profiles, current_profile, shortcut_index
+    rate = Rate(profile_check_rate)
+    while True:
+        if profile_file.check():
+            # Keycodes may have moved: let go of everything held under the old tables
+            player.stop()
+            release_all_keys()
+            profiles = profile_file.profiles
+            current_profile = min(current_profile, len(profiles) - 1)
+            shortcut_index = 0
+            print("Loaded", len(profiles), "profiles from", PROFILE_FILE)
+            if not profile_menu:
+                load_profile(current_profile)
+        elif profile_file.error:
+            print("Profile file not loaded:", profile_file.error)
+            profile_file.error = None
+        await rate.wait()
+
+boot.done()  # Prints where the startup time went
+run(poll_input(), send_reports(), update_leds(), update_display(), watch_profiles())
@@ -0,0 +1,8 @@
+"""Host-side simulation of the boards the scripts in this repo run on.
+
+Stand-ins for the CircuitPython hardware modules live in ``sim/stubs`` and
+are only importable while :meth:`Simulation.run` is executing a script.
+"""
+from sim.clock import SimulationEnd, VirtualClock
+from sim.harness import CostModel, Simulation
+from sim.recorder import Event, Recorder
@@ -0,0 +1,45 @@
+"""Run one script in the simulator and print what the hardware saw.
+
+    python -m sim Wii_Nunchuck.py --duration 5
+"""
+import argparse
+
+from sim import Simulation
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m sim", description=__doc__.splitlines()[0])
+    parser.add_argument("script", help="script path, relative to the repo root")
+    parser.add_argument("--duration", type=float, default=5.0, help="virtual seconds to run")
+    parser.add_argument("--boot", help="boot.py-style script to run first")
+    parser.add_argument("--echo", action="store_true", help="show the script's console output")
+    parser.add_argument("--sd", action="store_true", help="insert an empty SD card")
+    parser.add_argument("--startup", action="store_true",
+                        help="list each import with its own and total cost")
+    args = parser.parse_args()
+
+    sim = Simulation(duration=args.duration, echo=args.echo)
+    # Idle I2C parts so any script finds what it expects on the bus
+    sim.nunchuk()
+    sim.lis3dh()
+    if args.sd:
+        sim.sd_card()
+    sim.run(args.script, boot=args.boot)
+
+    print("ran {:.3f}s of virtual time".format(sim.clock.now()))
+    for (kind, source), count in sorted(sim.recorder.counts().items(), key=str):
+        print("  {:8} {:20} {:7d}".format(kind, str(source), count))
+    for name, value in sim.loop_stats().items():
+        print("  {:16} {}".format(name, value))
+    startup = sim.startup_stats()
+    for name in ("main_loop", "first_hid"):
+        value = startup[name]
+        print("  {:16} {}".format(name, "-" if value is None else "{:.1f} ms".format(value * 1000)))
+    if args.startup:
+        print("imports (ms: own, including what it imported):")
+        for module, own, total in startup["imports"]:
+            print("  {:36} {:7.1f} {:7.1f}".format(module, own * 1000, total * 1000))
+
+
+if __name__ == "__main__":
+    main()
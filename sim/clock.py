@@ -0,0 +1,73 @@
+"""Deterministic virtual clock and the ``time`` module stand-in driven by it."""
+import time as _host_time
+import types
+
+# CircuitPython's time.time() counts from 2000-01-01 on boards without an RTC
+_EPOCH_2000 = 946684800
+
+
+class SimulationEnd(BaseException):
+    """Raised out of the running script once the virtual clock reaches its end.
+
+    Derived from BaseException so a script's ``except Exception`` / ``except
+    OSError`` handlers cannot swallow it.
+    """
+
+
+class VirtualClock:
+    """Integer-nanosecond clock that only moves when something advances it."""
+
+    def __init__(self, end=None):
+        self.ns = 0
+        self.end_ns = None if end is None else int(round(end * 1e9))
+
+    def now(self):
+        return self.ns / 1e9
+
+    def advance(self, seconds):
+        if seconds > 0:
+            self.advance_to_ns(self.ns + int(round(seconds * 1e9)))
+
+    def advance_to_ns(self, ns):
+        if ns > self.ns:
+            self.ns = ns
+        if self.end_ns is not None and self.ns >= self.end_ns:
+            self.ns = self.end_ns
+            raise SimulationEnd()
+
+    def make_time_module(self, call_cost=0.0):
+        """Build a ``time`` module whose clock is this one.
+
+        Every ``monotonic()`` call is charged ``call_cost`` seconds so busy
+        loops without a ``sleep()`` still make progress.
+        """
+        clock = self
+        module = types.ModuleType("time")
+
+        def monotonic():
+            clock.advance(call_cost)
+            return clock.ns / 1e9
+
+        def monotonic_ns():
+            clock.advance(call_cost)
+            return clock.ns
+
+        def sleep(seconds):
+            if seconds < 0:
+                raise ValueError("sleep length must be non-negative")
+            clock.advance(seconds)
+
+        def time():
+            return _EPOCH_2000 + clock.ns // 1000000000
+
+        def localtime(secs=None):
+            return _host_time.gmtime(time() if secs is None else secs)
+
+        module.monotonic = monotonic
+        module.monotonic_ns = monotonic_ns
+        module.sleep = sleep
+        module.time = time
+        module.localtime = localtime
+        module.mktime = _host_time.mktime
+        module.struct_time = _host_time.struct_time
+        return module
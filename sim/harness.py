@@ -0,0 +1,539 @@
+"""Run the repo's CircuitPython scripts unmodified on a host against stand-in hardware."""
+import ast
+import builtins
+import contextlib
+import importlib.machinery
+import io
+import os
+import random
+import sys
+import tempfile
+from time import perf_counter
+
+from sim import runtime
+from sim.clock import SimulationEnd, VirtualClock
+from sim.peripherals import LIS3DHModel, NunchukModel
+from sim.recorder import Recorder
+from sim.signals import as_signal
+from sim.stats import percentile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUB_DIR = os.path.join(REPO_ROOT, "sim", "stubs")
+LIB_DIR = os.path.join(REPO_ROOT, "lib")
+
+
+class CostModel:
+    """Modelled time, in seconds, that simulated hardware operations take.
+
+    Pass keyword overrides to change any of them for one simulation.
+    """
+
+    call = 20e-6              # interpreter overhead charged per monotonic()/input read
+    hid_interval = 0.008      # usb_hid endpoint bInterval; send_report blocks on a pending report
+    neopixel_bit = 1.25e-6    # 800 kHz WS2812 bit time
+    neopixel_latch = 300e-6   # minimum gap between two show() calls
+    touch_read = 0.0005       # one capacitive measurement
+    display_build = 0.004     # building a text group of labels
+    display_label = 0.0008    # laying out one label's text (creating it or setting .text)
+    display_refresh = 0.025   # full 128x64 OLED redraw
+    console_byte = 2e-6       # USB CDC console write, per byte
+    fs_op = 0.0005            # stat/listdir/open on the filesystem
+    storage_byte = 1e-6       # reading or writing one byte of a file
+    import_source_byte = 2e-6  # compiling a lib/*.py module on import, per byte of source
+    # Importing a library shipped as .mpy (stubs not listed are built into the firmware)
+    import_library = {
+        "adafruit_macropad": 0.12,
+        "adafruit_hid.keyboard": 0.015,
+        "adafruit_hid.keycode": 0.02,
+        "adafruit_hid.keyboard_layout_us": 0.015,
+        "adafruit_hid.consumer_control": 0.008,
+        "adafruit_hid.consumer_control_code": 0.005,
+        "adafruit_hid.mouse": 0.008,
+        "adafruit_display_text.label": 0.03,
+        "adafruit_debouncer": 0.01,
+        "adafruit_lis3dh": 0.03,
+        "adafruit_motor.servo": 0.01,
+        "adafruit_nunchuk": 0.01,
+        "adafruit_sdcard": 0.02,
+        "asyncio": 0.04,
+        "neopixel": 0.01,
+    }
+    macropad_init = 0.03      # MacroPad() bring-up, on top of the display redraw it does
+    i2s_init = 0.01           # starting an I2SOut peripheral
+
+    def __init__(self, **overrides):
+        for name, value in overrides.items():
+            if not hasattr(CostModel, name):
+                raise TypeError("unknown cost: " + name)
+            setattr(self, name, value)
+
+    def i2c(self, count, frequency):
+        # address byte + data, 9 bit times each (ack included), plus start/stop
+        return ((count + 1) * 9 + 2) / frequency
+
+
+class _Console:
+    """stdout replacement: print() goes out through the console serial port."""
+
+    def __init__(self, sim):
+        self._sim = sim
+
+    def write(self, text):
+        # print() waits for room in the console's USB buffer
+        self._sim.console_port.write(text.encode(), None)
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+class _SerialPort:
+    """A USB CDC port's transmit buffer, emptied by the host at ``Simulation.serial_rate``.
+
+    Bytes written to a port nobody has open are thrown away by the console
+    and wait in the buffer on the data port, like CircuitPython's.
+    """
+
+    size = 256      # TinyUSB's CDC transmit FIFO
+
+    def __init__(self, sim, name, drop_disconnected):
+        self._sim = sim
+        self.name = name
+        self._drop = drop_disconnected
+        self._level = 0.0
+        self._updated = 0
+        self._line = b""
+
+    def waiting(self):
+        """Bytes still in the buffer."""
+        sim = self._sim
+        now = sim.clock.ns
+        if sim.serial_connected:
+            if sim.serial_rate is None:
+                self._level = 0.0
+            else:
+                self._level = max(0.0, self._level - (now - self._updated) / 1e9 * sim.serial_rate)
+        self._updated = now
+        return self._level
+
+    def write(self, data, timeout):
+        """Queue ``data``, waiting up to ``timeout`` seconds (None: forever) for room; bytes taken."""
+        sim = self._sim
+        data = bytes(data)
+        if self._drop and not sim.serial_connected:
+            taken = len(data)
+        else:
+            deadline = None if timeout is None else sim.clock.ns + int(timeout * 1e9)
+            taken = 0
+            while True:
+                room = int(self.size - self.waiting())
+                count = min(room, len(data) - taken)
+                if count > 0:
+                    self._level += count
+                    taken += count
+                if taken == len(data) or (deadline is not None and sim.clock.ns >= deadline):
+                    break
+                if not sim.serial_connected or not sim.serial_rate:
+                    # Nothing will make room: wait out the timeout
+                    sim.clock.advance_to_ns(sim.clock.end_ns if deadline is None else deadline)
+                    continue
+                need = min(len(data) - taken, self.size) - room
+                wait_ns = max(1000, int(need / sim.serial_rate * 1e9))
+                if deadline is not None:
+                    wait_ns = min(wait_ns, deadline - sim.clock.ns)
+                sim.clock.advance_to_ns(sim.clock.ns + wait_ns)
+        if taken:
+            self._record(data[:taken])
+        sim.clock.advance(taken * sim.cost.console_byte)
+        return taken
+
+    def _record(self, data):
+        sim = self._sim
+        if self.name != "console":
+            sim.recorder.record("cdc", self.name, data)
+            return
+        # Console text becomes one ``print`` event per line, however it was written
+        self._line += data
+        while b"\n" in self._line:
+            line, self._line = self._line.split(b"\n", 1)
+            line = line.decode("utf-8", "replace").rstrip("\r")
+            sim.recorder.record("print", "console", line)
+            if sim.echo:
+                sys.__stdout__.write("[{:9.4f}] {}\n".format(sim.clock.now(), line))
+
+
+class _SimFile:
+    """File wrapper that charges storage time for every byte moved."""
+
+    def __init__(self, sim, f):
+        self._sim = sim
+        self._f = f
+
+    def _charge(self, count):
+        self._sim.clock.advance(count * self._sim.cost.storage_byte)
+
+    def read(self, *args):
+        data = self._f.read(*args)
+        self._charge(len(data))
+        return data
+
+    def readinto(self, buffer):
+        count = self._f.readinto(buffer)
+        self._charge(count or 0)
+        return count
+
+    def write(self, data):
+        self._charge(len(data))
+        return self._f.write(data)
+
+    def __iter__(self):
+        for line in self._f:
+            self._charge(len(line))
+            yield line
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._f.close()
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+
+def _instrument(tree):
+    """Insert ``__sim_iteration__()`` at the top of the script's main ``while True`` loop."""
+    loops = [
+        node for node in tree.body
+        if isinstance(node, ast.While) and isinstance(node.test, ast.Constant) and node.test.value is True
+    ]
+    if loops:
+        body = loops[-1].body
+        marker = ast.Expr(ast.Call(ast.Name("__sim_iteration__", ast.Load()), [], []))
+        ast.copy_location(marker, body[0])
+        body.insert(0, marker)
+        ast.fix_missing_locations(tree)
+    return tree
+
+
+def _stub_names():
+    names = set()
+    for entry in os.listdir(STUB_DIR):
+        if entry.endswith(".py"):
+            names.add(entry[:-3])
+        elif os.path.isfile(os.path.join(STUB_DIR, entry, "__init__.py")):
+            names.add(entry)
+    return names
+
+
+class _TimedLoader(importlib.machinery.SourceFileLoader):
+    """Charges the modelled cost of importing a stub or lib module and records it."""
+
+    def __init__(self, sim, name, path):
+        super().__init__(name, path)
+        self._sim = sim
+
+    def exec_module(self, module):
+        sim = self._sim
+        name = module.__name__
+        if self.path.startswith(LIB_DIR):
+            cost = len(self.get_data(self.path)) * sim.cost.import_source_byte
+        else:
+            cost = sim.cost.import_library.get(name, 0.0)
+        event = sim.recorder.record("import", name, cost)
+        sim.clock.advance(cost)
+        super().exec_module(module)
+        # end includes the modules this one imported in turn
+        event.end = sim.clock.now()
+
+
+class _ImportTimer:
+    """sys.meta_path finder that times imports of stub and lib modules."""
+
+    def __init__(self, sim):
+        self._sim = sim
+
+    def find_spec(self, name, path=None, target=None):
+        spec = importlib.machinery.PathFinder.find_spec(name, path or [STUB_DIR, LIB_DIR])
+        if spec is None or not isinstance(spec.loader, importlib.machinery.SourceFileLoader):
+            return None
+        if not spec.origin.startswith((STUB_DIR, LIB_DIR)):
+            return None
+        spec.loader = _TimedLoader(self._sim, name, spec.origin)
+        return spec
+
+
+class Simulation:
+    """One simulated board: inputs, peripherals, a virtual clock and a recorder.
+
+    Configure inputs and peripherals, then :meth:`run` a script. The script
+    runs until ``duration`` seconds of virtual time have passed.
+    """
+
+    def __init__(self, duration=10.0, cost=None, drive=None, echo=False):
+        self.clock = VirtualClock(end=duration)
+        self.recorder = Recorder(self.clock)
+        self.cost = cost or CostModel()
+        self.echo = echo
+        self.drive = drive
+        self.inputs = {}
+        self.i2c_devices = {}
+        self.hid_devices = None
+        self.sd_dir = None
+        self.mounts = {}
+        self.seed = 0   # random is seeded with this before the script runs, so runs repeat
+        self.iterations = []
+        self.iteration_host_times = []
+        self.task_steps = {}
+        self.ended = False
+        # USB serial: host read rate in bytes/s (None: instantly) and whether a port is open
+        self.serial_rate = None
+        self.serial_connected = True
+        self.cdc_data = False
+        self.console_port = _SerialPort(self, "console", drop_disconnected=True)
+        self.data_port = _SerialPort(self, "data", drop_disconnected=False)
+        self._hid_busy = {}
+        self._last_show = {}
+
+    # --- Configuration ---
+    def set_input(self, name, signal):
+        """Drive input ``name`` (a board pin name) with a value or a function of time."""
+        self.inputs[name] = as_signal(signal)
+
+    def attach_i2c(self, peripheral, address=None):
+        self.i2c_devices[peripheral.address if address is None else address] = peripheral
+        return peripheral
+
+    def nunchuk(self, **signals):
+        return self.attach_i2c(NunchukModel(**signals))
+
+    def lis3dh(self, **signals):
+        """Attach a LIS3DH; its INT1 output drives ``ACCELEROMETER_INTERRUPT``."""
+        model = self.attach_i2c(LIS3DHModel(**signals))
+        self.set_input("ACCELEROMETER_INTERRUPT", model.int1)
+        return model
+
+    def add_file(self, path, data):
+        """Create ``path`` (CIRCUITPY-absolute, e.g. ``/1.wav``) on the simulated drive."""
+        full = self.host_path(path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with io.open(full, "wb") as f:
+            f.write(data)
+
+    def sd_card(self, directory=None):
+        """Insert an SD card whose contents live in host ``directory``."""
+        self.sd_dir = directory or tempfile.mkdtemp(prefix="sim-sd-")
+        return self.sd_dir
+
+    # --- Used by the stand-in modules ---
+    def read_input(self, name, default):
+        self.clock.advance(self.cost.call)
+        signal = self.inputs.get(name)
+        return default if signal is None else signal(self.clock.now())
+
+    def i2c_write(self, address, data, frequency):
+        device = self._i2c_device(address)
+        self.recorder.record("i2c", address, ("w", bytes(data)))
+        self.clock.advance(self.cost.i2c(len(data), frequency))
+        device.write(bytes(data), self.clock.now())
+
+    def i2c_read(self, address, count, frequency):
+        device = self._i2c_device(address)
+        data = device.read(count, self.clock.now())
+        self.recorder.record("i2c", address, ("r", data))
+        self.clock.advance(self.cost.i2c(count, frequency))
+        return data
+
+    def _i2c_device(self, address):
+        device = self.i2c_devices.get(address)
+        if device is None:
+            raise OSError(19, "No such device")
+        return device
+
+    def hid_send(self, device, report):
+        # send_report() waits while the previous report is still queued, then
+        # the new one is collected at the next host poll of the endpoint
+        busy = self._hid_busy.get(device.name, 0)
+        if self.clock.ns < busy:
+            self.clock.advance_to_ns(busy)
+        interval = int(round(self.cost.hid_interval * 1e9))
+        collected = (self.clock.ns // interval + 1) * interval
+        self._hid_busy[device.name] = collected
+        self.recorder.record("hid", device.name, bytes(report), end_ns=collected)
+
+    def pixels_show(self, name, data):
+        gap = int(round(self.cost.neopixel_latch * 1e9))
+        last = self._last_show.get(name)
+        if last is not None and self.clock.ns < last + gap:
+            self.clock.advance_to_ns(last + gap)
+        wire = int(round(len(data) * 8 * self.cost.neopixel_bit * 1e9))
+        self.recorder.record("pixels", name, bytes(data), end_ns=self.clock.ns + wire)
+        self.clock.advance_to_ns(self.clock.ns + wire)
+        self._last_show[name] = self.clock.ns
+
+    def task_step(self, name):
+        """An asyncio task was resumed (called by the asyncio stand-in)."""
+        self.task_steps.setdefault(name, []).append(self.clock.ns / 1e9)
+
+    def host_path(self, path):
+        """Map a CIRCUITPY-absolute path onto the host directory backing it."""
+        if self.drive is None:
+            self.drive = tempfile.mkdtemp(prefix="sim-drive-")
+        path = path.replace("\\", "/")
+        for mount, directory in sorted(self.mounts.items(), key=lambda m: -len(m[0])):
+            if path == mount or path.startswith(mount + "/"):
+                return os.path.join(directory, path[len(mount):].lstrip("/"))
+        return os.path.join(self.drive, path.lstrip("/"))
+
+    def mount(self, path):
+        if self.sd_dir is None:
+            raise OSError(5, "no SD card")
+        self.mounts[path.rstrip("/")] = self.sd_dir
+
+    def unmount(self, path):
+        self.mounts.pop(path.rstrip("/"), None)
+
+    # --- Running ---
+    def run(self, script, boot=None):
+        """Run ``boot`` (if given) then ``script`` until the virtual clock ends."""
+        with self._installed():
+            random.seed(self.seed)
+            try:
+                if boot:
+                    self._exec(boot)
+                self._exec(script)
+            except SimulationEnd:
+                self.ended = True
+        return self
+
+    def _mark_iteration(self):
+        self.iterations.append(self.clock.ns / 1e9)
+        self.iteration_host_times.append(perf_counter())
+
+    def _exec(self, script):
+        path = script if os.path.isabs(script) else os.path.join(REPO_ROOT, script)
+        with io.open(path, encoding="utf-8") as f:
+            source = f.read()
+        code = compile(_instrument(ast.parse(source, path)), path, "exec")
+        namespace = {
+            "__name__": "__main__",
+            "__file__": path,
+            "__builtins__": builtins,
+            "__sim_iteration__": self._mark_iteration,
+        }
+        exec(code, namespace)
+
+    @contextlib.contextmanager
+    def _installed(self):
+        if self.drive is None:
+            self.drive = tempfile.mkdtemp(prefix="sim-drive-")
+        stubs = _stub_names() | {"time"}
+        saved_modules = {
+            name: module for name, module in sys.modules.items()
+            if name.split(".")[0] in stubs
+        }
+        for name in saved_modules:
+            del sys.modules[name]
+        sys.modules["time"] = self.clock.make_time_module(self.cost.call)
+        saved_path = list(sys.path)
+        sys.path[:0] = [STUB_DIR, LIB_DIR]
+        import_timer = _ImportTimer(self)
+        sys.meta_path.insert(0, import_timer)
+        saved_cwd = os.getcwd()
+        os.chdir(self.drive)
+        saved_fs = self._patch_filesystem()
+        runtime.active = self
+        try:
+            with contextlib.redirect_stdout(_Console(self)):
+                yield
+        finally:
+            runtime.active = None
+            for name, value in saved_fs:
+                if name == "open":
+                    builtins.open = value
+                else:
+                    setattr(os, name, value)
+            os.chdir(saved_cwd)
+            sys.path[:] = saved_path
+            sys.meta_path.remove(import_timer)
+            for name, module in list(sys.modules.items()):
+                origin = getattr(module, "__file__", None) or ""
+                if (name.split(".")[0] in stubs or origin.startswith(STUB_DIR)
+                        or origin.startswith(LIB_DIR)):
+                    del sys.modules[name]
+            sys.modules.update(saved_modules)
+
+    def _patch_filesystem(self):
+        """Point absolute paths used by the script at the simulated drive."""
+        sim = self
+        real_open = builtins.open
+        saved = [("open", real_open)]
+
+        def remap(path):
+            if isinstance(path, str) and path.startswith("/"):
+                return sim.host_path(path)
+            return path
+
+        def sim_open(file, mode="r", *args, **kwargs):
+            sim.clock.advance(sim.cost.fs_op)
+            f = real_open(remap(file), mode, *args, **kwargs)
+            return _SimFile(sim, f) if "b" in mode else f
+
+        def wrap(func):
+            def wrapper(*args, **kwargs):
+                sim.clock.advance(sim.cost.fs_op)
+                if args:
+                    args = (remap(args[0]),) + args[1:]
+                return func(*args, **kwargs)
+            return wrapper
+
+        builtins.open = sim_open
+        for name in ("stat", "listdir", "remove", "mkdir", "rmdir"):
+            real = getattr(os, name)
+            saved.append((name, real))
+            setattr(os, name, wrap(real))
+
+        real_rename = os.rename
+        saved.append(("rename", real_rename))
+        os.rename = lambda old, new: real_rename(remap(old), remap(new))
+        return saved
+
+    # --- Results ---
+    def loop_stats(self):
+        """Main-loop iteration count, virtual period percentiles and host CPU cost."""
+        times = self.iterations
+        periods = [b - a for a, b in zip(times, times[1:])]
+        host = [b - a for a, b in zip(self.iteration_host_times, self.iteration_host_times[1:])]
+        return {
+            "iterations": len(times),
+            "period_mean": sum(periods) / len(periods) if periods else None,
+            "period_p50": percentile(periods, 50),
+            "period_p99": percentile(periods, 99),
+            "host_cost_mean": sum(host) / len(host) if host else None,
+        }
+
+    def startup_stats(self):
+        """Virtual time to the main loop (first iteration or task step) and to the first HID report."""
+        starts = [times[0] for times in self.task_steps.values() if times]
+        if self.iterations:
+            starts.append(self.iterations[0])
+        hid = self.recorder.events("hid")
+        return {
+            "main_loop": min(starts) if starts else None,
+            "first_hid": hid[0].end if hid else None,
+            "imports": [(e.source, e.data, e.end - e.t) for e in self.recorder.events("import")],
+        }
+
+    def task_stats(self):
+        """Per asyncio task: steps run, rate in Hz and period percentiles between steps."""
+        stats = {}
+        for name, times in self.task_steps.items():
+            periods = [b - a for a, b in zip(times, times[1:])]
+            span = times[-1] - times[0]
+            stats[name] = {
+                "steps": len(times),
+                "rate": (len(times) - 1) / span if span else None,
+                "period_p50": percentile(periods, 50),
+                "period_p99": percentile(periods, 99),
+            }
+        return stats
@@ -0,0 +1,119 @@
+"""Parse HID report descriptors and decode input reports the way a host does.
+
+Only the short items a simple input-only device uses are understood: global
+usage page / logical range / report size, count and ID, local usages and
+usage ranges, collections and Input main items. Anything else raises
+ValueError, as would a descriptor the host refuses to enumerate.
+"""
+
+
+class Field:
+    """One input value: where it sits in the report and what it means."""
+
+    def __init__(self, report_id, usage_page, usage, offset, size, logical_min, logical_max,
+                 constant=False):
+        self.report_id = report_id
+        self.usage_page = usage_page
+        self.usage = usage
+        self.offset = offset          # in bits, after the report ID byte
+        self.size = size
+        self.logical_min = logical_min
+        self.logical_max = logical_max
+        self.constant = constant
+
+    def __repr__(self):
+        return "<Field page={:#04x} usage={:#04x} bits {}+{}>".format(
+            self.usage_page, self.usage, self.offset, self.size)
+
+
+def _signed(value, size):
+    bits = size * 8
+    return value - (1 << bits) if size and value >> (bits - 1) else value
+
+
+def parse(descriptor):
+    """Input fields of ``descriptor`` and the length in bytes of each report ID."""
+    fields = []
+    bits = {}
+    usage_page = 0
+    logical_min = logical_max = 0
+    report_size = report_count = 0
+    report_id = 0
+    usages = []
+    usage_min = None
+    depth = 0
+    i = 0
+    while i < len(descriptor):
+        prefix = descriptor[i]
+        if prefix == 0xFE:
+            raise ValueError("long items are not supported")
+        size = (0, 1, 2, 4)[prefix & 0x03]
+        if i + 1 + size > len(descriptor):
+            raise ValueError("descriptor truncated at byte {}".format(i))
+        value = int.from_bytes(descriptor[i + 1:i + 1 + size], "little")
+        tag = prefix & 0xFC
+        i += 1 + size
+
+        if tag == 0x04:
+            usage_page = value
+        elif tag == 0x14:
+            logical_min = _signed(value, size)
+        elif tag == 0x24:
+            logical_max = _signed(value, size) if logical_min < 0 else value
+        elif tag == 0x74:
+            report_size = value
+        elif tag == 0x94:
+            report_count = value
+        elif tag == 0x84:
+            if not 0 < value < 256:
+                raise ValueError("bad report ID {}".format(value))
+            report_id = value
+        elif tag == 0x08:
+            usages.append(value)
+        elif tag == 0x18:
+            usage_min = value
+        elif tag == 0x28:
+            if usage_min is None:
+                raise ValueError("usage maximum without usage minimum")
+            usages.extend(range(usage_min, value + 1))
+            usage_min = None
+        elif tag == 0xA0:
+            depth += 1
+            usages = []
+        elif tag == 0xC0:
+            depth -= 1
+            if depth < 0:
+                raise ValueError("end collection without collection")
+        elif tag == 0x80:
+            constant = bool(value & 0x01)
+            offset = bits.get(report_id, 0)
+            for n in range(report_count):
+                usage = usages[min(n, len(usages) - 1)] if usages else 0
+                fields.append(Field(report_id, usage_page, usage, offset + n * report_size,
+                                    report_size, logical_min, logical_max, constant))
+            bits[report_id] = offset + report_count * report_size
+            usages = []
+        elif tag in (0x90, 0xB0):
+            usages = []   # output/feature items carry no input data
+        else:
+            raise ValueError("unsupported item {:#04x}".format(prefix))
+    if depth:
+        raise ValueError("unterminated collection")
+    for rid, count in bits.items():
+        if count % 8:
+            raise ValueError("report {} is {} bits, not whole bytes".format(rid, count))
+    return fields, {rid: count // 8 for rid, count in bits.items()}
+
+
+def decode(fields, report, report_id=0):
+    """``{(usage_page, usage): value}`` for one input report (without its ID byte)."""
+    value = int.from_bytes(bytes(report), "little")
+    values = {}
+    for field in fields:
+        if field.report_id != report_id or field.constant:
+            continue
+        raw = (value >> field.offset) & ((1 << field.size) - 1)
+        if field.logical_min < 0 and raw >> (field.size - 1):
+            raw -= 1 << field.size
+        values[(field.usage_page, field.usage)] = raw
+    return values
@@ -0,0 +1,124 @@
+"""Turn ``lib/ringlog.py`` binary frames from ``usb_cdc.data`` back into log lines.
+
+    python -m sim.logdecode /dev/ttyACM1        # a live data port (Linux/macOS)
+    python -m sim.logdecode capture.bin         # bytes saved from one
+
+From Python, feed bytes as they arrive (a simulation's ``cdc`` events, or
+a serial port) and get ``(ticks_ms, level, text)`` records back:
+
+    decoder = Decoder()
+    for event in sim.recorder.events("cdc", "data"):
+        for ticks, level, text in decoder.feed(event.data):
+            ...
+
+Bytes that aren't a valid frame (a reader that joined mid-frame, a lost
+packet) are skipped up to the next sync byte with a good checksum.
+Records whose format hasn't been defined yet are shown with their
+arguments.
+"""
+import argparse
+import struct
+import sys
+
+SYNC = 0xA5
+DEFINE = 0
+ARG_INT = 0x69
+ARG_FLOAT = 0x66
+ARG_TEXT = 0x73
+LEVEL_NAMES = {10: "DEBUG", 20: "INFO", 30: "WARNING", 40: "ERROR"}
+
+
+def _args(payload, pos):
+    args = []
+    while pos < len(payload):
+        kind = payload[pos]
+        if kind == ARG_INT:
+            args.append(struct.unpack_from("<i", payload, pos + 1)[0])
+            pos += 5
+        elif kind == ARG_FLOAT:
+            args.append(struct.unpack_from("<f", payload, pos + 1)[0])
+            pos += 5
+        elif kind == ARG_TEXT:
+            count = payload[pos + 1]
+            args.append(payload[pos + 2:pos + 2 + count].decode("utf-8", "replace"))
+            pos += 2 + count
+        else:
+            raise ValueError("unknown argument type 0x{:02x}".format(kind))
+    return args
+
+
+class Decoder:
+    """Incremental frame decoder; keeps the formats the device has defined."""
+
+    def __init__(self):
+        self.formats = {}
+        self.skipped = 0    # bytes thrown away while resynchronising
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """Add received bytes; returns the complete records among them."""
+        buffer = self._buffer
+        buffer.extend(data)
+        records = []
+        while True:
+            start = buffer.find(bytes((SYNC,)))
+            if start < 0:
+                self.skipped += len(buffer)
+                buffer.clear()
+                break
+            if start:
+                self.skipped += start
+                del buffer[:start]
+            if len(buffer) < 2 or len(buffer) < buffer[1] + 3:
+                break   # Wait for the rest of the frame
+            length = buffer[1]
+            payload = bytes(buffer[2:2 + length])
+            if length < 6 or sum(payload) & 0xFF != buffer[2 + length]:
+                self.skipped += 1
+                del buffer[:1]
+                continue
+            del buffer[:length + 3]
+            try:
+                record = self._record(payload)
+            except (ValueError, IndexError, struct.error):
+                self.skipped += length + 3
+                continue
+            if record is not None:
+                records.append(record)
+        return records
+
+    def _record(self, payload):
+        level, ticks, msg = struct.unpack_from("<BIB", payload)
+        args = _args(payload, 6)
+        if level == DEFINE:
+            self.formats[msg] = args[0]
+            return None
+        text = self.formats.get(msg)
+        if text is None:
+            text = "#{} {}".format(msg, args)
+        else:
+            try:
+                text = text.format(*args)
+            except (IndexError, ValueError):
+                text = "{} {}".format(text, args)
+        return ticks, level, text
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m sim.logdecode",
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="serial device or capture file")
+    args = parser.parse_args()
+    decoder = Decoder()
+    with open(args.path, "rb", buffering=0) as port:
+        while True:
+            data = port.read(256)
+            if not data:
+                break
+            for ticks, level, text in decoder.feed(data):
+                print("{:10.3f} {:7} {}".format(ticks / 1000, LEVEL_NAMES.get(level, level), text))
+                sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Register-level models of the I2C parts the scripts talk to."""
+import struct
+
+from sim.signals import as_signal
+
+
+class NunchukModel:
+    """Wii Nunchuk at 0x52 in unencrypted mode.
+
+    Writing register 0x00 latches a sample; the following read returns the
+    6-byte report (joystick X/Y, accel X/Y/Z high bits, low bits + buttons)
+    laid out the way ``adafruit_nunchuk`` decodes it.
+    """
+
+    address = 0x52
+
+    def __init__(self, joystick=(128, 128), acceleration=(512, 512, 512), c=False, z=False):
+        self.joystick = as_signal(joystick)
+        self.acceleration = as_signal(acceleration)
+        self.c = as_signal(c)
+        self.z = as_signal(z)
+        self._report = bytes(6)
+
+    def write(self, data, t):
+        if data[:1] == b"\x00":
+            self._report = self.sample(t)
+
+    def read(self, count, t):
+        return (self._report + bytes(count))[:count]
+
+    def sample(self, t):
+        jx, jy = self.joystick(t)
+        ax, ay, az = (max(0, min(1023, int(v))) for v in self.acceleration(t))
+        low = ((ax & 3) << 6) | ((ay & 3) << 4) | ((az & 3) << 2)
+        if not self.c(t):
+            low |= 0x02
+        if not self.z(t):
+            low |= 0x01
+        return bytes((int(jx) & 0xFF, int(jy) & 0xFF, ax >> 2, ay >> 2, az >> 2, low))
+
+
+class LIS3DHModel:
+    """LIS3DH accelerometer at 0x18; ``acceleration`` is a signal in g.
+
+    Samples are taken at the output data rate set in CTRL_REG1. In bypass
+    mode reading OUT_X_L returns the acceleration at the time of the read;
+    with the FIFO enabled (CTRL_REG5 FIFO_EN, FIFO_CTRL_REG mode) up to 32
+    samples queue up and a burst read from OUT_X_L pops one per 6 bytes,
+    the register address wrapping back to OUT_X_L after OUT_Z_H. Single
+    clicks are detected on the high-passed acceleration of the axes enabled
+    in CLICK_CFG. A click stays in CLICK_SRC until it is read only with
+    CLICK_THS's LIR_Click bit set; otherwise it lasts the TIME_LATENCY
+    window (at least one sample), as on the chip. :meth:`int1` is the INT1
+    pin level for the sources routed to it in CTRL_REG3 (click, data ready,
+    FIFO watermark and overrun).
+    """
+
+    address = 0x18
+
+    WHO_AM_I = 0x0F
+    CTRL_REG1 = 0x20
+    CTRL_REG3 = 0x22
+    CTRL_REG4 = 0x23
+    CTRL_REG5 = 0x24
+    OUT_X_L = 0x28
+    FIFO_CTRL_REG = 0x2E
+    FIFO_SRC_REG = 0x2F
+    CLICK_CFG = 0x38
+    CLICK_SRC = 0x39
+    CLICK_THS = 0x3A
+    TIME_LATENCY = 0x3C
+    FIFO_SIZE = 32
+    # Counts per g for each CTRL_REG4 full-scale setting (left-aligned 16-bit)
+    DIVIDERS = (16380, 8190, 4096, 1365)
+    FULL_SCALE_G = (2, 4, 8, 16)
+    # Output data rate in Hz for each CTRL_REG1 ODR code
+    ODR_HZ = (0, 1, 10, 25, 50, 100, 200, 400, 1600, 1344)
+
+    def __init__(self, acceleration=(0.0, 0.0, 1.0)):
+        self.acceleration = as_signal(acceleration)
+        self.registers = bytearray(0x40)
+        self.registers[self.WHO_AM_I] = 0x33
+        self.fifo = []
+        self.samples_read = 0
+        self._pointer = 0
+        self._next_sample = None
+        self._previous = None   # high-pass baseline for click detection
+        self._above = False
+        self._click_until = None    # When an unlatched click clears itself
+        self._data_ready = False
+
+    def write(self, data, t):
+        self.update(t)
+        self._pointer = data[0] & 0x7F
+        for offset, value in enumerate(data[1:]):
+            self.registers[(self._pointer + offset) & 0x3F] = value
+        if len(data) > 1 and not self._fifo_mode():
+            self.fifo.clear()   # Bypass mode empties the FIFO
+
+    def read(self, count, t):
+        self.update(t)
+        if self._pointer == self.OUT_X_L:
+            return self._read_samples(count, t)
+        if self._pointer == self.FIFO_SRC_REG:
+            return bytes((self._fifo_src(),)) + bytes(count - 1)
+        if self._pointer == self.CLICK_SRC:
+            value = self.registers[self.CLICK_SRC]
+            self.registers[self.CLICK_SRC] = 0  # Cleared by reading it
+            self._click_until = None
+            return bytes((value,)) + bytes(count - 1)
+        start = self._pointer
+        return bytes(self.registers[(start + i) & 0x3F] for i in range(count))
+
+    def int1(self, t):
+        """INT1 pin level at ``t``."""
+        self.update(t)
+        routed = self.registers[self.CTRL_REG3]
+        level = len(self.fifo)
+        threshold = self.registers[self.FIFO_CTRL_REG] & 0x1F
+        return bool(
+            (routed & 0x80 and self.registers[self.CLICK_SRC] & 0x40)
+            or (routed & 0x10 and self._data_ready)
+            or (routed & 0x04 and level > threshold)
+            or (routed & 0x02 and level >= self.FIFO_SIZE)
+        )
+
+    def update(self, t):
+        """Take the samples due by ``t`` at the output data rate."""
+        code = self.registers[self.CTRL_REG1] >> 4
+        rate = self.ODR_HZ[code] if code < len(self.ODR_HZ) else 0
+        if not rate:
+            self._next_sample = None
+            return
+        if self._next_sample is None:
+            self._next_sample = t + 1 / rate
+        if self._next_sample > t:
+            return
+        self._data_ready = True
+        mode = self._fifo_mode()
+        if not mode and not self.registers[self.CLICK_CFG] & 0x3F:
+            # Nothing keeps the samples: just move on to the next one due
+            self._next_sample += (int((t - self._next_sample) * rate) + 1) / rate
+            return
+        while self._next_sample <= t:
+            if self._click_until is not None and self._next_sample >= self._click_until:
+                self.registers[self.CLICK_SRC] = 0
+                self._click_until = None
+            g = self.acceleration(self._next_sample)
+            if self._detect_click(g) and not self.registers[self.CLICK_THS] & 0x80:
+                latency = max(1, self.registers[self.TIME_LATENCY])
+                self._click_until = self._next_sample + latency / rate
+            if mode == 1 and len(self.fifo) >= self.FIFO_SIZE:
+                pass    # FIFO mode: stops when full
+            elif mode:
+                self.fifo.append(self._pack(g))
+                if len(self.fifo) > self.FIFO_SIZE:
+                    del self.fifo[0]    # Stream mode: the oldest sample is overwritten
+            self._next_sample += 1 / rate
+
+    def sample(self, t):
+        return self._pack(self.acceleration(t))
+
+    def _pack(self, g):
+        divider = self.DIVIDERS[(self.registers[self.CTRL_REG4] >> 4) & 0x03]
+        raw = [max(-32768, min(32767, int(round(v * divider)))) for v in g]
+        return struct.pack("<hhh", *raw)
+
+    def _fifo_mode(self):
+        if not self.registers[self.CTRL_REG5] & 0x40:
+            return 0
+        return self.registers[self.FIFO_CTRL_REG] >> 6
+
+    def _fifo_src(self):
+        level = len(self.fifo)
+        value = min(level, 31)
+        if level > self.registers[self.FIFO_CTRL_REG] & 0x1F:
+            value |= 0x80   # WTM
+        if level >= self.FIFO_SIZE:
+            value |= 0x40   # OVRN_FIFO
+        if not level:
+            value |= 0x20   # EMPTY
+        return value
+
+    def _read_samples(self, count, t):
+        self._data_ready = False
+        if not self._fifo_mode():
+            self.samples_read += 1
+            return (self.sample(t) * (count // 6 + 1))[:count]
+        out = b""
+        while len(out) < count:
+            if self.fifo:
+                out += self.fifo.pop(0)
+                self.samples_read += 1
+            else:
+                out += self.sample(t)   # Empty FIFO: the current output registers
+        return out[:count]
+
+    def _detect_click(self, g):
+        # High-pass: the change from a slowly following baseline, so a tap and
+        # the return from it make one click, and a steady tilt none. True for
+        # a new click.
+        baseline = self._previous
+        if baseline is None:
+            self._previous = list(g)
+            return False
+        full_scale = self.FULL_SCALE_G[(self.registers[self.CTRL_REG4] >> 4) & 0x03]
+        threshold = (self.registers[self.CLICK_THS] & 0x7F) * full_scale / 128
+        enabled = self.registers[self.CLICK_CFG]
+        above = False
+        clicked = False
+        for axis in range(3):
+            change = g[axis] - baseline[axis]
+            baseline[axis] += change / 8
+            if threshold and enabled & (1 << (2 * axis)) and abs(change) > threshold:
+                if not self._above and not self.registers[self.CLICK_SRC] & 0x40:
+                    # IA, single click, the axis, and the sign of the change
+                    self.registers[self.CLICK_SRC] = (
+                        0x40 | 0x10 | (1 << axis) | (0x08 if change < 0 else 0))
+                    clicked = True
+                above = True
+        self._above = above
+        return clicked
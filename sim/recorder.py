@@ -0,0 +1,50 @@
+"""Timestamped log of everything the simulated hardware was asked to do."""
+
+
+class Event:
+    """One recorded hardware operation.
+
+    ``t`` is when the script issued it and ``end`` is when it finished on the
+    wire (for HID this is the host poll that collected the report).
+    """
+
+    __slots__ = ("t", "end", "kind", "source", "data")
+
+    def __init__(self, t, end, kind, source, data):
+        self.t = t
+        self.end = end
+        self.kind = kind
+        self.source = source
+        self.data = data
+
+    def __repr__(self):
+        return "Event({:.6f}, {!r}, {!r}, {!r})".format(self.t, self.kind, self.source, self.data)
+
+
+class Recorder:
+    """Collects :class:`Event` records in the order they happen."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.log = []
+
+    def record(self, kind, source, data=None, end_ns=None):
+        t = self.clock.ns / 1e9
+        end = t if end_ns is None else end_ns / 1e9
+        event = Event(t, end, kind, source, data)
+        self.log.append(event)
+        return event
+
+    def events(self, kind=None, source=None):
+        return [
+            e for e in self.log
+            if (kind is None or e.kind == kind) and (source is None or e.source == source)
+        ]
+
+    def counts(self):
+        """Number of events per ``(kind, source)`` pair."""
+        totals = {}
+        for e in self.log:
+            key = (e.kind, e.source)
+            totals[key] = totals.get(key, 0) + 1
+        return totals
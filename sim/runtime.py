@@ -0,0 +1,9 @@
+"""Handle the stand-in modules use to reach the simulation that is running them."""
+
+active = None
+
+
+def current():
+    if active is None:
+        raise RuntimeError("hardware stand-ins can only be used inside Simulation.run()")
+    return active
@@ -0,0 +1,32 @@
+"""Input waveforms: plain functions of virtual time used to drive pins and sensors."""
+import bisect
+
+
+def constant(value):
+    return lambda t: value
+
+
+def as_signal(value):
+    """Wrap a plain value as a constant signal; callables pass through."""
+    return value if callable(value) else constant(value)
+
+
+def steps(points, initial=None):
+    """Piecewise-constant signal from ``[(t, value), ...]`` sorted by time."""
+    times = [p[0] for p in points]
+    values = [p[1] for p in points]
+
+    def signal(t):
+        i = bisect.bisect_right(times, t)
+        return initial if i == 0 else values[i - 1]
+
+    return signal
+
+
+def pulses(starts, width, on=True, off=False):
+    """``on`` for ``width`` seconds from each start time, ``off`` otherwise."""
+    points = []
+    for start in sorted(starts):
+        points.append((start, on))
+        points.append((start + width, off))
+    return steps(points, initial=off)
@@ -0,0 +1,10 @@
+"""Small summary statistics shared by the harness and the benchmarks."""
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values``; ``None`` when empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
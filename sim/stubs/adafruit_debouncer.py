@@ -0,0 +1,40 @@
+"""Stand-in for ``adafruit_debouncer``."""
+import time
+
+
+class Debouncer:
+    def __init__(self, io_or_predicate, interval=0.010):
+        if hasattr(io_or_predicate, "value"):
+            self.function = lambda: io_or_predicate.value
+        else:
+            self.function = io_or_predicate
+        self.interval = interval
+        self._state = bool(self.function())
+        self._unstable = self._state
+        self._changed_at = time.monotonic()
+        self._rose = False
+        self._fell = False
+
+    def update(self, new_state=None):
+        now = time.monotonic()
+        self._rose = self._fell = False
+        current = bool(self.function() if new_state is None else new_state)
+        if current != self._unstable:
+            self._unstable = current
+            self._changed_at = now
+        elif current != self._state and now - self._changed_at >= self.interval:
+            self._state = current
+            self._rose = current
+            self._fell = not current
+
+    @property
+    def value(self):
+        return self._state
+
+    @property
+    def rose(self):
+        return self._rose
+
+    @property
+    def fell(self):
+        return self._fell
@@ -0,0 +1,30 @@
+"""Stand-in for ``adafruit_display_text.label``.
+
+Creating a Label or assigning its ``text`` lays the glyphs out again, even
+if the text is the same, and costs ``CostModel.display_label``.
+"""
+from displayio import Group
+from sim import runtime
+
+_sim = runtime.current()
+
+
+class Label(Group):
+    def __init__(self, font, *, text="", color=0xFFFFFF, scale=1, x=0, y=0,
+                 line_spacing=1.25, anchor_point=None, anchored_position=None, **kwargs):
+        super().__init__(scale=scale, x=x, y=y)
+        self.font = font
+        self.color = color
+        self.line_spacing = line_spacing
+        self.anchor_point = anchor_point
+        self.anchored_position = anchored_position
+        self.text = text
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        _sim.clock.advance(_sim.cost.display_label)
+        self._text = str(value)
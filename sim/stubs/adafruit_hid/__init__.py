@@ -0,0 +1,8 @@
+"""Stand-in for the ``adafruit_hid`` library."""
+
+
+def find_device(devices, *, usage_page, usage, timeout=None):
+    for device in devices:
+        if device.usage_page == usage_page and device.usage == usage:
+            return device
+    raise ValueError("Could not find matching HID device.")
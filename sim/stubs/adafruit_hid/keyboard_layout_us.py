@@ -0,0 +1,47 @@
+"""Stand-in for ``adafruit_hid.keyboard_layout_us``."""
+import time
+
+from .keycode import Keycode
+
+_SHIFT = 0x80
+_UNSHIFTED = "\n\t -=[]\\;'`,./"
+_UNSHIFTED_CODES = (0x28, 0x2B, 0x2C, 0x2D, 0x2E, 0x2F, 0x30, 0x31, 0x33, 0x34, 0x35, 0x36, 0x37, 0x38)
+_SHIFTED = '_+{}|:"~<>?'
+_SHIFTED_CODES = (0x2D, 0x2E, 0x2F, 0x30, 0x31, 0x33, 0x34, 0x35, 0x36, 0x37, 0x38)
+_SHIFTED_DIGITS = "!@#$%^&*()"
+
+
+def _ascii_keycode(char):
+    if "a" <= char <= "z":
+        return Keycode.A + ord(char) - ord("a")
+    if "A" <= char <= "Z":
+        return (Keycode.A + ord(char) - ord("A")) | _SHIFT
+    if "1" <= char <= "9":
+        return Keycode.ONE + ord(char) - ord("1")
+    if char == "0":
+        return Keycode.ZERO
+    if char in _SHIFTED_DIGITS:
+        return (Keycode.ONE + _SHIFTED_DIGITS.index(char)) | _SHIFT
+    if char in _UNSHIFTED:
+        return _UNSHIFTED_CODES[_UNSHIFTED.index(char)]
+    if char in _SHIFTED:
+        return _SHIFTED_CODES[_SHIFTED.index(char)] | _SHIFT
+    raise ValueError("No keycode available for character {!r}.".format(char))
+
+
+class KeyboardLayoutUS:
+    def __init__(self, keyboard):
+        self.keyboard = keyboard
+
+    def write(self, string, delay=None):
+        for char in string:
+            self.keyboard.press(*self.keycodes(char))
+            self.keyboard.release_all()
+            if delay:
+                time.sleep(delay)
+
+    def keycodes(self, char):
+        code = _ascii_keycode(char)
+        if code & _SHIFT:
+            return (Keycode.LEFT_SHIFT, code & ~_SHIFT)
+        return (code,)
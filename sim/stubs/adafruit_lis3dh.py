@@ -0,0 +1,103 @@
+"""Stand-in for ``adafruit_lis3dh`` talking to the simulated LIS3DH registers."""
+import struct
+from collections import namedtuple
+
+from adafruit_bus_device.i2c_device import I2CDevice
+
+STANDARD_GRAVITY = 9.806
+
+RANGE_16_G = 0b11
+RANGE_8_G = 0b10
+RANGE_4_G = 0b01
+RANGE_2_G = 0b00
+
+DATARATE_1344_HZ = 0b1001
+DATARATE_400_HZ = 0b0111
+DATARATE_200_HZ = 0b0110
+DATARATE_100_HZ = 0b0101
+DATARATE_50_HZ = 0b0100
+DATARATE_25_HZ = 0b0011
+DATARATE_10_HZ = 0b0010
+DATARATE_1_HZ = 0b0001
+DATARATE_POWERDOWN = 0
+DATARATE_LOWPOWER_1K6HZ = 0b1000
+DATARATE_LOWPOWER_5KHZ = 0b1001
+
+_REG_WHOAMI = 0x0F
+_REG_CTRL1 = 0x20
+_REG_CTRL3 = 0x22
+_REG_CTRL4 = 0x23
+_REG_CTRL5 = 0x24
+_REG_OUT_X_L = 0x28
+
+AccelerationTuple = namedtuple("acceleration", ("x", "y", "z"))
+
+_DIVIDERS = {RANGE_2_G: 16380, RANGE_4_G: 8190, RANGE_8_G: 4096, RANGE_16_G: 1365}
+
+
+class LIS3DH:
+    def __init__(self, int1=None, int2=None):
+        device_id = self._read_register_byte(_REG_WHOAMI)
+        if device_id != 0x33:
+            raise RuntimeError("Failed to find LIS3DH!")
+        # Enable all axes, normal mode, 400 Hz, high resolution with BDU
+        self._write_register_byte(_REG_CTRL1, 0x07)
+        self.data_rate = DATARATE_400_HZ
+        self._write_register_byte(_REG_CTRL4, 0x88)
+        # DRDY on INT1, latched interrupts
+        self._write_register_byte(_REG_CTRL3, 0x10)
+        self._write_register_byte(_REG_CTRL5, 0x08)
+        self._int1 = int1
+        self._int2 = int2
+
+    @property
+    def data_rate(self):
+        return (self._read_register_byte(_REG_CTRL1) >> 4) & 0x0F
+
+    @data_rate.setter
+    def data_rate(self, rate):
+        ctl1 = self._read_register_byte(_REG_CTRL1)
+        ctl1 = (ctl1 & ~0xF0) | (rate << 4)
+        self._write_register_byte(_REG_CTRL1, ctl1)
+
+    @property
+    def range(self):
+        return (self._read_register_byte(_REG_CTRL4) >> 4) & 0x03
+
+    @range.setter
+    def range(self, range_value):
+        ctl4 = self._read_register_byte(_REG_CTRL4)
+        ctl4 = (ctl4 & ~0x30) | (range_value << 4)
+        self._write_register_byte(_REG_CTRL4, ctl4)
+
+    @property
+    def acceleration(self):
+        divider = _DIVIDERS[self.range]
+        x, y, z = struct.unpack("<hhh", self._read_register(_REG_OUT_X_L | 0x80, 6))
+        x = (x / divider) * STANDARD_GRAVITY
+        y = (y / divider) * STANDARD_GRAVITY
+        z = (z / divider) * STANDARD_GRAVITY
+        return AccelerationTuple(x, y, z)
+
+
+class LIS3DH_I2C(LIS3DH):
+    def __init__(self, i2c, *, address=0x18, int1=None, int2=None):
+        self._i2c = I2CDevice(i2c, address)
+        self._buffer = bytearray(6)
+        super().__init__(int1=int1, int2=int2)
+
+    def _read_register(self, register, length):
+        self._buffer[0] = register & 0xFF
+        with self._i2c as i2c:
+            i2c.write(self._buffer, start=0, end=1)
+            i2c.readinto(self._buffer, start=0, end=length)
+            return self._buffer[:length]
+
+    def _read_register_byte(self, register):
+        return self._read_register(register, 1)[0]
+
+    def _write_register_byte(self, register, value):
+        self._buffer[0] = register & 0xFF
+        self._buffer[1] = value & 0xFF
+        with self._i2c as i2c:
+            i2c.write(self._buffer, start=0, end=2)
@@ -0,0 +1,178 @@
+"""Stand-in for ``adafruit_macropad``.
+
+Inputs: ``KEY1``..``KEY12`` and ``BUTTON`` (encoder switch) are active-low pin
+levels, ``ENCODER_A`` is the encoder position.
+"""
+import board
+import digitalio
+import keypad
+import neopixel
+import rotaryio
+import time
+import usb_hid
+from adafruit_debouncer import Debouncer
+from adafruit_hid.consumer_control import ConsumerControl
+from adafruit_hid.consumer_control_code import ConsumerControlCode
+from adafruit_hid.keyboard import Keyboard
+from adafruit_hid.keyboard_layout_us import KeyboardLayoutUS
+from adafruit_hid.keycode import Keycode
+from adafruit_hid.mouse import Mouse
+from sim import runtime
+
+_sim = runtime.current()
+
+
+def _texts(group):
+    """The text shown by a group of labels (or a display_text() group), title first."""
+    if group is None:
+        return ()
+    if isinstance(group, _TextDisplay):
+        return (group.title,) + tuple(line.text for line in group)
+    return tuple(getattr(layer, "text", "") for layer in group)
+
+
+class _Display:
+    """The 128x64 OLED; any change to what is shown costs a full refresh."""
+
+    width = 128
+    height = 64
+
+    def __init__(self):
+        self._rotation = 0
+        self._root_group = None
+        self.auto_refresh = True
+
+    @property
+    def rotation(self):
+        return self._rotation
+
+    @rotation.setter
+    def rotation(self, value):
+        # Rotating redraws straight away, auto_refresh or not
+        self._rotation = value
+        self.refresh()
+
+    @property
+    def root_group(self):
+        return self._root_group
+
+    @root_group.setter
+    def root_group(self, group):
+        self._root_group = group
+        if self.auto_refresh:
+            self.refresh()
+
+    def show(self, group):
+        self.root_group = group
+
+    def refresh(self, *, target_frames_per_second=None, minimum_frames_per_second=0):
+        _sim.recorder.record("display", "oled", (self._rotation, _texts(self._root_group)))
+        _sim.clock.advance(_sim.cost.display_refresh)
+        return True
+
+
+class _Line:
+    def __init__(self):
+        self.text = ""
+
+
+class _TextDisplay:
+    def __init__(self, display, title):
+        # A fresh group of labels every call: recorded so rebuilds can be counted
+        _sim.recorder.record("display", "build", title)
+        _sim.clock.advance(_sim.cost.display_build)
+        self._display = display
+        self._lines = [_Line() for _ in range(5)]
+        self.title = title
+
+    def __getitem__(self, index):
+        return self._lines[index]
+
+    def __len__(self):
+        return len(self._lines)
+
+    def show(self):
+        self._display.show(self)
+
+
+class MacroPad:
+    Keycode = Keycode
+    ConsumerControlCode = ConsumerControlCode
+    Mouse = Mouse
+
+    def __init__(self, rotation=0, midi_in_channel=1, midi_out_channel=1,
+                 layout_class=KeyboardLayoutUS, keycode_class=Keycode):
+        _sim.clock.advance(_sim.cost.macropad_init)
+        self._layout_class = layout_class
+        self.Keycode = keycode_class
+        self.display = _Display()
+        self.display.rotation = rotation
+        self.pixels = neopixel.NeoPixel(board.NEOPIXEL, 12, brightness=0.5)
+        self.keys = keypad.Keys(
+            [getattr(board, "KEY%d" % (i + 1)) for i in range(12)],
+            value_when_pressed=False, pull=True,
+        )
+        self._encoder = rotaryio.IncrementalEncoder(board.ENCODER_A, board.ENCODER_B)
+        self._encoder_switch = digitalio.DigitalInOut(board.BUTTON)
+        self._encoder_switch.switch_to_input(pull=digitalio.Pull.UP)
+        self._debounced_switch = Debouncer(lambda: not self._encoder_switch.value)
+        self._speaker_enable = digitalio.DigitalInOut(board.SPEAKER_ENABLE)
+        self._speaker_enable.switch_to_output(value=False)
+        self._keyboard = None
+        self._keyboard_layout = None
+        self._consumer_control = None
+        self._mouse = None
+
+    @property
+    def encoder(self):
+        return self._encoder.position
+
+    @property
+    def encoder_switch(self):
+        return not self._encoder_switch.value
+
+    @property
+    def encoder_switch_debounced(self):
+        self._debounced_switch.pressed = self._debounced_switch.rose
+        self._debounced_switch.released = self._debounced_switch.fell
+        return self._debounced_switch
+
+    @property
+    def keyboard(self):
+        if self._keyboard is None:
+            self._keyboard = Keyboard(usb_hid.devices)
+        return self._keyboard
+
+    @property
+    def keyboard_layout(self):
+        if self._keyboard_layout is None:
+            self._keyboard_layout = self._layout_class(self.keyboard)
+        return self._keyboard_layout
+
+    @property
+    def consumer_control(self):
+        if self._consumer_control is None:
+            self._consumer_control = ConsumerControl(usb_hid.devices)
+        return self._consumer_control
+
+    @property
+    def mouse(self):
+        if self._mouse is None:
+            self._mouse = Mouse(usb_hid.devices)
+        return self._mouse
+
+    def display_text(self, title=None, title_scale=1, title_length=80, text_scale=1, font=None):
+        return _TextDisplay(self.display, title)
+
+    def start_tone(self, frequency):
+        self._speaker_enable.value = True
+        _sim.recorder.record("audio", "speaker", ("tone", frequency))
+
+    def stop_tone(self):
+        self._speaker_enable.value = False
+        _sim.recorder.record("audio", "speaker", ("stop",))
+
+    def play_tone(self, frequency, duration):
+        self.start_tone(frequency)
+        time.sleep(duration)
+        self.stop_tone()
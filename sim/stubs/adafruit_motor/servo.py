@@ -0,0 +1,39 @@
+"""Stand-in for ``adafruit_motor.servo``."""
+
+
+class Servo:
+    def __init__(self, pwm_out, *, actuation_range=180, min_pulse=750, max_pulse=2250):
+        self._pwm_out = pwm_out
+        self.actuation_range = actuation_range
+        self._min_duty = int((min_pulse * pwm_out.frequency) / 1000000 * 0xFFFF)
+        self._duty_range = int((max_pulse * pwm_out.frequency) / 1000000 * 0xFFFF) - self._min_duty
+        self._angle = None
+
+    @property
+    def fraction(self):
+        if self._pwm_out.duty_cycle == 0:
+            return None
+        return (self._pwm_out.duty_cycle - self._min_duty) / self._duty_range
+
+    @fraction.setter
+    def fraction(self, value):
+        if value is None:
+            self._pwm_out.duty_cycle = 0
+            return
+        if not 0.0 <= value <= 1.0:
+            raise ValueError("Must be 0.0 to 1.0")
+        self._pwm_out.duty_cycle = self._min_duty + int(value * self._duty_range)
+
+    @property
+    def angle(self):
+        return self._angle
+
+    @angle.setter
+    def angle(self, new_angle):
+        if new_angle is None:
+            self.fraction = None
+        elif new_angle < 0 or new_angle > self.actuation_range:
+            raise ValueError("Angle out of range")
+        else:
+            self.fraction = new_angle / self.actuation_range
+        self._angle = new_angle
@@ -0,0 +1,79 @@
+"""Stand-in for ``adafruit_nunchuk``.
+
+Mirrors the library: every property access does its own register read, so
+``nc.buttons.C`` and ``nc.buttons.Z`` are two separate I2C transactions.
+"""
+import time
+from collections import namedtuple
+
+from adafruit_bus_device.i2c_device import I2CDevice
+
+_I2C_INIT_DELAY = 0.1
+
+_Values = namedtuple("_Values", ("joystick", "buttons", "acceleration"))
+_Joystick = namedtuple("_Joystick", ("x", "y"))
+_Buttons = namedtuple("_Buttons", ("C", "Z"))
+_Acceleration = namedtuple("_Acceleration", ("x", "y", "z"))
+
+
+class Nunchuk:
+    def __init__(self, i2c, address=0x52, i2c_read_delay=0.002):
+        self.buffer = bytearray(8)
+        self.i2c_device = I2CDevice(i2c, address)
+        self._i2c_read_delay = i2c_read_delay
+        time.sleep(_I2C_INIT_DELAY)
+        with self.i2c_device as i2c_dev:
+            # turn off encrypted data
+            i2c_dev.write(b"\xF0\x55")
+            time.sleep(_I2C_INIT_DELAY)
+            i2c_dev.write(b"\xFB\x00")
+
+    @property
+    def values(self):
+        self._read_data()
+        return _Values(
+            self._joystick(do_read=False),
+            self._buttons(do_read=False),
+            self._acceleration(do_read=False),
+        )
+
+    @property
+    def joystick(self):
+        return self._joystick()
+
+    @property
+    def buttons(self):
+        return self._buttons()
+
+    @property
+    def acceleration(self):
+        return self._acceleration()
+
+    def _joystick(self, do_read=True):
+        if do_read:
+            self._read_data()
+        return _Joystick(self.buffer[0], self.buffer[1])
+
+    def _buttons(self, do_read=True):
+        if do_read:
+            self._read_data()
+        return _Buttons(not bool(self.buffer[5] & 0x02), not bool(self.buffer[5] & 0x01))
+
+    def _acceleration(self, do_read=True):
+        if do_read:
+            self._read_data()
+        return _Acceleration(
+            ((self.buffer[5] & 0xC0) >> 6) | (self.buffer[2] << 2),
+            ((self.buffer[5] & 0x30) >> 4) | (self.buffer[3] << 2),
+            ((self.buffer[5] & 0x0C) >> 2) | (self.buffer[4] << 2),
+        )
+
+    def _read_data(self):
+        return self._read_register(b"\x00")
+
+    def _read_register(self, address):
+        with self.i2c_device as i2c:
+            i2c.write(address)
+            time.sleep(self._i2c_read_delay)
+            i2c.readinto(self.buffer)
+        return self.buffer
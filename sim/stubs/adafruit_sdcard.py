@@ -0,0 +1,12 @@
+"""Stand-in for ``adafruit_sdcard``; succeeds only once the simulation has a card."""
+from sim import runtime
+
+_sim = runtime.current()
+
+
+class SDCard:
+    def __init__(self, spi, cs, baudrate=1320000):
+        if _sim.sd_dir is None:
+            raise OSError("no SD card")
+        self.spi = spi
+        self.cs = cs
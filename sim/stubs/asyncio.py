@@ -0,0 +1,249 @@
+"""Stand-in for CircuitPython's ``asyncio``, scheduled on the virtual clock.
+
+Tasks run one step at a time, earliest wake-up first; waiting for the next
+wake-up advances the virtual clock to it, so ``await asyncio.sleep()`` costs
+no host time. Every step is recorded against the task's coroutine name for
+:meth:`sim.Simulation.task_stats`.
+"""
+import heapq
+import types
+
+from sim import runtime
+
+_sim = runtime.current()
+
+
+class CancelledError(BaseException):
+    pass
+
+
+class TimeoutError(Exception):
+    pass
+
+
+@types.coroutine
+def sleep_ms(t):
+    # The wake-up time is fixed when sleep is called, like the real core
+    yield ("sleep", _sim.clock.ns + int(t * 1000000))
+
+
+@types.coroutine
+def sleep(t):
+    yield ("sleep", _sim.clock.ns + int(t * 1000000000))
+
+
+class Task:
+    def __init__(self, coro):
+        self.coro = coro
+        self.name = getattr(coro, "__qualname__", None) or type(coro).__name__
+        self.data = None
+        self._done = False
+        self._result = None
+        self._exception = None
+        self._waiters = []
+        self._waiting = False
+
+    def done(self):
+        return self._done
+
+    def cancel(self):
+        if self._done:
+            return False
+        _loop.schedule(self, _sim.clock.ns, throw=CancelledError())
+        return True
+
+    def __await__(self):
+        if not self._done:
+            yield ("wait", self)
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    __iter__ = __await__
+
+    def __repr__(self):
+        return "<Task {}>".format(self.name)
+
+
+class Event:
+    def __init__(self):
+        self.state = False
+        self._waiters = []
+
+    def is_set(self):
+        return self.state
+
+    def set(self):
+        self.state = True
+        for task in self._waiters:
+            _loop.schedule(task, _sim.clock.ns)
+        self._waiters = []
+
+    def clear(self):
+        self.state = False
+
+    @types.coroutine
+    def wait(self):
+        if not self.state:
+            yield ("event", self)
+        return True
+
+
+class Lock:
+    def __init__(self):
+        self._locked = False
+        self._event = Event()
+
+    def locked(self):
+        return self._locked
+
+    async def acquire(self):
+        while self._locked:
+            self._event.clear()
+            await self._event.wait()
+        self._locked = True
+        return True
+
+    def release(self):
+        self._locked = False
+        self._event.set()
+
+    async def __aenter__(self):
+        return await self.acquire()
+
+    async def __aexit__(self, *exc):
+        self.release()
+
+
+class _Loop:
+    def __init__(self):
+        self._queue = []
+        self._sequence = 0
+        self.current = None
+
+    def schedule(self, task, wake_ns, value=None, throw=None):
+        self._sequence += 1
+        heapq.heappush(self._queue, (wake_ns, self._sequence, task, value, throw))
+
+    def run_until_complete(self, main):
+        while not main.done():
+            if not self._queue:
+                # Everything is waiting on something that never comes: idle to the end
+                if _sim.clock.end_ns is None:
+                    raise RuntimeError("all tasks are blocked")
+                _sim.clock.advance_to_ns(_sim.clock.end_ns)
+            wake_ns, _, task, value, throw = heapq.heappop(self._queue)
+            if task.done():
+                continue
+            _sim.clock.advance_to_ns(wake_ns)
+            self._step(task, value, throw)
+        if main._exception is not None:
+            raise main._exception
+        return main._result
+
+    def _step(self, task, value, throw):
+        _sim.clock.advance(_sim.cost.call)
+        _sim.task_step(task.name)
+        self.current = task
+        try:
+            if throw is not None:
+                request = task.coro.throw(throw)
+            else:
+                request = task.coro.send(value)
+        except StopIteration as stop:
+            self._finish(task, stop.value, None)
+            return
+        except CancelledError as error:
+            self._finish(task, None, error)
+            return
+        except Exception as error:
+            if not task._waiters:
+                raise   # nobody will ever look at it; fail the simulation loudly
+            self._finish(task, None, error)
+            return
+        finally:
+            self.current = None
+
+        if request is None:
+            self.schedule(task, _sim.clock.ns)
+        elif request[0] == "sleep":
+            self.schedule(task, request[1])
+        elif request[0] == "wait":
+            request[1]._waiters.append(task)
+        elif request[0] == "event":
+            request[1]._waiters.append(task)
+        else:
+            raise RuntimeError("unknown request {!r}".format(request))
+
+    def _finish(self, task, result, exception):
+        task._done = True
+        task._result = result
+        task._exception = exception
+        for waiter in task._waiters:
+            self.schedule(waiter, _sim.clock.ns)
+        task._waiters = []
+
+    # CPython/CircuitPython-style loop API
+    def create_task(self, coro):
+        return create_task(coro)
+
+    def run_forever(self):
+        self.run_until_complete(Task(_forever()))
+
+
+_loop = _Loop()
+
+
+async def _forever():
+    while True:
+        await sleep(3600)
+
+
+def create_task(coro):
+    task = Task(coro)
+    _loop.schedule(task, _sim.clock.ns)
+    return task
+
+
+def current_task():
+    return _loop.current
+
+
+def get_event_loop():
+    return _loop
+
+
+def new_event_loop():
+    return _loop
+
+
+def run(coro):
+    return _loop.run_until_complete(create_task(coro))
+
+
+async def gather(*awaitables, return_exceptions=False):
+    tasks = [a if isinstance(a, Task) else create_task(a) for a in awaitables]
+    results = []
+    for task in tasks:
+        try:
+            results.append(await task)
+        except Exception as error:
+            if not return_exceptions:
+                raise
+            results.append(error)
+    return results
+
+
+async def wait_for(awaitable, timeout):
+    task = awaitable if isinstance(awaitable, Task) else create_task(awaitable)
+    deadline = _sim.clock.ns + int(timeout * 1e9)
+    while not task.done():
+        if _sim.clock.ns >= deadline:
+            task.cancel()
+            raise TimeoutError()
+        await sleep_ms(1)
+    return await task
+
+
+def wait_for_ms(awaitable, timeout):
+    return wait_for(awaitable, timeout / 1000)
@@ -0,0 +1,43 @@
+"""Stand-in for ``audiobusio``."""
+from sim import runtime
+
+_sim = runtime.current()
+
+
+class I2SOut:
+    def __init__(self, bit_clock, word_select, data, *, main_clock=None, left_justified=False):
+        _sim.clock.advance(_sim.cost.i2s_init)
+        self._source = None
+        self._loop = False
+        self._started = 0.0
+        self.paused = False
+
+    def play(self, sample, *, loop=False):
+        if hasattr(sample, "_start"):
+            sample._start()
+        _sim.recorder.record("audio", "i2s", ("play", type(sample).__name__))
+        self._source = sample
+        self._loop = loop
+        self._started = _sim.clock.now()
+
+    def stop(self):
+        _sim.recorder.record("audio", "i2s", ("stop",))
+        self._source = None
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    @property
+    def playing(self):
+        source = self._source
+        if source is None:
+            return False
+        if self._loop or not hasattr(source, "duration"):
+            return True
+        return _sim.clock.now() - self._started < source.duration
+
+    def deinit(self):
+        self._source = None
@@ -0,0 +1,69 @@
+"""Stand-in for ``audiocore``; samples only carry their format and duration.
+
+As on the board, a RawSample only exposes ``sample_rate``; its channel
+count and sample size are kept in ``_format`` for the mixer stand-in.
+
+Starting a WaveFile reads its first half-buffer from the file, as the board
+does before any sound comes out; a RawSample is already in RAM.
+"""
+import struct
+
+
+class WaveFile:
+    def __init__(self, file, buffer=None):
+        if isinstance(file, str):
+            file = open(file, "rb")
+        self._file = file
+        # Split in half for double buffering; two 256-byte halves by default
+        self._half = len(buffer) // 2 if buffer is not None else 256
+        header = file.read(12)
+        if header[0:4] != b"RIFF" or header[8:12] != b"WAVE":
+            raise ValueError("Invalid WAVE")
+        data_bytes = 0
+        while True:
+            chunk = file.read(8)
+            if len(chunk) < 8:
+                raise ValueError("Data chunk must follow fmt chunk")
+            chunk_id, size = struct.unpack("<4sI", chunk)
+            if chunk_id == b"fmt ":
+                fmt = file.read(size)
+                _, channels, rate, _, _, bits = struct.unpack("<HHIIHH", fmt[:16])
+            elif chunk_id == b"data":
+                data_bytes = size
+                self._data_offset = file.tell()
+                break
+            else:
+                file.seek(size, 1)
+        self.sample_rate = rate
+        self.channel_count = channels
+        self.bits_per_sample = bits
+        self._format = (rate, channels, bits)
+        self.duration = data_bytes / (rate * channels * bits // 8)
+
+    def _start(self):
+        self._file.seek(self._data_offset)
+        self._file.read(self._half)
+
+    def deinit(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.deinit()
+
+
+class RawSample:
+    def __init__(self, buffer, *, channel_count=1, sample_rate=8000, single_buffer=True):
+        self.buffer = buffer
+        self.sample_rate = sample_rate
+        self._format = (sample_rate, channel_count, 8 * getattr(buffer, "itemsize", 1))
+        frames = len(buffer) // channel_count
+        self.duration = frames / sample_rate
+
+    def _start(self):
+        pass
+
+    def deinit(self):
+        pass
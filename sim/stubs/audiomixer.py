@@ -0,0 +1,65 @@
+"""Stand-in for ``audiomixer``; mixer buffer allocations are recorded."""
+from sim import runtime
+
+_sim = runtime.current()
+
+
+class MixerVoice:
+    def __init__(self, mixer):
+        self._mixer = mixer
+        self._sample = None
+        self._loop = False
+        self._started = 0.0
+        self.level = 1.0
+
+    def play(self, sample, *, loop=False):
+        mixer = self._mixer
+        sample_rate, channel_count, bits_per_sample = sample._format
+        if sample_rate != mixer.sample_rate:
+            raise ValueError("The sample's sample rate does not match the mixer's")
+        if channel_count != mixer.channel_count:
+            raise ValueError("The sample's channel count does not match the mixer's")
+        if bits_per_sample != mixer.bits_per_sample:
+            raise ValueError("The sample's bits_per_sample does not match the mixer's")
+        sample._start()
+        _sim.recorder.record("audio", "voice", ("play", type(sample).__name__))
+        self._sample = sample
+        self._loop = loop
+        self._started = _sim.clock.now()
+
+    def stop(self):
+        _sim.recorder.record("audio", "voice", ("stop",))
+        self._sample = None
+
+    @property
+    def playing(self):
+        if self._sample is None:
+            return False
+        if self._loop:
+            return True
+        return _sim.clock.now() - self._started < self._sample.duration
+
+
+class Mixer:
+    def __init__(self, voice_count=2, buffer_size=1024, channel_count=2,
+                 bits_per_sample=16, samples_signed=True, sample_rate=8000):
+        self.sample_rate = sample_rate
+        self.channel_count = channel_count
+        self.bits_per_sample = bits_per_sample
+        self.samples_signed = samples_signed
+        self.voice = tuple(MixerVoice(self) for _ in range(voice_count))
+        # Two output buffers of buffer_size bytes each are allocated on the heap
+        _sim.recorder.record("audio", "mixer", ("alloc", 2 * buffer_size))
+
+    @property
+    def playing(self):
+        return any(voice.playing for voice in self.voice)
+
+    def play(self, sample, *, voice=0, loop=False):
+        self.voice[voice].play(sample, loop=loop)
+
+    def stop_voice(self, voice=0):
+        self.voice[voice].stop()
+
+    def deinit(self):
+        pass
@@ -0,0 +1,43 @@
+"""Stand-in for ``board``: any upper-case attribute is a pin of that name."""
+import busio
+
+board_id = "simulated"
+
+
+class Pin:
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return "board." + self.name
+
+
+_pins = {}
+_i2c = None
+_spi = None
+
+
+def __getattr__(name):
+    if name[:1].isupper():
+        pin = _pins.get(name)
+        if pin is None:
+            pin = _pins[name] = Pin(name)
+        return pin
+    raise AttributeError("module 'board' has no attribute '{}'".format(name))
+
+
+def I2C():
+    global _i2c
+    if _i2c is None:
+        _i2c = busio.I2C(__getattr__("SCL"), __getattr__("SDA"))
+    return _i2c
+
+
+STEMMA_I2C = I2C
+
+
+def SPI():
+    global _spi
+    if _spi is None:
+        _spi = busio.SPI(__getattr__("SCK"), __getattr__("MOSI"), __getattr__("MISO"))
+    return _spi
@@ -0,0 +1,69 @@
+"""Stand-in for ``busio``; I2C traffic goes to the simulation's peripheral models."""
+from sim import runtime
+
+_sim = runtime.current()
+
+
+class I2C:
+    def __init__(self, scl, sda, *, frequency=100000, timeout=255):
+        self.frequency = frequency
+        self._locked = False
+
+    def try_lock(self):
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self):
+        self._locked = False
+
+    def scan(self):
+        return sorted(_sim.i2c_devices)
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        _sim.i2c_write(address, memoryview(buffer)[start:end], self.frequency)
+
+    def readfrom_into(self, address, buffer, *, start=0, end=None):
+        end = len(buffer) if end is None else end
+        buffer[start:end] = _sim.i2c_read(address, end - start, self.frequency)
+
+    def writeto_then_readfrom(self, address, buffer_out, buffer_in, *,
+                              out_start=0, out_end=None, in_start=0, in_end=None):
+        self.writeto(address, buffer_out, start=out_start, end=out_end)
+        self.readfrom_into(address, buffer_in, start=in_start, end=in_end)
+
+    def deinit(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.deinit()
+
+
+class SPI:
+    def __init__(self, clock, MOSI=None, MISO=None):
+        self._locked = False
+
+    def try_lock(self):
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self):
+        self._locked = False
+
+    def configure(self, *, baudrate=100000, polarity=0, phase=0, bits=8):
+        pass
+
+    def write(self, buffer, *, start=0, end=None):
+        pass
+
+    def readinto(self, buffer, *, start=0, end=None, write_value=0):
+        pass
+
+    def deinit(self):
+        pass
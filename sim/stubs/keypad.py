@@ -0,0 +1,105 @@
+"""Stand-in for ``keypad``.
+
+Scanning happens "in the background": whenever the queue is looked at, the
+scanner catches up on every scan instant since the last look, so events carry
+the timestamp of the scan that saw them, as on the board.
+"""
+from sim import runtime
+
+_sim = runtime.current()
+
+
+class Event:
+    def __init__(self, key_number=0, pressed=True):
+        self.key_number = key_number
+        self.pressed = pressed
+        self.timestamp = 0
+
+    @property
+    def released(self):
+        return not self.pressed
+
+    def __eq__(self, other):
+        return (isinstance(other, Event) and self.key_number == other.key_number
+                and self.pressed == other.pressed)
+
+    def __repr__(self):
+        return "<Event: key_number {} {}>".format(
+            self.key_number, "pressed" if self.pressed else "released")
+
+
+class EventQueue:
+    def __init__(self, scanner, max_events):
+        self._scanner = scanner
+        self._events = []
+        self._max_events = max_events
+        self.overflowed = False
+
+    def _put(self, key_number, pressed, timestamp):
+        if len(self._events) >= self._max_events:
+            self.overflowed = True
+            return
+        event = Event(key_number, pressed)
+        event.timestamp = timestamp
+        self._events.append(event)
+
+    def get(self):
+        self._scanner._catch_up()
+        return self._events.pop(0) if self._events else None
+
+    def get_into(self, event):
+        self._scanner._catch_up()
+        if not self._events:
+            return False
+        queued = self._events.pop(0)
+        event.key_number = queued.key_number
+        event.pressed = queued.pressed
+        event.timestamp = queued.timestamp
+        return True
+
+    def clear(self):
+        self._events.clear()
+        self.overflowed = False
+
+    def __len__(self):
+        self._scanner._catch_up()
+        return len(self._events)
+
+    def __bool__(self):
+        return len(self) > 0
+
+
+class Keys:
+    def __init__(self, pins, *, value_when_pressed, pull=True, interval=0.02,
+                 max_events=64, debounce_threshold=1):
+        self._names = [pin.name for pin in pins]
+        self._value_when_pressed = bool(value_when_pressed)
+        self._idle = not value_when_pressed if pull else False
+        self._interval_ns = int(round(interval * 1e9))
+        self._state = [False] * len(pins)
+        self._next_scan = _sim.clock.ns
+        self.events = EventQueue(self, max_events)
+
+    @property
+    def key_count(self):
+        return len(self._names)
+
+    def _catch_up(self):
+        _sim.clock.advance(_sim.cost.call)
+        now = _sim.clock.ns
+        while self._next_scan <= now:
+            t = self._next_scan / 1e9
+            for i, name in enumerate(self._names):
+                signal = _sim.inputs.get(name)
+                level = self._idle if signal is None else bool(signal(t))
+                pressed = level == self._value_when_pressed
+                if pressed != self._state[i]:
+                    self._state[i] = pressed
+                    self.events._put(i, pressed, (self._next_scan // 1000000) & 0x1FFFFFFF)
+            self._next_scan += self._interval_ns
+
+    def reset(self):
+        self._state = [False] * len(self._names)
+
+    def deinit(self):
+        pass
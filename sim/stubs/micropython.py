@@ -0,0 +1,5 @@
+"""Stand-in for ``micropython``."""
+
+
+def const(value):
+    return value
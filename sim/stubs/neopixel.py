@@ -0,0 +1,76 @@
+"""Stand-in for ``neopixel``; each ``show()`` is recorded as a ``pixels`` event."""
+from sim import runtime
+
+_sim = runtime.current()
+
+RGB = "RGB"
+GRB = "GRB"
+RGBW = "RGBW"
+GRBW = "GRBW"
+
+
+class NeoPixel:
+    def __init__(self, pin, n, *, bpp=None, brightness=1.0, auto_write=True, pixel_order=None):
+        self.pin = pin
+        self.n = n
+        self.pixel_order = pixel_order or (GRB if bpp != 4 else GRBW)
+        self.bpp = len(self.pixel_order)
+        self._brightness = min(1.0, max(0.0, brightness))
+        self.auto_write = auto_write
+        self._pixels = [(0,) * self.bpp] * n
+
+    def _to_tuple(self, value):
+        if isinstance(value, int):
+            value = ((value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF)
+        value = tuple(int(v) for v in value)
+        if len(value) < self.bpp:
+            value = value + (0,) * (self.bpp - len(value))
+        return value[:self.bpp]
+
+    def __len__(self):
+        return self.n
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            for i, v in zip(range(*index.indices(self.n)), value):
+                self._pixels[i] = self._to_tuple(v)
+        else:
+            self._pixels[index] = self._to_tuple(value)
+        if self.auto_write:
+            self.show()
+
+    def __getitem__(self, index):
+        return self._pixels[index]
+
+    def fill(self, color):
+        self._pixels = [self._to_tuple(color)] * self.n
+        if self.auto_write:
+            self.show()
+
+    @property
+    def brightness(self):
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, value):
+        self._brightness = min(1.0, max(0.0, value))
+        if self.auto_write:
+            self.show()
+
+    def show(self):
+        # Reorder RGB(W) into the wire order and scale by brightness
+        order = ["RGBW".index(c) for c in self.pixel_order]
+        data = bytearray()
+        for pixel in self._pixels:
+            for i in order:
+                data.append(int(pixel[i] * self._brightness) & 0xFF)
+        _sim.pixels_show(self.pin.name, data)
+
+    def deinit(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.deinit()
@@ -0,0 +1,23 @@
+"""Stand-in for ``pwmio``; duty cycle writes are recorded as ``pwm`` events."""
+from sim import runtime
+
+_sim = runtime.current()
+
+
+class PWMOut:
+    def __init__(self, pin, *, duty_cycle=0, frequency=500, variable_frequency=False):
+        self._pin = pin
+        self.frequency = frequency
+        self._duty_cycle = duty_cycle
+
+    @property
+    def duty_cycle(self):
+        return self._duty_cycle
+
+    @duty_cycle.setter
+    def duty_cycle(self, value):
+        _sim.recorder.record("pwm", self._pin.name, value)
+        self._duty_cycle = value
+
+    def deinit(self):
+        pass
@@ -0,0 +1,12 @@
+"""Stand-in for ``rainbowio``."""
+
+
+def colorwheel(color_value):
+    pos = int(color_value) % 256
+    if pos < 85:
+        return (255 - pos * 3) << 16 | (pos * 3) << 8
+    if pos < 170:
+        pos -= 85
+        return (255 - pos * 3) << 8 | pos * 3
+    pos -= 170
+    return (pos * 3) << 16 | (255 - pos * 3)
@@ -0,0 +1,22 @@
+"""Stand-in for ``rotaryio``; the position is the signal on ``pin_a``."""
+from sim import runtime
+
+_sim = runtime.current()
+
+
+class IncrementalEncoder:
+    def __init__(self, pin_a, pin_b, divisor=4):
+        self._name = pin_a.name
+        self._offset = 0
+
+    @property
+    def position(self):
+        return int(_sim.read_input(self._name, 0)) + self._offset
+
+    @position.setter
+    def position(self, value):
+        self._offset = 0
+        self._offset = value - self.position
+
+    def deinit(self):
+        pass
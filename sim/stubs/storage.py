@@ -0,0 +1,26 @@
+"""Stand-in for ``storage``; mounting maps a path onto the simulated SD card."""
+from sim import runtime
+
+_sim = runtime.current()
+
+
+class VfsFat:
+    def __init__(self, block_device):
+        self.block_device = block_device
+        self.label = "SDCARD"
+
+
+def mount(filesystem, mount_path, *, readonly=False):
+    _sim.mount(mount_path)
+
+
+def umount(mount):
+    _sim.unmount(mount)
+
+
+def remount(mount_path, readonly=False, *, disable_concurrent_write_protection=False):
+    pass
+
+
+def getmount(mount_path):
+    raise OSError(22, "Invalid argument")
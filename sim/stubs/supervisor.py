@@ -0,0 +1,18 @@
+"""Stand-in for ``supervisor``."""
+from sim import runtime as _harness
+
+_sim = _harness.current()
+
+
+def ticks_ms():
+    # Wraps every 2**29 ms, like the real one
+    return (_sim.clock.ns // 1000000) & 0x1FFFFFFF
+
+
+class _Runtime:
+    serial_connected = True
+    usb_connected = True
+    serial_bytes_available = 0
+
+
+runtime = _Runtime()
@@ -0,0 +1,9 @@
+"""Stand-in for ``terminalio``."""
+
+
+class _Font:
+    def get_bounding_box(self):
+        return (6, 12)
+
+
+FONT = _Font()
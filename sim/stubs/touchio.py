@@ -0,0 +1,31 @@
+"""Stand-in for ``touchio``.
+
+The pad's signal may be a bool (touched or not) or a raw capacitance count.
+"""
+from sim import runtime
+
+_sim = runtime.current()
+
+UNTOUCHED_RAW = 1000
+TOUCHED_RAW = 1800
+
+
+class TouchIn:
+    def __init__(self, pin):
+        self._pin = pin
+        self.threshold = int(self.raw_value * 1.05) + 100
+
+    @property
+    def raw_value(self):
+        _sim.clock.advance(_sim.cost.touch_read)
+        value = _sim.read_input(self._pin.name, False)
+        if isinstance(value, bool):
+            return TOUCHED_RAW if value else UNTOUCHED_RAW
+        return int(value)
+
+    @property
+    def value(self):
+        return self.raw_value > self.threshold
+
+    def deinit(self):
+        pass
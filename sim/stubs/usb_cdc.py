@@ -0,0 +1,57 @@
+"""Stand-in for ``usb_cdc``; bytes written to the data port are recorded as ``cdc`` events.
+
+The host reads both ports at ``Simulation.serial_rate`` bytes a second
+while ``Simulation.serial_connected`` is true.
+"""
+from sim import runtime
+
+_sim = runtime.current()
+
+
+class Serial:
+    def __init__(self, port):
+        self._port = port
+        self.timeout = 1
+        self.write_timeout = None
+
+    @property
+    def connected(self):
+        return _sim.serial_connected
+
+    @property
+    def out_waiting(self):
+        return int(self._port.waiting())
+
+    @property
+    def in_waiting(self):
+        return 0
+
+    def write(self, buf):
+        return self._port.write(buf, self.write_timeout)
+
+    def read(self, size=1):
+        return b""
+
+    def reset_input_buffer(self):
+        pass
+
+    def reset_output_buffer(self):
+        pass
+
+    def flush(self):
+        pass
+
+
+console = Serial(_sim.console_port)
+data = Serial(_sim.data_port) if _sim.cdc_data else None
+
+
+def enable(*, console=True, data=False):
+    # Takes effect for the code that runs after boot, like usb_hid.enable()
+    _sim.cdc_data = bool(data)
+    globals()["data"] = Serial(_sim.data_port) if data else None
+    globals()["console"] = Serial(_sim.console_port) if console else None
+
+
+def disable():
+    enable(console=False, data=False)
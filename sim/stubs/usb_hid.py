@@ -0,0 +1,72 @@
+"""Stand-in for ``usb_hid``; every report sent is recorded as a ``hid`` event."""
+from sim import hid_descriptor, runtime
+
+_sim = runtime.current()
+
+# Recorder source names for devices built from a custom descriptor
+_NAMES = {(0x01, 0x04): "joystick", (0x01, 0x05): "gamepad"}
+
+
+class Device:
+    def __init__(self, *, report_descriptor=b"", usage_page, usage, report_ids,
+                 in_report_lengths, out_report_lengths, name=None):
+        self.report_descriptor = bytes(report_descriptor)
+        self.usage_page = usage_page
+        self.usage = usage
+        self.report_ids = tuple(report_ids)
+        self.in_report_lengths = tuple(in_report_lengths)
+        self.out_report_lengths = tuple(out_report_lengths)
+        self.name = name or _NAMES.get((usage_page, usage)) or "hid_{:02x}_{:02x}".format(
+            usage_page, usage)
+        self.last_received_report = None
+        if self.report_descriptor:
+            self._check_descriptor()
+
+    def _check_descriptor(self):
+        # What the host would enumerate has to agree with what send_report() accepts
+        self.fields, lengths = hid_descriptor.parse(self.report_descriptor)
+        for report_id, length in zip(self.report_ids, self.in_report_lengths):
+            if lengths.get(report_id, 0) != length:
+                raise ValueError("report {} is {} bytes in the descriptor, {} in in_report_lengths"
+                                 .format(report_id, lengths.get(report_id, 0), length))
+
+    def send_report(self, report, report_id=None):
+        index = 0 if report_id is None else self.report_ids.index(report_id)
+        if len(report) != self.in_report_lengths[index]:
+            raise ValueError("Buffer incorrect size. Should be {} bytes.".format(
+                self.in_report_lengths[index]))
+        _sim.hid_send(self, report)
+
+    def get_last_received_report(self, report_id=None):
+        return self.last_received_report
+
+    def __repr__(self):
+        return "<Device {}>".format(self.name)
+
+
+Device.KEYBOARD = Device(usage_page=0x01, usage=0x06, report_ids=(1,),
+                         in_report_lengths=(8,), out_report_lengths=(1,), name="keyboard")
+Device.MOUSE = Device(usage_page=0x01, usage=0x02, report_ids=(2,),
+                      in_report_lengths=(4,), out_report_lengths=(0,), name="mouse")
+Device.CONSUMER_CONTROL = Device(usage_page=0x0C, usage=0x01, report_ids=(3,),
+                                 in_report_lengths=(2,), out_report_lengths=(0,),
+                                 name="consumer_control")
+
+if _sim.hid_devices is None:
+    devices = (Device.KEYBOARD, Device.MOUSE, Device.CONSUMER_CONTROL)
+else:
+    devices = tuple(_sim.hid_devices)
+
+
+def enable(devices, boot_device=0):
+    # Takes effect for the code that runs after boot, like the real module
+    _sim.hid_devices = tuple(devices)
+    globals()["devices"] = tuple(devices)
+
+
+def disable():
+    enable(())
+
+
+def get_boot_device():
+    return 0